@@ -1,11 +1,27 @@
-import requests
-from bs4 import BeautifulSoup
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Optional
+from ai_trading_crew.config import settings
+from ai_trading_crew.utils.extraction import Rule, contains, extract_fields, starts_with
+from ai_trading_crew.utils.html_parsing import parse_html
+from ai_trading_crew.utils.http_client import http_client
+
+
+# Sections in the order they appear in the context, with the title used when a section is unavailable
+FUNDAMENTAL_SECTIONS = [
+    ("Finviz", "FINVIZ Fundamental Ratios/KPIs"),
+    ("TipRanks analysis", "TipRanks AI Stock Analysis"),
+    ("TipRanks forecast", "TipRanks Analyst Forecast"),
+    ("ValueInvesting.io", "ValueInvesting.io Intrinsic Value"),
+]
 
 
 def get_fundamental_context(symbol: str) -> str:
     """
     Get formatted fundamental analysis context for a stock symbol from Finviz, TipRanks, and ValueInvesting.io.
+    The four sections are fetched concurrently; each request is bounded by the section timeout and
+    the whole symbol by FUNDAMENTALS_FETCH_DEFAULTS["deadline"], so a hung site only blanks its own section.
     
     Args:
         symbol (str): Stock symbol
@@ -13,23 +29,50 @@ def get_fundamental_context(symbol: str) -> str:
     Returns:
         str: Four sections - Finviz fundamental data, TipRanks AI analysis, TipRanks Analyst Forecast, and ValueInvesting.io Intrinsic Value
     """
-    # Section 1: Finviz Fundamental Data
-    finviz_result = _get_finviz_data(symbol)
-    
-    # Section 2: TipRanks AI Stock Analysis  
-    tipranks_result = _get_tipranks_data(symbol)
-    
-    # Section 3: TipRanks Analyst Forecast
-    forecast_result = _get_tipranks_forecast(symbol)
-    
-    # Section 4: ValueInvesting.io Intrinsic Value Analysis
-    value_result = _get_valueinvesting_data(symbol)
-    
+    config = settings.FUNDAMENTALS_FETCH_DEFAULTS
+    started = time.monotonic()
+    deadline = started + config["deadline"]
+    fetchers = {
+        "Finviz": _get_finviz_data,
+        "TipRanks analysis": _get_tipranks_data,
+        "TipRanks forecast": _get_tipranks_forecast,
+        "ValueInvesting.io": _get_valueinvesting_data,
+    }
+    reports = {}
+
+    def run(name, fetch):
+        section_start = time.monotonic()
+        timeout = max(0.1, min(config["section_timeout"], deadline - section_start))
+        with http_client.track_outcomes() as outcomes:
+            try:
+                return fetch(symbol, timeout=timeout)
+            finally:
+                reports[name] = (", ".join(outcomes) or "no request", time.monotonic() - section_start)
+
+    executor = ThreadPoolExecutor(max_workers=len(fetchers), thread_name_prefix="fundamentals")
+    futures = {name: executor.submit(run, name, fetch) for name, fetch in fetchers.items()}
+    wait(futures.values(), timeout=max(0.0, deadline - time.monotonic()))
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    sections = []
+    for name, title in FUNDAMENTAL_SECTIONS:
+        future = futures[name]
+        if not future.done():
+            reports[name] = ("timed out", time.monotonic() - started)
+            sections.append(f"{title} for {symbol} unavailable: timed out after {config['deadline']}s")
+        elif future.exception() is not None:
+            sections.append(f"Error fetching {title} for {symbol}: {future.exception()}")
+        else:
+            sections.append(future.result())
+    print(f"[{symbol}] Fundamentals: " + "; ".join(
+        f"{name} {reports[name][0]} ({reports[name][1]:.2f}s)" for name, _ in FUNDAMENTAL_SECTIONS if name in reports
+    ))
+
     # Combine all four sections
-    return f"{finviz_result}\n\n{'='*80}\n\n{tipranks_result}\n\n{'='*80}\n\n{forecast_result}\n\n{'='*80}\n\n{value_result}"
+    return f"\n\n{'='*80}\n\n".join(sections)
 
 
-def _get_finviz_data(symbol: str) -> str:
+def _get_finviz_data(symbol: str, timeout: Optional[float] = None) -> str:
     """Get fundamental data from Finviz"""
     url = f"https://finviz.com/quote.ashx?t={symbol}&p=d"
     
@@ -41,18 +84,18 @@ def _get_finviz_data(symbol: str) -> str:
         'Pragma': 'no-cache',
         'Referer': 'https://www.google.com/'
     }
+    company_name = symbol  # Default fallback
     
     try:
-        response = requests.get(url, headers=headers)
+        response = http_client.get(url, headers=headers, timeout=timeout)
         response.raise_for_status()
         
-        soup = BeautifulSoup(response.text, 'html.parser')
+        page = parse_html(response.text)
         
         # Extract company name from the page title or heading
-        company_name = symbol  # Default fallback
         try:
             # Try to find company name in the page
-            title_element = soup.find('title')
+            title_element = page.select_one('title')
             if title_element and title_element.text:
                 # Extract company name from title like "AAPL - Apple Inc. Stock Quote"
                 title_text = title_element.text
@@ -69,15 +112,15 @@ def _get_finviz_data(symbol: str) -> str:
         fundamentals = {}
         
         # Look for the table that contains the fundamental metrics
-        tables = soup.find_all('table')
+        tables = page.select('table')
         
         for table in tables:
             # Check if this table contains fundamental data by looking for key metrics
             table_text = table.get_text()
             if 'P/E' in table_text and 'Market Cap' in table_text and 'ROA' in table_text:
-                rows = table.find_all('tr')
+                rows = table.select('tr')
                 for row in rows:
-                    cells = row.find_all('td')
+                    cells = row.select('td')
                     # Parse cells in pairs: label, value, label, value, etc.
                     for i in range(0, len(cells), 2):
                         if i + 1 < len(cells):
@@ -156,7 +199,7 @@ def _get_finviz_data(symbol: str) -> str:
         return f"Error fetching fundamental data for {company_name} ({symbol}): {str(e)}"
 
 
-def _get_tipranks_data(symbol: str) -> str:
+def _get_tipranks_data(symbol: str, timeout: Optional[float] = None) -> str:
     """Get AI stock analysis from TipRanks"""
     url = f"https://www.tipranks.com/stocks/{symbol.lower()}/stock-analysis"
     
@@ -170,11 +213,10 @@ def _get_tipranks_data(symbol: str) -> str:
     }
     
     try:
-        response = requests.get(url, headers=headers)
+        response = http_client.get(url, headers=headers, timeout=timeout)
         response.raise_for_status()
         
-        soup = BeautifulSoup(response.text, 'html.parser')
-        full_text = soup.get_text()
+        full_text = parse_html(response.text).text
         
         result = f"TipRanks AI Stock Analysis (Fundamental) for {symbol.upper()}:\n\n"
         
@@ -353,6 +395,10 @@ def _extract_factors_info(text):
     return result
 
 
+# Score and sentiment of a financial statement section, e.g. "72 Positive"
+SENTIMENT_SCORE_PATTERN = re.compile(r'(\d{1,2})\s*(Very Positive|Positive|Neutral|Negative|Very Negative)', re.IGNORECASE)
+
+
 def _extract_financial_info(text):
     """Extract financial statement overview"""
     result = "**Financial Statement Overview:**\n"
@@ -380,7 +426,7 @@ def _extract_financial_info(text):
         income_section = text[income_start:income_start + 500]
         
         # Find score (number)
-        score_match = re.search(r'(\d{1,2})\s*(Very Positive|Positive|Neutral|Negative|Very Negative)', income_section, re.IGNORECASE)
+        score_match = SENTIMENT_SCORE_PATTERN.search(income_section)
         if score_match:
             score, sentiment = score_match.groups()
             result += f"• Score: {score}\n"
@@ -392,7 +438,7 @@ def _extract_financial_info(text):
         if desc_end != -1:
             description = text[desc_start:desc_end].strip()
             # Clean up the description
-            clean_desc = re.sub(r'(\d{1,2})\s*(Very Positive|Positive|Neutral|Negative|Very Negative)', '', description, flags=re.IGNORECASE)
+            clean_desc = SENTIMENT_SCORE_PATTERN.sub('', description)
             clean_desc = clean_desc.strip()
             if len(clean_desc) > 30:
                 result += f"• Analysis: {clean_desc[:300]}...\n"  # Limit length
@@ -403,7 +449,7 @@ def _extract_financial_info(text):
         result += "\n**Balance Sheet:**\n"
         balance_section = text[balance_start:balance_start + 500]
         
-        score_match = re.search(r'(\d{1,2})\s*(Very Positive|Positive|Neutral|Negative|Very Negative)', balance_section, re.IGNORECASE)
+        score_match = SENTIMENT_SCORE_PATTERN.search(balance_section)
         if score_match:
             score, sentiment = score_match.groups()
             result += f"• Score: {score}\n"
@@ -413,7 +459,7 @@ def _extract_financial_info(text):
         desc_end = text.find('Cash Flow', desc_start)
         if desc_end != -1:
             description = text[desc_start:desc_end].strip()
-            clean_desc = re.sub(r'(\d{1,2})\s*(Very Positive|Positive|Neutral|Negative|Very Negative)', '', description, flags=re.IGNORECASE)
+            clean_desc = SENTIMENT_SCORE_PATTERN.sub('', description)
             clean_desc = clean_desc.strip()
             if len(clean_desc) > 30:
                 result += f"• Analysis: {clean_desc[:300]}...\n"
@@ -424,7 +470,7 @@ def _extract_financial_info(text):
         result += "\n**Cash Flow:**\n"
         cashflow_section = text[cashflow_start:cashflow_start + 500]
         
-        score_match = re.search(r'(\d{1,2})\s*(Very Positive|Positive|Neutral|Negative|Very Negative)', cashflow_section, re.IGNORECASE)
+        score_match = SENTIMENT_SCORE_PATTERN.search(cashflow_section)
         if score_match:
             score, sentiment = score_match.groups()
             result += f"• Score: {score}\n"
@@ -433,7 +479,7 @@ def _extract_financial_info(text):
         # Get description (rest of the section)
         desc_start = cashflow_start + 200
         description = text[desc_start:desc_start + 400].strip()
-        clean_desc = re.sub(r'(\d{1,2})\s*(Very Positive|Positive|Neutral|Negative|Very Negative)', '', description, flags=re.IGNORECASE)
+        clean_desc = SENTIMENT_SCORE_PATTERN.sub('', description)
         clean_desc = clean_desc.strip()
         if len(clean_desc) > 30:
             result += f"• Analysis: {clean_desc[:300]}...\n"
@@ -441,7 +487,7 @@ def _extract_financial_info(text):
     return result
 
 
-def _get_tipranks_forecast(symbol: str) -> str:
+def _get_tipranks_forecast(symbol: str, timeout: Optional[float] = None) -> str:
     """Get analyst ratings and price forecast from TipRanks forecast page"""
     url = f"https://www.tipranks.com/stocks/{symbol.lower()}/forecast"
     
@@ -459,11 +505,10 @@ def _get_tipranks_forecast(symbol: str) -> str:
     }
     
     try:
-        response = requests.get(url, headers=headers)
+        response = http_client.get(url, headers=headers, timeout=timeout)
         response.raise_for_status()
         
-        soup = BeautifulSoup(response.text, 'html.parser')
-        full_text = soup.get_text()
+        full_text = parse_html(response.text).text
         
         result = f"TipRanks Analyst Ratings & Price Forecast for {symbol.upper()}:\n\n"
         
@@ -481,99 +526,91 @@ def _get_tipranks_forecast(symbol: str) -> str:
         return f"Error fetching TipRanks forecast data for {symbol}: {str(e)}"
 
 
+ANALYST_RATING_RULES = [
+    Rule("overall_rating", [
+        starts_with(("strong buy", "strong sell", "buy", "sell", "hold"),
+                    r'(Strong Buy|Strong Sell|Buy|Sell|Hold)\s*(\d+)\s*Ratings'),
+        contains("ratings", r'(\d+)\s*Ratings\s*(Strong Buy|Strong Sell|Buy|Sell|Hold)', before=r'[\d\s]'),
+        starts_with("consensus", r'consensus.*?(Strong Buy|Strong Sell|Buy|Sell|Hold)'),
+        # New pattern for AMZN format: "Strong Buy48Ratings" (no spaces)
+        starts_with("strong buy", r'Strong Buy(\d+)Ratings'),
+    ]),
+    Rule("consensus_rating", [
+        starts_with("rating consensus", r'rating consensus.*?(Strong Buy|Buy|Hold|Sell|Strong Sell)'),
+        starts_with("consensus rating", r'consensus rating.*?(Strong Buy|Buy|Hold|Sell|Strong Sell)'),
+    ]),
+    Rule("total_ratings", [
+        starts_with("based on ", r'Based on (\d+) analysts'),
+        contains(" wall street analysts", r'(\d+) Wall Street analysts', before=r'\d'),
+        contains("ratings", r'(\d+)\s*Ratings', before=r'[\d\s]'),
+        contains(" analysts giving stock ratings", r'(\d+) analysts giving stock ratings', before=r'\d'),
+    ]),
+    Rule("breakdown", [
+        contains("buy", r'(\d+)\s*Buy\s*(\d+)\s*Hold\s*(\d+)\s*Sell', before=r'[\d\s]'),
+        contains(" buy ratings", r'(\d+) buy ratings,?\s*(\d+) hold ratings,?\s*(\d+) sell ratings', before=r'\d'),
+        contains(" buy", r'(\d+) Buy\s*(\d+) Hold\s*(\d+) Sell', before=r'\d'),
+        # New pattern for AMZN: "47 Buy1 Hold0 Sell" (no spaces around numbers)
+        contains("buy", r'(\d+)\s*Buy(\d+)\s*Hold(\d+)\s*Sell', before=r'[\d\s]'),
+    ]),
+    Rule("buy", [contains("buy", r'(\d+)\s*buy', before=r'[\d\s]')]),
+    Rule("hold", [contains("hold", r'(\d+)\s*hold', before=r'[\d\s]')]),
+    Rule("sell", [contains("sell", r'(\d+)\s*sell', before=r'[\d\s]')]),
+    Rule("time_period", [
+        starts_with("in the past ", r'in the past (\d+ months?)'),
+        starts_with("last ", r'last (\d+ months?)'),
+        starts_with("past ", r'past (\d+ months?)'),
+    ]),
+]
+
+
 def _extract_analyst_ratings(text, symbol):
     """Extract analyst ratings breakdown"""
     result = f"**{symbol.upper()} Analyst Ratings:**\n"
+    fields = extract_fields(text, ANALYST_RATING_RULES)
     
     # Extract overall rating (Strong Buy, Buy, Hold, etc.)
-    overall_rating_patterns = [
-        r'(Strong Buy|Strong Sell|Buy|Sell|Hold)\s*(\d+)\s*Ratings',
-        r'(\d+)\s*Ratings\s*(Strong Buy|Strong Sell|Buy|Sell|Hold)',
-        r'consensus.*?(Strong Buy|Strong Sell|Buy|Sell|Hold)',
-        # New pattern for AMZN format: "Strong Buy48Ratings" (no spaces)
-        r'Strong Buy(\d+)Ratings'
-    ]
-    
     overall_rating = ""
     total_ratings = ""
     
-    for pattern in overall_rating_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            if match.group(1).isdigit():
-                total_ratings = match.group(1)
-                overall_rating = match.group(2)
-            else:
-                overall_rating = match.group(1)
-                if len(match.groups()) > 1 and match.group(2).isdigit():
-                    total_ratings = match.group(2)
-            break
+    match = fields["overall_rating"]
+    if match:
+        if match.group(1).isdigit():
+            total_ratings = match.group(1)
+            overall_rating = match.group(2)
+        else:
+            overall_rating = match.group(1)
+            if len(match.groups()) > 1 and match.group(2).isdigit():
+                total_ratings = match.group(2)
     
     # If not found, try alternative patterns
-    if not overall_rating:
-        consensus_patterns = [
-            r'rating consensus.*?(Strong Buy|Buy|Hold|Sell|Strong Sell)',
-            r'consensus rating.*?(Strong Buy|Buy|Hold|Sell|Strong Sell)'
-        ]
-        for pattern in consensus_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                overall_rating = match.group(1)
-                break
+    if not overall_rating and fields["consensus_rating"]:
+        overall_rating = fields["consensus_rating"].group(1)
     
     if overall_rating:
         result += f"• **Overall Rating**: {overall_rating}\n"
     
     # Extract total number of ratings
-    if not total_ratings:
-        total_patterns = [
-            r'Based on (\d+) analysts',
-            r'(\d+) Wall Street analysts',
-            r'(\d+)\s*Ratings',
-            r'(\d+) analysts giving stock ratings'
-        ]
-        
-        for pattern in total_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                total_ratings = match.group(1)
-                break
+    if not total_ratings and fields["total_ratings"]:
+        total_ratings = fields["total_ratings"].group(1)
     
     if total_ratings:
         result += f"• **Total Ratings**: {total_ratings}\n"
     
     # Extract breakdown: Buy, Hold, Sell counts
-    breakdown_patterns = [
-        r'(\d+)\s*Buy\s*(\d+)\s*Hold\s*(\d+)\s*Sell',
-        r'(\d+) buy ratings,?\s*(\d+) hold ratings,?\s*(\d+) sell ratings',
-        r'(\d+) Buy\s*(\d+) Hold\s*(\d+) Sell',
-        # New pattern for AMZN: "47 Buy1 Hold0 Sell" (no spaces around numbers)
-        r'(\d+)\s*Buy(\d+)\s*Hold(\d+)\s*Sell'
-    ]
-    
     buy_count = hold_count = sell_count = ""
     
-    for pattern in breakdown_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            buy_count, hold_count, sell_count = match.groups()
-            break
+    if fields["breakdown"]:
+        buy_count, hold_count, sell_count = fields["breakdown"].groups()
     
     # Alternative extraction method - look for individual mentions
-    if not buy_count:
-        buy_match = re.search(r'(\d+)\s*buy', text, re.IGNORECASE)
-        if buy_match:
-            buy_count = buy_match.group(1)
+    if not buy_count and fields["buy"]:
+        buy_count = fields["buy"].group(1)
     
-    if not hold_count:
-        hold_match = re.search(r'(\d+)\s*hold', text, re.IGNORECASE)
-        if hold_match:
-            hold_count = hold_match.group(1)
+    if not hold_count and fields["hold"]:
+        hold_count = fields["hold"].group(1)
     
-    if not sell_count:
-        sell_match = re.search(r'(\d+)\s*sell', text, re.IGNORECASE)
-        if sell_match:
-            sell_count = sell_match.group(1)
+    if not sell_count and fields["sell"]:
+        sell_count = fields["sell"].group(1)
     
     # Display breakdown
     if buy_count or hold_count or sell_count:
@@ -586,136 +623,78 @@ def _extract_analyst_ratings(text, symbol):
             result += f"  - Sell: {sell_count}\n"
     
     # Extract time period
-    time_patterns = [
-        r'in the past (\d+ months?)',
-        r'last (\d+ months?)',
-        r'past (\d+ months?)'
-    ]
-    
-    for pattern in time_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            time_period = match.group(1)
-            result += f"• **Time Period**: {time_period}\n"
-            break
+    if fields["time_period"]:
+        time_period = fields["time_period"].group(1)
+        result += f"• **Time Period**: {time_period}\n"
     
     return result
 
 
+PRICE_FORECAST_RULES = [
+    Rule("avg_price", [
+        starts_with("average price target", r'Average Price Target\s*\$(\d+\.?\d*)'),
+        starts_with("average price target is $", r'average price target is \$(\d+\.?\d*)'),
+        starts_with("$", r'\$(\d+\.?\d*)\s*▲.*?Upside'),
+        starts_with("price target", r'price target.*?\$(\d+\.?\d*)'),
+        # New pattern for AMZN format: "Average Price Target$240.62"
+        starts_with("average price target$", r'Average Price Target\$(\d+\.?\d*)'),
+        starts_with("target", r'target.*?\$(\d+\.\d+)'),
+    ]),
+    Rule("upside", [
+        contains("upside", r'(\d+\.?\d*)%\s*Upside', before=r'[\d.%\s]'),
+        starts_with("▲(", r'▲\(\s*(\d+\.?\d*)%\s*Upside\)'),
+        starts_with("represents", r'represents.*?(\d+\.?\d*)%.*?change'),
+    ]),
+    Rule("high_price", [
+        starts_with("high forecast of $", r'high forecast of \$(\d+\.?\d*)'),
+        starts_with("highest price target", r'Highest Price Target\s*\$(\d+\.?\d*)'),
+        starts_with("high", r'high.*?\$(\d+\.?\d*)'),
+    ]),
+    Rule("low_price", [
+        starts_with("low forecast of $", r'low forecast of \$(\d+\.?\d*)'),
+        starts_with("lowest price target", r'Lowest Price Target\s*\$(\d+\.?\d*)'),
+        starts_with("low", r'low.*?\$(\d+\.?\d*)'),
+    ]),
+    Rule("current_price", [
+        starts_with("last price of $", r'last price of \$(\d+\.?\d*)'),
+        starts_with("current price of $", r'current price of \$(\d+\.?\d*)'),
+        starts_with("from", r'from.*?\$(\d+\.?\d*)'),
+    ]),
+    Rule("analyst_count", [
+        starts_with("based on ", r'Based on (\d+)\s+Wall Street analysts'),
+        contains(" analysts offering", r'(\d+) analysts offering.*?price targets', before=r'\d'),
+        contains(" wall street analysts", r'(\d+) Wall Street analysts.*?price targets', before=r'\d'),
+    ]),
+]
+
+
 def _extract_price_forecast(text, symbol):
     """Extract 12-month price forecast information"""
     result = f"**{symbol.upper()} Stock 12 Month Forecast:**\n"
+    fields = extract_fields(text, PRICE_FORECAST_RULES)
     
-    # Extract average price target
-    avg_price_patterns = [
-        r'Average Price Target\s*\$(\d+\.?\d*)',
-        r'average price target is \$(\d+\.?\d*)',
-        r'\$(\d+\.?\d*)\s*▲.*?Upside',
-        r'price target.*?\$(\d+\.?\d*)',
-        # New pattern for AMZN format: "Average Price Target$240.62"
-        r'Average Price Target\$(\d+\.?\d*)',
-        r'target.*?\$(\d+\.\d+)'
-    ]
-    
-    avg_price = ""
-    for pattern in avg_price_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            avg_price = match.group(1)
-            break
-    
-    if avg_price:
-        result += f"• **Average Price Target**: ${avg_price}\n"
-    
-    # Extract upside percentage
-    upside_patterns = [
-        r'(\d+\.?\d*)%\s*Upside',
-        r'▲\(\s*(\d+\.?\d*)%\s*Upside\)',
-        r'represents.*?(\d+\.?\d*)%.*?change'
-    ]
-    
-    upside = ""
-    for pattern in upside_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            upside = match.group(1)
-            break
-    
-    if upside:
-        result += f"• **Upside Potential**: {upside}%\n"
+    if fields["avg_price"]:
+        result += f"• **Average Price Target**: ${fields['avg_price'].group(1)}\n"
     
-    # Extract high forecast
-    high_patterns = [
-        r'high forecast of \$(\d+\.?\d*)',
-        r'Highest Price Target\s*\$(\d+\.?\d*)',
-        r'high.*?\$(\d+\.?\d*)'
-    ]
+    if fields["upside"]:
+        result += f"• **Upside Potential**: {fields['upside'].group(1)}%\n"
     
-    high_price = ""
-    for pattern in high_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            high_price = match.group(1)
-            break
-    
-    if high_price:
-        result += f"• **Highest Price Target**: ${high_price}\n"
+    if fields["high_price"]:
+        result += f"• **Highest Price Target**: ${fields['high_price'].group(1)}\n"
     
-    # Extract low forecast
-    low_patterns = [
-        r'low forecast of \$(\d+\.?\d*)',
-        r'Lowest Price Target\s*\$(\d+\.?\d*)',
-        r'low.*?\$(\d+\.?\d*)'
-    ]
-    
-    low_price = ""
-    for pattern in low_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            low_price = match.group(1)
-            break
+    if fields["low_price"]:
+        result += f"• **Lowest Price Target**: ${fields['low_price'].group(1)}\n"
     
-    if low_price:
-        result += f"• **Lowest Price Target**: ${low_price}\n"
+    if fields["current_price"]:
+        result += f"• **Current Price**: ${fields['current_price'].group(1)}\n"
     
-    # Extract current price
-    current_patterns = [
-        r'last price of \$(\d+\.?\d*)',
-        r'current price of \$(\d+\.?\d*)',
-        r'from.*?\$(\d+\.?\d*)'
-    ]
-    
-    current_price = ""
-    for pattern in current_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            current_price = match.group(1)
-            break
-    
-    if current_price:
-        result += f"• **Current Price**: ${current_price}\n"
-    
-    # Extract number of analysts
-    analyst_count_patterns = [
-        r'Based on (\d+)\s+Wall Street analysts',
-        r'(\d+) analysts offering.*?price targets',
-        r'(\d+) Wall Street analysts.*?price targets'
-    ]
-    
-    analyst_count = ""
-    for pattern in analyst_count_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            analyst_count = match.group(1)
-            break
-    
-    if analyst_count:
-        result += f"• **Number of Analysts**: {analyst_count}\n"
+    if fields["analyst_count"]:
+        result += f"• **Number of Analysts**: {fields['analyst_count'].group(1)}\n"
     
     return result 
 
 
-def _get_valueinvesting_data(symbol: str) -> str:
+def _get_valueinvesting_data(symbol: str, timeout: Optional[float] = None) -> str:
     """Get intrinsic value analysis from ValueInvesting.io"""
     url = f"https://valueinvesting.io/{symbol}/valuation/intrinsic-value"
     
@@ -733,11 +712,10 @@ def _get_valueinvesting_data(symbol: str) -> str:
     }
     
     try:
-        response = requests.get(url, headers=headers)
+        response = http_client.get(url, headers=headers, timeout=timeout)
         response.raise_for_status()
         
-        soup = BeautifulSoup(response.text, 'html.parser')
-        full_text = soup.get_text()
+        full_text = parse_html(response.text).text
         
         result = f"ValueInvesting.io Intrinsic Value Analysis for {symbol.upper()}:\n\n"
         
@@ -755,121 +733,106 @@ def _get_valueinvesting_data(symbol: str) -> str:
         return f"Error fetching ValueInvesting.io data for {symbol}: {str(e)}"
 
 
+VALUATION_MODELS = ['DCF Model', 'Discounted Cash Flow', 'Peter Lynch', 'Benjamin Graham']
+
+INTRINSIC_OVERVIEW_RULES = [
+    Rule("intrinsic_value", [
+        contains("usd", r'(\d+\.?\d*)\s*USD\s*Intrinsic Value', before=r'[\d.\s]'),
+        starts_with("intrinsic value", r'Intrinsic Value.*?(\d+\.?\d*)\s*USD'),
+        starts_with("intrinsic value", r'intrinsic value.*?(\d+\.?\d*)\s*USD'),
+        contains("usd", r'(\d+\.?\d*)\s*USD.*?Intrinsic', before=r'[\d.\s]'),
+    ]),
+    Rule("upside", [
+        contains("upside", r'(\d+\.?\d*)%\s*upside', before=r'[\d.%\s]'),
+        starts_with("upside", r'upside.*?(\d+\.?\d*)%'),
+        contains("undervalued", r'(\d+\.?\d*)%\s*undervalued', before=r'[\d.%\s]'),
+        contains("overvalued", r'(\d+\.?\d*)%\s*overvalued', before=r'[\d.%\s]'),
+    ]),
+    Rule("assessment", [
+        starts_with(("undervalued", "overvalued", "fairly valued"), r'(undervalued|overvalued|fairly valued)'),
+        starts_with("stock is ", r'stock is (undervalued|overvalued|fairly valued)'),
+        starts_with("appears to be ", r'appears to be (undervalued|overvalued|fairly valued)'),
+    ]),
+    Rule("current_price", [
+        contains("usd", r'(\d+\.?\d*)\s*USD\s*Stock Price', before=r'[\d.\s]'),
+        starts_with("stock price", r'Stock Price.*?(\d+\.?\d*)\s*USD'),
+        starts_with("market price of ", r'market price of (\d+\.?\d*)\s*USD'),
+        starts_with("price:", r'Price:\s*(\d+\.?\d*)\s*USD'),
+    ]),
+    Rule("models", [starts_with(model, re.escape(model)) for model in VALUATION_MODELS], mode="each"),
+]
+
+
 def _extract_intrinsic_overview(text, symbol):
     """Extract intrinsic value, upside, and valuation assessment"""
     result = f"**{symbol.upper()} Intrinsic Value Overview:**\n"
+    fields = extract_fields(text, INTRINSIC_OVERVIEW_RULES)
     
-    # Extract intrinsic value
-    intrinsic_patterns = [
-        r'(\d+\.?\d*)\s*USD\s*Intrinsic Value',
-        r'Intrinsic Value.*?(\d+\.?\d*)\s*USD',
-        r'intrinsic value.*?(\d+\.?\d*)\s*USD',
-        r'(\d+\.?\d*)\s*USD.*?Intrinsic'
-    ]
-    
-    intrinsic_value = ""
-    for pattern in intrinsic_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            intrinsic_value = match.group(1)
-            break
-    
-    if intrinsic_value:
-        result += f"• **Intrinsic Value**: {intrinsic_value} USD\n"
-    
-    # Extract upside percentage
-    upside_patterns = [
-        r'(\d+\.?\d*)%\s*upside',
-        r'upside.*?(\d+\.?\d*)%',
-        r'(\d+\.?\d*)%\s*undervalued',
-        r'(\d+\.?\d*)%\s*overvalued'
-    ]
-    
-    upside = ""
-    for pattern in upside_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            upside = match.group(1)
-            break
-    
-    if upside:
-        result += f"• **Upside**: {upside}%\n"
-    
-    # Extract valuation assessment
-    assessment_patterns = [
-        r'(undervalued|overvalued|fairly valued)',
-        r'stock is (undervalued|overvalued|fairly valued)',
-        r'appears to be (undervalued|overvalued|fairly valued)'
-    ]
+    if fields["intrinsic_value"]:
+        result += f"• **Intrinsic Value**: {fields['intrinsic_value'].group(1)} USD\n"
     
-    assessment = ""
-    for pattern in assessment_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            assessment = match.group(1)
-            break
+    if fields["upside"]:
+        result += f"• **Upside**: {fields['upside'].group(1)}%\n"
     
-    if assessment:
-        result += f"• **Valuation Assessment**: {assessment.title()}\n"
+    if fields["assessment"]:
+        result += f"• **Valuation Assessment**: {fields['assessment'].group(1).title()}\n"
     
-    # Extract current price
-    price_patterns = [
-        r'(\d+\.?\d*)\s*USD\s*Stock Price',
-        r'Stock Price.*?(\d+\.?\d*)\s*USD',
-        r'market price of (\d+\.?\d*)\s*USD',
-        r'Price:\s*(\d+\.?\d*)\s*USD'
-    ]
-    
-    current_price = ""
-    for pattern in price_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            current_price = match.group(1)
-            break
-    
-    if current_price:
-        result += f"• **Current Stock Price**: {current_price} USD\n"
-    
-    # Extract valuation model used
-    model_patterns = [
-        r'DCF Model',
-        r'Discounted Cash Flow',
-        r'Peter Lynch',
-        r'Benjamin Graham'
-    ]
-    
-    models_found = []
-    for pattern in model_patterns:
-        if re.search(pattern, text, re.IGNORECASE):
-            models_found.append(pattern)
+    if fields["current_price"]:
+        result += f"• **Current Stock Price**: {fields['current_price'].group(1)} USD\n"
     
+    # Valuation models mentioned on the page
+    models_found = [model for model, match in zip(VALUATION_MODELS, fields["models"]) if match]
     if models_found:
         result += f"• **Valuation Models**: {', '.join(models_found)}\n"
     
     return result
 
 
+# Valuation table rows: (label on the page, name in the summary)
+VALUATION_ROWS = [
+    ('DCF (Growth 5y)', 'DCF (Growth 5Y)'),
+    ('DCF (Growth 10y)', 'DCF (Growth 10Y)'),
+    ('DCF (EBITDA 5y)', 'DCF (EBITDA 5Y)'),
+    ('DCF (EBITDA 10y)', 'DCF (EBITDA 10Y)'),
+    ('Fair Value', 'Fair Value'),
+    ('P/E', 'P/E Multiple'),
+    ('EV/EBITDA', 'EV/EBITDA Multiple'),
+    ('EPV', 'Earnings Power Value'),
+    ('DDM - Stable', 'DDM Stable Growth'),
+    ('DDM - Multi', 'DDM Multi-Stage'),
+]
+
+# Rows whose upside can be negative
+_SIGNED_UPSIDE_ROWS = {'P/E', 'EV/EBITDA', 'EPV', 'DDM - Stable', 'DDM - Multi'}
+
+VALUATION_SUMMARY_RULES = [
+    Rule("valuations", [
+        starts_with(label, re.escape(label) + (r'.*?(\d+\.?\d+).*?(-?\d+\.?\d*)%' if label in _SIGNED_UPSIDE_ROWS
+                                               else r'.*?(\d+\.?\d+).*?(\d+\.?\d*)%'))
+        for label, _ in VALUATION_ROWS
+    ], mode="each"),
+    Rule("insights", [
+        starts_with("the stock", r'(The stock.*?valued.*?\.)'),
+        starts_with("based on", r'(Based on.*?analysis.*?\.)'),
+        starts_with("our", r'(Our.*?model.*?suggests.*?\.)'),
+    ], mode="findall"),
+]
+
+# Rows the line-by-line fallback recognizes: the value is two lines below the label
+_TABLE_FALLBACK_ROWS = dict(VALUATION_ROWS[:8])
+
+NUMBER_PATTERN = re.compile(r'(\d+\.?\d+)')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+
 def _extract_valuation_summary(text):
     """Extract complete valuation summary table"""
     result = "**Valuation Summary:**\n"
+    fields = extract_fields(text, VALUATION_SUMMARY_RULES)
     
     # Look for valuation table data - based on actual format
-    valuation_patterns = [
-        (r'DCF \(Growth 5y\).*?(\d+\.?\d+).*?(\d+\.?\d*)%', 'DCF (Growth 5Y)'),
-        (r'DCF \(Growth 10y\).*?(\d+\.?\d+).*?(\d+\.?\d*)%', 'DCF (Growth 10Y)'),
-        (r'DCF \(EBITDA 5y\).*?(\d+\.?\d+).*?(\d+\.?\d*)%', 'DCF (EBITDA 5Y)'),
-        (r'DCF \(EBITDA 10y\).*?(\d+\.?\d+).*?(\d+\.?\d*)%', 'DCF (EBITDA 10Y)'),
-        (r'Fair Value.*?(\d+\.?\d+).*?(\d+\.?\d*)%', 'Fair Value'),
-        (r'P/E.*?(\d+\.?\d+).*?(-?\d+\.?\d*)%', 'P/E Multiple'),
-        (r'EV/EBITDA.*?(\d+\.?\d+).*?(-?\d+\.?\d*)%', 'EV/EBITDA Multiple'),
-        (r'EPV.*?(\d+\.?\d+).*?(-?\d+\.?\d*)%', 'Earnings Power Value'),
-        (r'DDM - Stable.*?(\d+\.?\d+).*?(-?\d+\.?\d*)%', 'DDM Stable Growth'),
-        (r'DDM - Multi.*?(\d+\.?\d+).*?(-?\d+\.?\d*)%', 'DDM Multi-Stage')
-    ]
-    
     found_valuations = []
-    for pattern, name in valuation_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
+    for (_, name), match in zip(VALUATION_ROWS, fields["valuations"]):
         if match:
             value = match.group(1)
             upside = match.group(2)
@@ -878,60 +841,12 @@ def _extract_valuation_summary(text):
     # Extract table data using line-by-line parsing
     if not found_valuations:
         table_lines = text.split('\n')
-        i = 0
-        while i < len(table_lines):
-            line = table_lines[i].strip()
-            
-            # Look for valuation method names
-            if line == 'DCF (Growth 5y)' and i+2 < len(table_lines):
-                value_line = table_lines[i+2].strip()
-                numbers = re.findall(r'(\d+\.?\d+)', value_line)
+        for i, line in enumerate(table_lines):
+            name = _TABLE_FALLBACK_ROWS.get(line.strip())
+            if name and i+2 < len(table_lines):
+                numbers = NUMBER_PATTERN.findall(table_lines[i+2].strip())
                 if numbers:
-                    found_valuations.append(f"• **DCF (Growth 5Y)**: {numbers[0]} USD")
-                    
-            elif line == 'DCF (Growth 10y)' and i+2 < len(table_lines):
-                value_line = table_lines[i+2].strip()
-                numbers = re.findall(r'(\d+\.?\d+)', value_line)
-                if numbers:
-                    found_valuations.append(f"• **DCF (Growth 10Y)**: {numbers[0]} USD")
-                    
-            elif line == 'DCF (EBITDA 5y)' and i+2 < len(table_lines):
-                value_line = table_lines[i+2].strip()
-                numbers = re.findall(r'(\d+\.?\d+)', value_line)
-                if numbers:
-                    found_valuations.append(f"• **DCF (EBITDA 5Y)**: {numbers[0]} USD")
-                    
-            elif line == 'DCF (EBITDA 10y)' and i+2 < len(table_lines):
-                value_line = table_lines[i+2].strip()
-                numbers = re.findall(r'(\d+\.?\d+)', value_line)
-                if numbers:
-                    found_valuations.append(f"• **DCF (EBITDA 10Y)**: {numbers[0]} USD")
-                    
-            elif line == 'Fair Value' and i+2 < len(table_lines):
-                value_line = table_lines[i+2].strip()
-                numbers = re.findall(r'(\d+\.?\d+)', value_line)
-                if numbers:
-                    found_valuations.append(f"• **Fair Value**: {numbers[0]} USD")
-                    
-            elif line == 'P/E' and i+2 < len(table_lines):
-                value_line = table_lines[i+2].strip()
-                numbers = re.findall(r'(\d+\.?\d+)', value_line)
-                if numbers:
-                    found_valuations.append(f"• **P/E Multiple**: {numbers[0]} USD")
-                    
-            elif line == 'EV/EBITDA' and i+2 < len(table_lines):
-                value_line = table_lines[i+2].strip()
-                numbers = re.findall(r'(\d+\.?\d+)', value_line)
-                if numbers:
-                    found_valuations.append(f"• **EV/EBITDA Multiple**: {numbers[0]} USD")
-                    
-            elif line == 'EPV' and i+2 < len(table_lines):
-                value_line = table_lines[i+2].strip()
-                numbers = re.findall(r'(\d+\.?\d+)', value_line)
-                if numbers:
-                    found_valuations.append(f"• **Earnings Power Value**: {numbers[0]} USD")
-            
-            i += 1
+                    found_valuations.append(f"• **{name}**: {numbers[0]} USD")
     
     if found_valuations:
         result += "\n" + "\n".join(found_valuations)
@@ -939,21 +854,14 @@ def _extract_valuation_summary(text):
         result += "\n• Valuation summary table not available in current format"
     
     # Extract any additional insights
-    insights_patterns = [
-        r'(The stock.*?valued.*?\.)',
-        r'(Based on.*?analysis.*?\.)',
-        r'(Our.*?model.*?suggests.*?\.)'
-    ]
-    
     insights_found = []
-    for pattern in insights_patterns:
-        matches = re.findall(pattern, text, re.IGNORECASE)
+    for matches in fields["insights"]:
         insights_found.extend(matches[:2])  # Limit to 2 insights
     
     if insights_found:
         result += "\n\n**Insights:**\n"
         for insight in insights_found:
-            clean_insight = re.sub(r'\s+', ' ', insight).strip()
+            clean_insight = WHITESPACE_PATTERN.sub(' ', insight).strip()
             result += f"• {clean_insight}\n"
     
-    return result 
+    return result
@@ -0,0 +1,171 @@
+"""
+Single-pass technical indicator engine.
+
+Computes every TA-Lib series the crew reports for one symbol from its OHLCV arrays
+and returns them as one wide DataFrame (date x indicator column). Each indicator is
+computed once per parameter set, so the latest-value summaries and the historical
+sections are both read from the same series.
+"""
+
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import talib
+
+
+# Defaults match the TwelveTI.fetch_* signatures; keys match settings.TECHNICAL_INDICATOR_DEFAULTS
+DEFAULT_INDICATOR_PARAMS = {
+    "adx_time_period": 14,
+    "bbands_time_period": 20,
+    "ema_time_period": 9,
+    "macd_fast_period": 12,
+    "macd_slow_period": 26,
+    "percent_b_time_period": 20,
+    "rsi_time_period": 14,
+    "sma_time_period": 20,
+    "stoch_fast_period": 14,
+    "stoch_slow_period": 3,
+    "stoch_d_period": 3,
+    "cci_time_period": 20,
+    "mom_time_period": 10,
+    "willr_time_period": 14,
+    "mfi_time_period": 14,
+    "rsi_length": 14,
+    "stoch_length": 14,
+    "k_period": 3,
+    "d_period": 3,
+    "tenkan_period": 9,
+    "kijun_period": 26,
+    "senkou_span_b_period": 52,
+}
+
+MACD_SIGNAL_PERIOD = 9
+
+# Parameters each indicator depends on, and the columns it contributes to the wide frame
+INDICATORS: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {
+    "adx": (("adx_time_period",), ("adx",)),
+    "bbands": (("bbands_time_period",), ("bbands_upper", "bbands_middle", "bbands_lower")),
+    "ema": (("ema_time_period",), ("ema",)),
+    "macd": (("macd_fast_period", "macd_slow_period"), ("macd", "macd_signal", "macd_hist")),
+    "percent_b": (("percent_b_time_period",), ("percent_b",)),
+    "rsi": (("rsi_time_period",), ("rsi",)),
+    "sma": (("sma_time_period",), ("sma",)),
+    "stoch": (("stoch_fast_period", "stoch_slow_period", "stoch_d_period"), ("stoch_slowk", "stoch_slowd")),
+    "cci": (("cci_time_period",), ("cci",)),
+    "sar": ((), ("sar",)),
+    "stochrsi": (("rsi_length", "k_period", "d_period"), ("stochrsi_fastk", "stochrsi_fastd")),
+    "ichimoku": (("tenkan_period", "kijun_period", "senkou_span_b_period"), ("ichimoku_senkou_a", "ichimoku_senkou_b")),
+    "mfi": (("mfi_time_period",), ("mfi",)),
+    "obv": ((), ("obv",)),
+    "mom": (("mom_time_period",), ("mom",)),
+    "willr": (("willr_time_period",), ("willr",)),
+}
+
+
+def resolve_indicator_params(params: Optional[dict] = None) -> dict:
+    """Fill missing or None parameters with the defaults"""
+    resolved = dict(DEFAULT_INDICATOR_PARAMS)
+    for key, value in (params or {}).items():
+        if value is not None:
+            resolved[key] = value
+    return resolved
+
+
+class IndicatorEngine:
+    """
+    Indicator series over one symbol's OHLCV arrays.
+    Results are memoized per indicator and parameter set for the engine's lifetime.
+    """
+
+    def __init__(self, dates: pd.DatetimeIndex, high: np.ndarray, low: np.ndarray,
+                 close: np.ndarray, volume: np.ndarray):
+        self.dates = dates
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+        self._series: Dict[tuple, Dict[str, np.ndarray]] = {}
+
+    def series(self, name: str, params: Optional[dict] = None) -> Dict[str, np.ndarray]:
+        """Get the output columns of one indicator, computing them on first use"""
+        resolved = resolve_indicator_params(params)
+        param_keys, _ = INDICATORS[name]
+        args = tuple(resolved[key] for key in param_keys)
+        key = (name, args)
+        if key not in self._series:
+            self._series[key] = getattr(self, f"_compute_{name}")(*args)
+        return self._series[key]
+
+    def seed(self, key: tuple, columns: Dict[str, np.ndarray]):
+        """Store series computed elsewhere (e.g. across symbols on a price panel) under a (name, args) key"""
+        self._series[key] = columns
+
+    def frame(self, params: Optional[dict] = None, names: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """Wide DataFrame with every requested indicator column, indexed by date"""
+        columns = {}
+        for name in (names or INDICATORS):
+            columns.update(self.series(name, params))
+        return pd.DataFrame(columns, index=pd.Index(self.dates, name='date'))
+
+    def _compute_adx(self, tp):
+        return {"adx": talib.ADX(self.high, self.low, self.close, timeperiod=tp)}
+
+    def _compute_bbands(self, tp):
+        upper, middle, lower = talib.BBANDS(self.close, timeperiod=tp, nbdevup=2.0, nbdevdn=2.0, matype=0)
+        return {"bbands_upper": upper, "bbands_middle": middle, "bbands_lower": lower}
+
+    def _compute_ema(self, tp):
+        return {"ema": talib.EMA(self.close, timeperiod=tp)}
+
+    def _compute_macd(self, fp, sp):
+        macd, macdsignal, macdhist = talib.MACD(self.close, fastperiod=fp, slowperiod=sp, signalperiod=MACD_SIGNAL_PERIOD)
+        return {"macd": macd, "macd_signal": macdsignal, "macd_hist": macdhist}
+
+    def _compute_percent_b(self, tp):
+        # Reuses the bands when %B and BBANDS share a period
+        bands = self.series("bbands", {"bbands_time_period": tp})
+        upper, lower = bands["bbands_upper"], bands["bbands_lower"]
+        return {"percent_b": (self.close - lower) / (upper - lower)}
+
+    def _compute_rsi(self, tp):
+        return {"rsi": talib.RSI(self.close, timeperiod=tp)}
+
+    def _compute_sma(self, tp):
+        return {"sma": talib.SMA(self.close, timeperiod=tp)}
+
+    def _compute_stoch(self, fk, sk, sd):
+        slowk, slowd = talib.STOCH(self.high, self.low, self.close, fastk_period=fk, slowk_period=sk,
+                                   slowk_matype=0, slowd_period=sd, slowd_matype=0)
+        return {"stoch_slowk": slowk, "stoch_slowd": slowd}
+
+    def _compute_cci(self, tp):
+        return {"cci": talib.CCI(self.high, self.low, self.close, timeperiod=tp)}
+
+    def _compute_sar(self):
+        return {"sar": talib.SAR(self.high, self.low, acceleration=0.02, maximum=0.2)}
+
+    def _compute_stochrsi(self, rl, kp, dp):
+        fastk, fastd = talib.STOCHRSI(self.close, timeperiod=rl, fastk_period=kp, fastd_period=dp, fastd_matype=0)
+        return {"stochrsi_fastk": fastk, "stochrsi_fastd": fastd}
+
+    def _compute_ichimoku(self, tp, kp, sb):
+        high = pd.Series(self.high)
+        low = pd.Series(self.low)
+        conv_line = (high.rolling(tp).max() + low.rolling(tp).min()) / 2
+        base_line = (high.rolling(kp).max() + low.rolling(kp).min()) / 2
+        senkou_a = ((conv_line + base_line) / 2).shift(kp)
+        senkou_b = ((high.rolling(sb).max() + low.rolling(sb).min()) / 2).shift(kp)
+        return {"ichimoku_senkou_a": senkou_a.to_numpy(), "ichimoku_senkou_b": senkou_b.to_numpy()}
+
+    def _compute_mfi(self, tp):
+        return {"mfi": talib.MFI(self.high, self.low, self.close, self.volume, timeperiod=tp)}
+
+    def _compute_obv(self):
+        return {"obv": talib.OBV(self.close, self.volume)}
+
+    def _compute_mom(self, tp):
+        return {"mom": talib.MOM(self.close, timeperiod=tp)}
+
+    def _compute_willr(self, tp):
+        return {"willr": talib.WILLR(self.high, self.low, self.close, timeperiod=tp)}
@@ -0,0 +1,568 @@
+"""
+Incremental (streaming) technical indicators for intraday refresh loops.
+
+Each indicator keeps the rolling state TA-Lib's loop carries from one bar to the
+next (EMA values, Wilder averages, running window sums, SAR trend), so appending a
+bar costs O(1) however long the history grows, instead of recomputing the whole
+series. The arithmetic follows TA-Lib's C implementation step by step, including
+its warm-up: the first value of every output lands on the same bar as TA-Lib's and
+the values agree with it to floating-point rounding (TA-Lib builds with fused
+multiply-add differ in the last bits). verify_against_talib measures the gap.
+
+State is plain numbers and short lists, checkpointed to JSON so a refresh loop can
+resume where it stopped without replaying the history.
+"""
+
+import copy
+import json
+import math
+from collections import deque
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from ai_trading_crew.analysts.indicator_engine import IndicatorEngine, MACD_SIGNAL_PERIOD, resolve_indicator_params
+from ai_trading_crew.utils.storage import atomic_write
+
+NAN = float("nan")
+CHECKPOINT_VERSION = 1
+
+# Streaming indicators and the parameters each one takes, in the order they are passed
+STREAM_INDICATORS = {
+    "sma": ("sma_time_period",),
+    "ema": ("ema_time_period",),
+    "rsi": ("rsi_time_period",),
+    "macd": ("macd_fast_period", "macd_slow_period"),
+    "bbands": ("bbands_time_period",),
+    "stoch": ("stoch_fast_period", "stoch_slow_period", "stoch_d_period"),
+    "obv": (),
+    "sar": (),
+    "mom": ("mom_time_period",),
+    "willr": ("willr_time_period",),
+}
+
+
+class StreamState:
+    """Base for objects whose state is checkpointed: attributes named in _state are saved and restored"""
+
+    _state = ()
+
+    def state(self) -> dict:
+        state = {}
+        for name in self._state:
+            value = getattr(self, name)
+            if isinstance(value, StreamState):
+                value = value.state()
+            elif isinstance(value, deque):
+                value = list(value)
+            state[name] = value
+        return state
+
+    def restore(self, state: dict):
+        for name in self._state:
+            current = getattr(self, name)
+            if state[name] is None:
+                setattr(self, name, None)
+            elif isinstance(current, StreamState):
+                current.restore(state[name])
+            elif isinstance(current, deque):
+                setattr(self, name, deque(state[name], maxlen=current.maxlen))
+            else:
+                setattr(self, name, state[name])
+
+
+class RunningSMA(StreamState):
+    """TA-Lib SMA: a running window total, added to before dividing and trimmed after"""
+
+    _state = ("window", "total")
+
+    def __init__(self, period: int):
+        self.period = period
+        self.window = deque(maxlen=period)
+        self.total = 0.0
+
+    def update(self, x: float) -> float:
+        self.total += x
+        self.window.append(x)
+        if len(self.window) < self.period:
+            return NAN
+        value = self.total / self.period
+        # The oldest value leaves the total now and the window on the next append
+        self.total -= self.window[0]
+        return value
+
+
+class RunningEMA(StreamState):
+    """TA-Lib EMA: seeded with the SMA of the first period values, then k = 2 / (period + 1)"""
+
+    _state = ("seed", "value")
+
+    def __init__(self, period: int):
+        self.period = period
+        self.k = 2.0 / (period + 1)
+        self.seed = []
+        self.value = NAN
+
+    def update(self, x: float) -> float:
+        if self.seed is not None:
+            self.seed.append(x)
+            if len(self.seed) < self.period:
+                return NAN
+            total = 0.0
+            for v in self.seed:
+                total += v
+            self.value = total / self.period
+            self.seed = None
+            return self.value
+        self.value = ((x - self.value) * self.k) + self.value
+        return self.value
+
+
+class RollingExtreme(StreamState):
+    """Rolling max or min over a window with a monotonic deque (amortized O(1) per bar)"""
+
+    _state = ("candidates", "count")
+
+    def __init__(self, period: int, highest: bool):
+        self.period = period
+        self.highest = highest
+        self.candidates = deque()  # [bar number, value], values monotonic from the front
+        self.count = 0
+
+    def update(self, x: float) -> float:
+        beats = (lambda v: v <= x) if self.highest else (lambda v: v >= x)
+        while self.candidates and beats(self.candidates[-1][1]):
+            self.candidates.pop()
+        self.candidates.append([self.count, x])
+        self.count += 1
+        if self.candidates[0][0] <= self.count - 1 - self.period:
+            self.candidates.popleft()
+        return self.candidates[0][1] if self.count >= self.period else NAN
+
+
+class StreamSMA(StreamState):
+    _state = ("sma",)
+
+    def __init__(self, period: int):
+        self.sma = RunningSMA(period)
+
+    def update(self, high, low, close, volume) -> Dict[str, float]:
+        return {"sma": self.sma.update(close)}
+
+
+class StreamEMA(StreamState):
+    _state = ("ema",)
+
+    def __init__(self, period: int):
+        self.ema = RunningEMA(period)
+
+    def update(self, high, low, close, volume) -> Dict[str, float]:
+        return {"ema": self.ema.update(close)}
+
+
+class StreamRSI(StreamState):
+    """Wilder RSI: average gain and loss seeded over the first period changes, then smoothed"""
+
+    _state = ("prev_close", "changes", "avg_gain", "avg_loss")
+
+    def __init__(self, period: int):
+        self.period = period
+        self.prev_close = None
+        self.changes = 0
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+
+    def update(self, high, low, close, volume) -> Dict[str, float]:
+        if self.prev_close is None:
+            self.prev_close = close
+            return {"rsi": NAN}
+        change = close - self.prev_close
+        self.prev_close = close
+        self.changes += 1
+        if self.changes <= self.period:
+            if change < 0:
+                self.avg_loss -= change
+            else:
+                self.avg_gain += change
+            if self.changes < self.period:
+                return {"rsi": NAN}
+        else:
+            self.avg_loss *= (self.period - 1)
+            self.avg_gain *= (self.period - 1)
+            if change < 0:
+                self.avg_loss -= change
+            else:
+                self.avg_gain += change
+        self.avg_loss /= self.period
+        self.avg_gain /= self.period
+        total = self.avg_gain + self.avg_loss
+        return {"rsi": 100.0 * (self.avg_gain / total) if total != 0 else 0.0}
+
+
+class StreamMACD(StreamState):
+    """
+    TA-Lib MACD. Both EMAs start on the slow period's first full bar, so the fast EMA is
+    seeded from the `fast` closes ending there rather than from the first closes.
+    """
+
+    _state = ("warmup", "fast", "slow", "signal")
+
+    def __init__(self, fast_period: int, slow_period: int, signal_period: int = MACD_SIGNAL_PERIOD):
+        if slow_period < fast_period:
+            fast_period, slow_period = slow_period, fast_period
+        self.fast_period = fast_period
+        self.slow_period = slow_period
+        self.warmup = deque(maxlen=slow_period)
+        self.fast = RunningEMA(fast_period)
+        self.slow = RunningEMA(slow_period)
+        self.signal = RunningEMA(signal_period)
+
+    def update(self, high, low, close, volume) -> Dict[str, float]:
+        empty = {"macd": NAN, "macd_signal": NAN, "macd_hist": NAN}
+        if self.warmup is not None:
+            self.warmup.append(close)
+            if len(self.warmup) < self.slow_period:
+                return empty
+            for i, x in enumerate(self.warmup):
+                slow = self.slow.update(x)
+                if i >= self.slow_period - self.fast_period:
+                    fast = self.fast.update(x)
+            self.warmup = None
+        else:
+            fast = self.fast.update(close)
+            slow = self.slow.update(close)
+        macd = fast - slow
+        signal = self.signal.update(macd)
+        if math.isnan(signal):
+            return empty
+        return {"macd": macd, "macd_signal": signal, "macd_hist": macd - signal}
+
+
+class StreamBBands(StreamState):
+    """TA-Lib BBANDS (SMA, 2 deviations): running sums of the values and their squares"""
+
+    _state = ("sma", "squares", "total2")
+
+    def __init__(self, period: int, deviations: float = 2.0):
+        self.period = period
+        self.deviations = deviations
+        self.sma = RunningSMA(period)
+        self.squares = deque(maxlen=period)
+        self.total2 = 0.0
+
+    def update(self, high, low, close, volume) -> Dict[str, float]:
+        middle = self.sma.update(close)
+        square = close * close
+        self.total2 += square
+        self.squares.append(square)
+        if math.isnan(middle):
+            return {"bbands_upper": NAN, "bbands_middle": NAN, "bbands_lower": NAN}
+        variance = self.total2 / self.period
+        self.total2 -= self.squares[0]
+        variance -= middle * middle
+        # TA-Lib treats anything below 1e-8 as zero deviation
+        deviation = math.sqrt(variance) if variance >= 0.00000001 else 0.0
+        width = deviation * self.deviations
+        return {"bbands_upper": middle + width, "bbands_middle": middle, "bbands_lower": middle - width}
+
+
+class StreamStoch(StreamState):
+    """TA-Lib STOCH with SMA smoothing of %K and %D"""
+
+    _state = ("highest", "lowest", "slowk", "slowd")
+
+    def __init__(self, fastk_period: int, slowk_period: int, slowd_period: int):
+        self.highest = RollingExtreme(fastk_period, highest=True)
+        self.lowest = RollingExtreme(fastk_period, highest=False)
+        self.slowk = RunningSMA(slowk_period)
+        self.slowd = RunningSMA(slowd_period)
+
+    def update(self, high, low, close, volume) -> Dict[str, float]:
+        highest = self.highest.update(high)
+        lowest = self.lowest.update(low)
+        slowk = slowd = NAN
+        if not math.isnan(highest):
+            diff = (highest - lowest) / 100.0
+            slowk = self.slowk.update((close - lowest) / diff if diff != 0 else 0.0)
+            if not math.isnan(slowk):
+                slowd = self.slowd.update(slowk)
+        if math.isnan(slowd):
+            slowk = NAN
+        return {"stoch_slowk": slowk, "stoch_slowd": slowd}
+
+
+class StreamOBV(StreamState):
+    _state = ("prev_close", "obv")
+
+    def __init__(self):
+        self.prev_close = None
+        self.obv = 0.0
+
+    def update(self, high, low, close, volume) -> Dict[str, float]:
+        if self.prev_close is None:
+            self.obv = volume
+        elif close > self.prev_close:
+            self.obv += volume
+        elif close < self.prev_close:
+            self.obv -= volume
+        self.prev_close = close
+        return {"obv": self.obv}
+
+
+class StreamSAR(StreamState):
+    """TA-Lib parabolic SAR; the first trend direction comes from the first two bars' directional movement"""
+
+    _state = ("prev_high", "prev_low", "is_long", "sar", "ep", "af")
+
+    def __init__(self, acceleration: float = 0.02, maximum: float = 0.2):
+        self.acceleration = min(acceleration, maximum)
+        self.maximum = maximum
+        self.prev_high = self.prev_low = None
+        self.is_long = None
+        self.sar = self.ep = NAN
+        self.af = self.acceleration
+
+    def update(self, high, low, close, volume) -> Dict[str, float]:
+        if self.prev_high is None:
+            self.prev_high, self.prev_low = high, low
+            return {"sar": NAN}
+        if self.is_long is None:
+            # Second bar: TA-Lib starts short when -DM(1) is positive, and treats this bar as its own predecessor
+            up_move = high - self.prev_high
+            down_move = self.prev_low - low
+            self.is_long = not (down_move > 0 and up_move < down_move)
+            self.sar, self.ep = (self.prev_low, high) if self.is_long else (self.prev_high, low)
+            self.prev_high, self.prev_low = high, low
+
+        prev_high, prev_low = self.prev_high, self.prev_low
+        self.prev_high, self.prev_low = high, low
+        sar, ep, af = self.sar, self.ep, self.af
+        if self.is_long:
+            if low <= sar:
+                self.is_long = False
+                sar = max(ep, prev_high, high)
+                output = sar
+                af = self.acceleration
+                ep = low
+                sar = max(sar + af * (ep - sar), prev_high, high)
+            else:
+                output = sar
+                if high > ep:
+                    ep = high
+                    af = min(af + self.acceleration, self.maximum)
+                sar = min(sar + af * (ep - sar), prev_low, low)
+        else:
+            if high >= sar:
+                self.is_long = True
+                sar = min(ep, prev_low, low)
+                output = sar
+                af = self.acceleration
+                ep = high
+                sar = min(sar + af * (ep - sar), prev_low, low)
+            else:
+                output = sar
+                if low < ep:
+                    ep = low
+                    af = min(af + self.acceleration, self.maximum)
+                sar = max(sar + af * (ep - sar), prev_high, high)
+        self.sar, self.ep, self.af = sar, ep, af
+        return {"sar": output}
+
+
+class StreamMOM(StreamState):
+    _state = ("closes",)
+
+    def __init__(self, period: int):
+        self.closes = deque(maxlen=period + 1)
+
+    def update(self, high, low, close, volume) -> Dict[str, float]:
+        self.closes.append(close)
+        full = len(self.closes) == self.closes.maxlen
+        return {"mom": close - self.closes[0] if full else NAN}
+
+
+class StreamWILLR(StreamState):
+    _state = ("highest", "lowest")
+
+    def __init__(self, period: int):
+        self.highest = RollingExtreme(period, highest=True)
+        self.lowest = RollingExtreme(period, highest=False)
+
+    def update(self, high, low, close, volume) -> Dict[str, float]:
+        highest = self.highest.update(high)
+        lowest = self.lowest.update(low)
+        if math.isnan(highest):
+            return {"willr": NAN}
+        diff = (highest - lowest) / -100.0
+        return {"willr": (highest - close) / diff if diff != 0 else 0.0}
+
+
+_STREAM_CLASSES = {
+    "sma": StreamSMA,
+    "ema": StreamEMA,
+    "rsi": StreamRSI,
+    "macd": StreamMACD,
+    "bbands": StreamBBands,
+    "stoch": StreamStoch,
+    "obv": StreamOBV,
+    "sar": StreamSAR,
+    "mom": StreamMOM,
+    "willr": StreamWILLR,
+}
+
+
+class StreamingIndicators:
+    """
+    Rolling state of every streaming indicator for one symbol and interval.
+    update() appends one bar; catch_up() appends the bars of a refreshed history that
+    are newer than the last one seen.
+    """
+
+    def __init__(self, params: Optional[dict] = None, names=None):
+        resolved = resolve_indicator_params(params)
+        self.names = list(names or STREAM_INDICATORS)
+        self.params = {key: resolved[key] for name in self.names for key in STREAM_INDICATORS[name]}
+        self.indicators = {
+            name: _STREAM_CLASSES[name](*(self.params[key] for key in STREAM_INDICATORS[name]))
+            for name in self.names
+        }
+        self.bars = 0
+        self.last_timestamp: Optional[pd.Timestamp] = None
+        self.latest: Dict[str, float] = {}
+
+    def update(self, high: float, low: float, close: float, volume: float,
+               timestamp: Optional[pd.Timestamp] = None) -> Dict[str, float]:
+        """Append one bar and return every indicator's value for it"""
+        values = {}
+        for indicator in self.indicators.values():
+            values.update(indicator.update(high, low, close, volume))
+        self.bars += 1
+        self.last_timestamp = timestamp
+        self.latest = values
+        return values
+
+    def peek(self, high: float, low: float, close: float, volume: float) -> Dict[str, float]:
+        """Indicator values for a bar without committing it (e.g. the current, still forming bar)"""
+        return copy.deepcopy(self).update(high, low, close, volume)
+
+    def catch_up(self, data: pd.DataFrame, commit_last: bool = False) -> Dict[str, float]:
+        """
+        Feed the bars of an OHLCV frame newer than the last committed one and return the
+        indicator values for the frame's last bar. Unless commit_last is set, the last bar
+        is only peeked: an intraday bar keeps changing until its interval closes, and the
+        next refresh picks it up again with its final values.
+        """
+        if self.last_timestamp is not None and self.last_timestamp not in data.index:
+            raise ValueError(f"History does not contain the last streamed bar {self.last_timestamp}")
+        new = data if self.last_timestamp is None else data.loc[data.index > self.last_timestamp]
+        if new.empty:
+            return self.latest
+
+        high, low, close, volume = (new[column].to_numpy(dtype='float64') for column in ('High', 'Low', 'Close', 'Volume'))
+        committed = len(new) if commit_last else len(new) - 1
+        for i in range(committed):
+            self.update(high[i], low[i], close[i], volume[i], new.index[i])
+        if committed == len(new):
+            return self.latest
+        return self.peek(high[-1], low[-1], close[-1], volume[-1])
+
+    def series(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Stream a whole OHLCV frame bar by bar, committing every bar, and return the output columns"""
+        rows = []
+        for timestamp, bar in zip(data.index, data[['High', 'Low', 'Close', 'Volume']].to_numpy(dtype='float64')):
+            rows.append(self.update(*bar, timestamp))
+        return pd.DataFrame(rows, index=data.index)
+
+    def state(self) -> dict:
+        return {
+            "version": CHECKPOINT_VERSION,
+            "names": self.names,
+            "params": self.params,
+            "bars": self.bars,
+            "last_timestamp": self.last_timestamp.isoformat() if self.last_timestamp is not None else None,
+            "latest": self.latest,
+            "indicators": {name: indicator.state() for name, indicator in self.indicators.items()},
+        }
+
+    @classmethod
+    def from_state(cls, state: dict) -> "StreamingIndicators":
+        if state.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported indicator checkpoint version {state.get('version')}")
+        engine = cls(state["params"], state["names"])
+        for name, indicator in engine.indicators.items():
+            indicator.restore(state["indicators"][name])
+        engine.bars = state["bars"]
+        engine.last_timestamp = pd.Timestamp(state["last_timestamp"]) if state["last_timestamp"] else None
+        engine.latest = state["latest"]
+        return engine
+
+    def save(self, path: Path):
+        """Write a JSON checkpoint, replacing the file atomically"""
+        state = json.dumps(self.state())
+        atomic_write(Path(path), lambda tmp_path: tmp_path.write_text(state))
+
+    @classmethod
+    def load(cls, path: Path) -> "StreamingIndicators":
+        with open(path) as f:
+            return cls.from_state(json.load(f))
+
+
+def verify_against_talib(data: pd.DataFrame, params: Optional[dict] = None) -> Dict[str, float]:
+    """
+    Stream an OHLCV frame and compare every output column with IndicatorEngine's TA-Lib series.
+    Returns the largest difference per column, relative to the magnitude of the TA-Lib value
+    (at least 1); a column whose warm-up NaNs fall on different bars reports inf.
+    """
+    streamed = StreamingIndicators(params).series(data)
+    engine = IndicatorEngine(data.index, *(data[column].to_numpy(dtype='float64') for column in ('High', 'Low', 'Close', 'Volume')))
+    reference = engine.frame(params, STREAM_INDICATORS)
+
+    differences = {}
+    for column in streamed.columns:
+        actual = streamed[column].to_numpy(dtype='float64')
+        expected = reference[column].to_numpy(dtype='float64')
+        if not np.array_equal(np.isnan(actual), np.isnan(expected)):
+            differences[column] = math.inf
+            continue
+        valid = ~np.isnan(expected)
+        gap = np.abs(actual[valid] - expected[valid]) / np.maximum(1.0, np.abs(expected[valid]))
+        differences[column] = float(gap.max()) if gap.size else 0.0
+    return differences
+
+
+def refresh_streaming_indicators(symbol: str, interval: str = "1min", params: Optional[dict] = None,
+                                 state_dir: Optional[Path] = None, data: Optional[pd.DataFrame] = None) -> Dict[str, float]:
+    """
+    One step of an intraday refresh loop: fetch the latest bars through the Twelve Data
+    cache (or take the already loaded `data`), feed only the ones the checkpoint has not
+    seen yet, save the checkpoint and return the indicator values for the newest bar. The
+    history is replayed from scratch when there is no usable checkpoint (missing, other
+    parameters, or its last bar has dropped out of the history).
+    """
+    from ai_trading_crew.utils.storage import safe_symbol
+    from ai_trading_crew.utils.twelve_data_manager import twelve_data_manager
+
+    state_dir = Path(state_dir) if state_dir else twelve_data_manager.data_dir / "indicator_state"
+    path = state_dir / f"{safe_symbol(symbol)}_{interval}.json"
+    if data is None:
+        data = twelve_data_manager.get_time_series_data(symbol, interval)
+    if data is None or data.empty:
+        raise ValueError(f"No {interval} data available for {symbol}")
+
+    fresh = StreamingIndicators(params)
+    engine = fresh
+    if path.exists():
+        try:
+            engine = StreamingIndicators.load(path)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Ignoring unreadable indicator checkpoint for {symbol}: {e}")
+            engine = fresh
+        if engine.params != fresh.params or engine.names != fresh.names or (
+                engine.last_timestamp is not None and engine.last_timestamp not in data.index):
+            engine = fresh
+
+    values = engine.catch_up(data)
+    engine.save(path)
+    return values
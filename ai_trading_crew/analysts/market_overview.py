@@ -1,14 +1,29 @@
-import requests
 import pandas as pd
 from dotenv import load_dotenv
 from datetime import datetime, timedelta
 import time
 import random
 from ai_trading_crew.utils.twelve_data_manager import twelve_data_manager
+from ai_trading_crew.utils.http_client import http_client
 
 # Load environment variables
 load_dotenv()
 
+# Define TwelveData symbols for each asset
+GLOBAL_MARKET_TICKERS = {
+    "EUR/USD": "EUR/USD",
+    # "Nifty 50": "NIFTY50",  # TwelveData symbol for Nifty 50 index
+    #"Shanghai Composite": "000001.SS",  # Shanghai Composite index
+    "Bitcoin": "BTC/USD",
+    "Gold": "GLD",  # ETF as backup, or XAU/USD
+    "China": "MCHI",  # iShares MSCI China ETF
+    "India": "INDA",  # iShares MSCI India ETF
+    "US 2-Year Yield": "US2Y",  # US Treasury Yield 2 Years
+    "US 10-Year Yield": "IEF",  # iShares 7-10 Year Treasury Bond ETF (closest to 10-year yield)
+    "S&P 500": "SPY"  # ETF for S&P 500
+}
+
+
 class HistoricalMarketFetcher:
     def __init__(self):
         # No need for API key management - handled by centralized manager
@@ -41,24 +56,11 @@ class HistoricalMarketFetcher:
         Returns:
             str: Formatted global market data with current values and daily changes clearly marked
         """
-        # Define TwelveData symbols for each asset
-        tickers = {
-            "EUR/USD": "EUR/USD",
-            # "Nifty 50": "NIFTY50",  # TwelveData symbol for Nifty 50 index
-            #"Shanghai Composite": "000001.SS",  # Shanghai Composite index
-            "Bitcoin": "BTC/USD",
-            "Gold": "GLD",  # ETF as backup, or XAU/USD
-            "China": "MCHI",  # iShares MSCI China ETF
-            "India": "INDA",  # iShares MSCI India ETF
-            "US 2-Year Yield": "US2Y",  # US Treasury Yield 2 Years
-            "US 10-Year Yield": "IEF",  # iShares 7-10 Year Treasury Bond ETF (closest to 10-year yield)
-            "S&P 500": "SPY"  # ETF for S&P 500
-        }
         
         results = []
         
         # Fetch data for each asset
-        for asset_name, ticker in tickers.items():
+        for asset_name, ticker in GLOBAL_MARKET_TICKERS.items():
             try:
                 asset_data = self.fetch_twelve_data_asset(ticker, days)
                 formatted_data = self._format_asset_data(asset_data, asset_name, days)
@@ -138,7 +140,7 @@ class HistoricalMarketFetcher:
                 ".rand": str(random.randint(1, 1000000))
             }
             time.sleep(1)
-            response = requests.get(url, headers=headers, params=params)
+            response = http_client.get(url, headers=headers, params=params)
             response.raise_for_status()
             data = response.json()
             if not data or "chart" not in data or "result" not in data["chart"] or not data["chart"]["result"]:
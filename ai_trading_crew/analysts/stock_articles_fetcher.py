@@ -1,14 +1,37 @@
 import asyncio
 import re
 import random
-import requests
-from bs4 import BeautifulSoup
-from crawl4ai import AsyncWebCrawler, CrawlerRunConfig, BrowserConfig
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+from ai_trading_crew.utils.article_store import article_store
+from ai_trading_crew.utils.browser_pool import browser_pool
+from ai_trading_crew.utils.crawl_scheduler import crawl_scheduler
+from ai_trading_crew.utils.domain_policy import domain_policy
+from ai_trading_crew.utils.html_parsing import make_soup
+from ai_trading_crew.utils.http_client import http_client
+from crawl4ai import CrawlerRunConfig
 import os
 
 # List of URLs to scrape - focusing on what works
 url_list = []
 
+
+@dataclass
+class ArticleRecord:
+    url: str
+    domain: str
+    method: str = ""  # extractor or crawler output the content came from, e.g. "benzinga" or "crawler_markdown"
+    content: str = ""  # raw extracted text
+    title: Optional[str] = None
+    body: Optional[str] = None  # cleaned article text; None when nothing usable was extracted
+    error: str = ""
+    seconds: float = 0.0
+
+    def describe(self) -> str:
+        outcome = self.error or f"{self.method}, {len(self.content)} chars"
+        return f"{self.url} in {self.seconds:.2f}s ({outcome})"
+
 # Realistic user agents
 USER_AGENTS = [
     # Desktop - Chrome
@@ -37,12 +60,12 @@ async def extract_finviz_content(url):
         }
         
         print(f"Fetching URL: {url}")
-        response = requests.get(url, headers=headers, timeout=15, allow_redirects=True)
+        response = await http_client.aget(url, headers=headers, timeout=15)
         print(f"Direct request status code: {response.status_code}")
         print(f"Final URL: {response.url}")
         
         if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = make_soup(response.text)
             
             # Response received successfully
             
@@ -100,9 +123,9 @@ async def extract_finviz_content(url):
                                     elif src.startswith('/'):
                                         src = 'https://finviz.com' + src
                                     
-                                    iframe_response = requests.get(src, headers=headers, timeout=10)
+                                    iframe_response = await http_client.aget(src, headers=headers, timeout=10)
                                     if iframe_response.status_code == 200:
-                                        iframe_soup = BeautifulSoup(iframe_response.text, 'html.parser')
+                                        iframe_soup = make_soup(iframe_response.text)
                                         
                                         # Extract content from iframe
                                         iframe_content = ""
@@ -199,16 +222,13 @@ async def extract_seeking_alpha_content(url):
             'Cookie': '_ga=GA1.1.123456789.1234567890; machine_cookie=05a12345'
         }
         
-        # Create a session to persist cookies
-        session = requests.Session()
-        
-        # First visit Google to set referrer
+        # First visit Google to set referrer (the shared client keeps the cookies)
         google_url = "https://www.google.com/search?q=foxconn+profit+soars+on+ai+demand+tariffs+woes+site:seekingalpha.com"
-        session.get(google_url, headers=headers, timeout=10)
+        await http_client.aget(google_url, headers=headers, timeout=10)
         
         # Now visit the actual page
         print(f"Fetching URL: {url}")
-        response = session.get(url, headers=headers, timeout=15, allow_redirects=True)
+        response = await http_client.aget(url, headers=headers, timeout=15)
         print(f"Direct request status code: {response.status_code}")
         print(f"Final URL: {response.url}")
         
@@ -217,7 +237,7 @@ async def extract_seeking_alpha_content(url):
             f.write(response.text)
             
         if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = make_soup(response.text)
             
             # Try multiple selectors to find the article content
             # Looking for the main article content with different possible selectors
@@ -337,12 +357,7 @@ async def extract_yahoo_finance_content(url):
         print(f"Extracting content from Yahoo Finance URL: {url}")
 
    
-        # First try with the direct browser approach since requests is getting blocked by consent pages
-        browser_config = BrowserConfig(
-            headless=True,
-            user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36"
-        )
-        
+        # First try with the pooled browser since requests is getting blocked by consent pages
         yahoo_config = CrawlerRunConfig(
             wait_until="domcontentloaded",  # Use domcontentloaded which is safer
             verbose=True,
@@ -461,94 +476,93 @@ async def extract_yahoo_finance_content(url):
             if article_content and len(article_content) > 200:
                 return article_content
         
-        async with AsyncWebCrawler() as crawler:
-            crawler.config = browser_config
-            print("Running AsyncWebCrawler for Yahoo Finance URL...")
+        print("Running AsyncWebCrawler for Yahoo Finance URL...")
+        async with browser_pool.lease() as crawler:
             result = await crawler.arun(url=url, config=yahoo_config)
+
+        if result and result.success:
+            # First check if we have a clean extracted article div
+            if result.html and '<div id="extracted-article">' in result.html:
+                match = re.search(r'<div id="extracted-article">(.*?)</div>', result.html, re.DOTALL)
+                if match:
+                    extracted_content = match.group(1)
+                    # Clean up the HTML tags
+                    soup = make_soup(extracted_content)
+                    return soup.get_text(separator='\n\n', strip=True)
             
-            if result and result.success:
-                # First check if we have a clean extracted article div
-                if result.html and '<div id="extracted-article">' in result.html:
-                    match = re.search(r'<div id="extracted-article">(.*?)</div>', result.html, re.DOTALL)
-                    if match:
-                        extracted_content = match.group(1)
-                        # Clean up the HTML tags
-                        soup = BeautifulSoup(extracted_content, 'html.parser')
-                        return soup.get_text(separator='\n\n', strip=True)
-                
-                # If we have markdown, use that
-                if result.markdown and len(result.markdown) > 200:
-                    return result.markdown
-                
-                # If we have text content
-                if hasattr(result, 'text') and result.text and len(result.text) > 200:
-                    return result.text
-                
-                # If we have HTML but couldn't extract structured content, try to extract from the HTML
-                if result.html:
-                    try:
-                        soup = BeautifulSoup(result.html, 'html.parser')
-                        article_content = ""
-                        
-                        # Look for title
-                        title_element = soup.select_one('h1') or soup.select_one('.caas-title') or soup.select_one('.headline')
-                        if title_element:
-                            article_content = f"{title_element.get_text(strip=True)}\n\n"
-                        
-                        # Try to find article content
-                        content_selectors = [
-                            '.caas-body', 
-                            '.article-body',
-                            '.canvas-body',
-                            '.wafer-caas-body',
-                            '.caas-content-wrapper',
-                            'article',
-                            '.content-inner',
-                            '.article-content',
-                            '#module-article'
-                        ]
-                        
-                        for selector in content_selectors:
-                            content_element = soup.select_one(selector)
-                            if content_element:
-                                # Filter out non-article elements
-                                for el in content_element.select('nav, header, footer, .ad, .advertisement'):
-                                    if el:
-                                        el.decompose()
-                                
-                                article_content += content_element.get_text(separator='\n\n', strip=True)
-                                break
-                        
-                        # If we have enough content, return it
-                        if len(article_content) > 200:
-                            return article_content
-                        
-                        # Otherwise try to gather paragraphs
-                        paragraphs = []
-                        for p in soup.select('p'):
-                            text = p.get_text(strip=True)
-                            if len(text) > 30:
-                                # Skip likely footer/header/navigation text
-                                if not any(skip in text.lower() for skip in ['cookie', 'privacy policy', 'terms of use', 'copyright', 'all rights reserved']):
-                                    paragraphs.append(text)
-                        
-                        if paragraphs:
-                            return article_content + '\n\n' + '\n\n'.join(paragraphs)
-                        
-                    except Exception as e:
-                        print(f"Error extracting from HTML: {str(e)}")
+            # If we have markdown, use that
+            if result.markdown and len(result.markdown) > 200:
+                return result.markdown
+            
+            # If we have text content
+            if hasattr(result, 'text') and result.text and len(result.text) > 200:
+                return result.text
+            
+            # If we have HTML but couldn't extract structured content, try to extract from the HTML
+            if result.html:
+                try:
+                    soup = make_soup(result.html)
+                    article_content = ""
                     
-                    # If we get here, save the HTML for debugging and return a message
-                    with open("yahoo_finance_response.html", "w", encoding="utf-8") as f:
-                        f.write(result.html)
+                    # Look for title
+                    title_element = soup.select_one('h1') or soup.select_one('.caas-title') or soup.select_one('.headline')
+                    if title_element:
+                        article_content = f"{title_element.get_text(strip=True)}\n\n"
                     
-                    return "Could not extract article content from Yahoo Finance. Check the yahoo_finance_response.html file."
-            else:
-                error_msg = result.error_message if result else "Unknown error"
-                print(f"Error with AsyncWebCrawler: {error_msg}")
+                    # Try to find article content
+                    content_selectors = [
+                        '.caas-body', 
+                        '.article-body',
+                        '.canvas-body',
+                        '.wafer-caas-body',
+                        '.caas-content-wrapper',
+                        'article',
+                        '.content-inner',
+                        '.article-content',
+                        '#module-article'
+                    ]
+                    
+                    for selector in content_selectors:
+                        content_element = soup.select_one(selector)
+                        if content_element:
+                            # Filter out non-article elements
+                            for el in content_element.select('nav, header, footer, .ad, .advertisement'):
+                                if el:
+                                    el.decompose()
+                            
+                            article_content += content_element.get_text(separator='\n\n', strip=True)
+                            break
+                    
+                    # If we have enough content, return it
+                    if len(article_content) > 200:
+                        return article_content
+                    
+                    # Otherwise try to gather paragraphs
+                    paragraphs = []
+                    for p in soup.select('p'):
+                        text = p.get_text(strip=True)
+                        if len(text) > 30:
+                            # Skip likely footer/header/navigation text
+                            if not any(skip in text.lower() for skip in ['cookie', 'privacy policy', 'terms of use', 'copyright', 'all rights reserved']):
+                                paragraphs.append(text)
+                    
+                    if paragraphs:
+                        return article_content + '\n\n' + '\n\n'.join(paragraphs)
+                    
+                except Exception as e:
+                    print(f"Error extracting from HTML: {str(e)}")
+                
+                # If we get here, save the HTML for debugging and return a message
+                with open("yahoo_finance_response.html", "w", encoding="utf-8") as f:
+                    f.write(result.html)
                 
-                # Try with straightforward HTML parsing as a fallback
-                return await extract_yahoo_finance_direct(url)
+                return "Could not extract article content from Yahoo Finance. Check the yahoo_finance_response.html file."
+        else:
+            error_msg = result.error_message if result else "Unknown error"
+            print(f"Error with AsyncWebCrawler: {error_msg}")
+            
+            # Try with straightforward HTML parsing as a fallback
+            return await extract_yahoo_finance_direct(url)
         
     except Exception as e:
         print(f"Error extracting Yahoo Finance content: {str(e)}")
@@ -594,15 +608,15 @@ async def extract_yahoo_finance_direct(url):
             
             for try_url in urls_to_try:
                 print(f"Trying URL: {try_url}")
-                response = requests.get(try_url, headers=headers, timeout=15)
+                response = await http_client.aget(try_url, headers=headers, timeout=15)
                 print(f"Status code: {response.status_code}")
                 
-                if response.status_code == 200 and "consent.yahoo.com" not in response.url:
+                if response.status_code == 200 and "consent.yahoo.com" not in str(response.url):
                     # Save response for debugging
                     with open("yahoo_finance_response.html", "w", encoding="utf-8") as f:
                         f.write(response.text)
                     
-                    soup = BeautifulSoup(response.text, 'html.parser')
+                    soup = make_soup(response.text)
                     article_content = ""
                     
                     # Look for title
@@ -672,9 +686,9 @@ async def extract_wsj_content(url):
             print(f"Searching WSJ for article: {article_title}")
             print(f"Search URL: {search_url}")
             
-            search_response = requests.get(search_url, headers=headers, timeout=15)
+            search_response = await http_client.aget(search_url, headers=headers, timeout=15)
             if search_response.status_code == 200:
-                search_soup = BeautifulSoup(search_response.text, 'html.parser')
+                search_soup = make_soup(search_response.text)
                 
                 # Look for article links
                 article_links = search_soup.select('a.headline')
@@ -687,9 +701,9 @@ async def extract_wsj_content(url):
                     print(f"Found WSJ article: {article_url}")
                     
                     # Try to get the article
-                    article_response = requests.get(article_url, headers=headers, timeout=15)
+                    article_response = await http_client.aget(article_url, headers=headers, timeout=15)
                     if article_response.status_code == 200:
-                        article_soup = BeautifulSoup(article_response.text, 'html.parser')
+                        article_soup = make_soup(article_response.text)
                         
                         # Extract title
                         title_element = article_soup.select_one('h1.headline')
@@ -750,19 +764,16 @@ async def extract_benzinga_content(url):
             'Cache-Control': 'max-age=0'
         }
         
-        # Create a session to persist cookies
-        session = requests.Session()
-        
         # Now visit the actual page
         print(f"Fetching URL: {url}")
-        response = session.get(url, headers=headers, timeout=15, allow_redirects=True)
+        response = await http_client.aget(url, headers=headers, timeout=15)
         print(f"Direct request status code: {response.status_code}")
         print(f"Final URL: {response.url}")
         
         # Response received successfully
             
         if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = make_soup(response.text)
             
             # Try multiple selectors to find the article content
             article_content = ""
@@ -829,12 +840,6 @@ async def extract_benzinga_content(url):
 
 
 async def main(url_list_to_use=None):
-    # Standard browser configuration 
-    browser_config = BrowserConfig(
-        headless=True,
-        user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36"
-    )
-    
     # Use provided URL list or default
     urls_to_process = url_list_to_use or url_list
     
@@ -1082,148 +1087,174 @@ async def main(url_list_to_use=None):
     
 
     
-    # Run crawler for each URL
-    all_articles_content = []
-    async with AsyncWebCrawler() as crawler:
-        for url in urls_to_process:
-            article_output = []
-            article_output.append(f"\nCrawling: {url}")
-            
-            try:
-                # For SeekingAlpha, directly use our extraction function without the crawler
-                if "seekingalpha.com" in url:
-                    article_output.append("Using direct extraction for SeekingAlpha")
-                    domain = url.split('/')[2]
-                    article_output.append(f"\n--- ARTICLE FROM {domain.upper()} ---\n")
-                    article_output.append(f"URL: {url}")
-                    article_content = await extract_seeking_alpha_content(url)
-                    article_output.append(article_content)
-                    article_output.append("\n" + "-" * 80)
-                    all_articles_content.append("\n".join(article_output))
-                    continue
-                
-                # For Yahoo Finance, directly use our extraction function without the crawler
-                if "finance.yahoo.com" in url:
-                    article_output.append("Using direct extraction for Yahoo Finance")
-                    domain = url.split('/')[2]
-                    article_output.append(f"\n--- ARTICLE FROM {domain.upper()} ---\n")
-                    article_output.append(f"URL: {url}")
-                    article_content = await extract_yahoo_finance_content(url)
-                    article_output.append(article_content)
-                    article_output.append("\n" + "-" * 80)
-                    all_articles_content.append("\n".join(article_output))
-                    continue
-                
-                # For Benzinga, directly use our extraction function without the crawler
-                if "benzinga.com" in url:
-                    article_output.append("Using direct extraction for Benzinga")
-                    domain = url.split('/')[2]
-                    article_output.append(f"\n--- ARTICLE FROM {domain.upper()} ---\n")
-                    article_output.append(f"URL: {url}")
-                    article_content = await extract_benzinga_content(url)
-                    article_output.append(article_content)
-                    article_output.append("\n" + "-" * 80)
-                    all_articles_content.append("\n".join(article_output))
-                    continue
-                
+    # Crawl the URLs concurrently under the shared scheduler's global and per-domain limits
+    direct_extractors = [
+        ("seekingalpha.com", "seekingalpha", extract_seeking_alpha_content),
+        ("finance.yahoo.com", "yahoo_finance", extract_yahoo_finance_content),
+        ("benzinga.com", "benzinga", extract_benzinga_content),
+        ("finviz.com", "finviz", extract_finviz_content),
+    ]
 
-                
-                # For Finviz, directly use our extraction function without the crawler
-                if "finviz.com" in url:
-                    article_output.append("Using direct extraction for Finviz")
-                    domain = url.split('/')[2]
-                    article_output.append(f"\n--- ARTICLE FROM {domain.upper()} ---\n")
-                    article_output.append(f"URL: {url}")
-                    article_content = await extract_finviz_content(url)
-                    article_output.append(article_content)
-                    article_output.append("\n" + "-" * 80)
-                    all_articles_content.append("\n".join(article_output))
-                    continue
-                
-                # For other sites, use the crawler
-                current_config = standard_config
-                current_browser = browser_config
-                
-                # Use specialized config based on the domain
-                if "finviz.com" in url:
-                    print("Using Finviz-specific configuration")
-                    current_config = finviz_config
-                elif "finance.yahoo.com" in url:
-                    print("Using Yahoo Finance-specific configuration")
-                    current_config = yahoo_finance_config
-                elif "benzinga.com" in url:
-                    print("Using Benzinga-specific configuration")
-                    current_config = benzinga_config
-                
-                crawler.config = current_browser
-                
-                # Run the crawler
+    async def crawl_article(url):
+        record = ArticleRecord(url=url, domain=url.split('/')[2])
+
+        try:
+            # These sites have their own extraction functions that don't need the crawler
+            for site, method, extract in direct_extractors:
+                if site in url:
+                    record.method = method
+                    record.content = await extract(url)
+                    return record
+
+            # For other sites, use a crawler from the shared browser pool
+            current_config = standard_config
+            
+            # Use specialized config based on the domain
+            if "finviz.com" in url:
+                print("Using Finviz-specific configuration")
+                current_config = finviz_config
+            elif "finance.yahoo.com" in url:
+                print("Using Yahoo Finance-specific configuration")
+                current_config = yahoo_finance_config
+            elif "benzinga.com" in url:
+                print("Using Benzinga-specific configuration")
+                current_config = benzinga_config
+            
+            # Run the crawler
+            async with browser_pool.lease() as crawler:
                 result = await crawler.arun(url=url, config=current_config)
-                
-                if result and result.success:
-                    # Extract domain for display
-                    domain = url.split('/')[2]
-                    article_output.append(f"\n--- ARTICLE FROM {domain.upper()} ---\n")
-                    article_output.append(f"URL: {url}")
-                    
-                    # Show content based on availability
-                    if result.markdown and len(result.markdown.strip()) > 0 and "cookie policy" not in result.markdown.lower():
-                        article_output.append("MARKDOWN CONTENT:")
-                        # Check if this is a navigation menu rather than article content
-                        if "finviz.com" in url and len(result.markdown) > 10000:
-                            # For Finviz, try alternative extraction method
-                            article_output.append("Navigation menu detected. Extracting article content directly...")
-                            article_content = await extract_finviz_content(url)
-                            article_output.append(article_content)
-                        else:
-                            # Print regular markdown content
-                            article_output.append(result.markdown)
-                    # Check for text content as another option
-                    elif hasattr(result, 'text') and result.text and len(result.text.strip()) > 0:
-                        article_output.append("TEXT CONTENT:")
-                        article_output.append(result.text)
-                    else:
-                        # Search for extracted article content in HTML
-                        if result.html:
-                            extracted_content = None
-                            
-                            # Look for our extracted article div
-                            match = re.search(r'<div id="extracted-article">(.*?)</div>', result.html, re.DOTALL)
-                            if match:
-                                extracted_content = match.group(1)
-                            
-                            if extracted_content:
-                                article_output.append("EXTRACTED ARTICLE CONTENT:")
-                                article_output.append(extracted_content)
-                            else:
-                                # No markdown or extracted content, try direct extraction methods
-                                if "finviz.com" in url:
-                                    article_output.append("Trying direct extraction method for Finviz...")
-                                    article_content = await extract_finviz_content(url)
-                                    article_output.append(article_content)
-                     
-                                elif "benzinga.com" in url:
-                                    article_output.append("Trying direct extraction method for Benzinga...")
-                                    article_content = await extract_benzinga_content(url)
-                                    article_output.append(article_content)
+            
+            if not (result and result.success):
+                record.error = result.error_message if result else 'No result'
+                return record
 
-                                    article_output.append(article_content)
-                                else:
-                                    # No extraction method available
-                                    article_output.append("No article content extracted.")
-                                    article_output.append("\nRAW HTML SNIPPET:")
-                                    article_output.append(result.html[:1000] if result.html else "No HTML available")
-                                    article_output.append("...")
-                    
+            # Take content based on availability
+            if result.markdown and len(result.markdown.strip()) > 0 and "cookie policy" not in result.markdown.lower():
+                # Check if this is a navigation menu rather than article content
+                if "finviz.com" in url and len(result.markdown) > 10000:
+                    record.method, record.content = "finviz", await extract_finviz_content(url)
                 else:
-                    article_output.append(f"Error: {result.error_message if result else 'No result'}")
-            except Exception as e:
-                article_output.append(f"Unexpected error: {str(e)}")
-            
-            article_output.append("\n" + "-" * 80)
-            all_articles_content.append("\n".join(article_output))
+                    record.method, record.content = "crawler_markdown", result.markdown
+            # Check for text content as another option
+            elif hasattr(result, 'text') and result.text and len(result.text.strip()) > 0:
+                record.method, record.content = "crawler_text", result.text
+            else:
+                # Look for our extracted article div in the HTML
+                match = re.search(r'<div id="extracted-article">(.*?)</div>', result.html or "", re.DOTALL)
+                if match and match.group(1):
+                    record.method, record.content = "crawler_extracted", match.group(1)
+                # No markdown or extracted content, try direct extraction methods
+                elif result.html and "finviz.com" in url:
+                    record.method, record.content = "finviz", await extract_finviz_content(url)
+                elif result.html and "benzinga.com" in url:
+                    record.method, record.content = "benzinga", await extract_benzinga_content(url)
+                else:
+                    record.error = "No article content extracted"
+        except Exception as e:
+            record.error = f"Unexpected error: {str(e)}"
+        
+        return record
+
+    started = time.perf_counter()
+    crawled = await crawl_scheduler.map(urls_to_process, crawl_article)
+
+    articles = []
+    for url, (record, seconds) in zip(urls_to_process, crawled):
+        if isinstance(record, asyncio.TimeoutError):
+            record = ArticleRecord(url=url, domain=url.split('/')[2], error=f"Timed out after {crawl_scheduler.url_timeout}s")
+        elif isinstance(record, Exception):
+            record = ArticleRecord(url=url, domain=url.split('/')[2], error=f"Unexpected error: {str(record)}")
+        record.seconds = seconds
+        print(f"Crawled {record.describe()}")
+        articles.append(record)
+    elapsed = time.perf_counter() - started
+    print(f"Crawled {len(urls_to_process)} articles in {elapsed:.2f}s (sum of article times: {sum(t for _, t in crawled):.2f}s)")
     
-    return "\n".join(all_articles_content)
+    return articles
+
+
+# Progress lines the direct extractors' output may carry
+_FETCH_LOG_LINE = re.compile(r"Crawling:|Fetching URL:|Direct request|Final URL:")
+# Crawl diagnostics and section markers that are never article text
+_CONTENT_MARKER_LINE = re.compile(r"MARKDOWN CONTENT:|TEXT CONTENT:|EXTRACTED ARTICLE CONTENT:|Navigation menu detected\.")
+_DIAGNOSTIC_LINE = re.compile(r"Crawling:|Using direct|Trying direct|Error:|RAW HTML SNIPPET|No article content extracted|Unexpected error:")
+# Site chrome, promotions and footers; matched against the lower-cased line
+_BOILERPLATE_LINE = re.compile("|".join(map(re.escape, [
+    "cookie", "privacy policy", "terms of use", "copyright", "all rights reserved",
+    "benzinga rankings", "give you vital metrics", "trade confidently", "newsletter built for",
+    "see the 10 stocks", "stock advisor returns as of", "motley fool", "disclosure policy",
+    "mentioned in this article", "latest news",
+])))
+_BENZINGA_FOOTER_LINE = re.compile(r"Benzinga Rankings|Trade confidently|A newsletter built|Disclosure:")
+
+
+def clean_article(record: ArticleRecord) -> ArticleRecord:
+    """Fill in the record's title and body from its extracted content in a single pass over its lines"""
+    if record.error or not record.content:
+        return record
+
+    title = None
+    content_lines = []
+    domain = record.domain.lower()
+
+    if "benzinga.com" in domain:
+        for line in record.content.rstrip().split("\n"):
+            if _FETCH_LOG_LINE.search(line):
+                continue
+            # The first substantial line is the title
+            if title is None and not line.startswith("URL:") and len(line.strip()) > 10 and "Using direct" not in line and "--- ARTICLE FROM" not in line:
+                title = line.strip()
+            # Start collecting content at the author/byline
+            elif title is not None and ("By" in line and len(line) < 50) or "Benzinga" in line:
+                content_lines.append(line)
+            elif content_lines and not _BENZINGA_FOOTER_LINE.search(line):
+                content_lines.append(line)
+
+    elif "finviz.com" in domain:
+        for line in record.content.rstrip().split("\n"):
+            if _FETCH_LOG_LINE.search(line) or "Using direct" in line:
+                continue
+            if title is None and line.startswith("Title:") and len(line.strip()) > 10:
+                title = line.replace("Title:", "").strip()
+            # Collect content after the title
+            elif title is not None and line.strip() and not line.startswith("URL:") and "--- ARTICLE FROM" not in line:
+                content_lines.append(line)
+
+    else:
+        for line in record.content.rstrip().split("\n"):
+            if _CONTENT_MARKER_LINE.search(line) or _DIAGNOSTIC_LINE.search(line) or _BOILERPLATE_LINE.search(line.lower()):
+                continue
+            # The first non-empty line is the title
+            if title is None and not content_lines:
+                if line.strip():
+                    title = line.strip()
+            else:
+                content_lines.append(line)
+
+    record.title = title
+    if title and content_lines:
+        # Remove consecutive empty lines
+        body = re.sub(r'\n\s*\n', '\n\n', "\n".join(content_lines))
+        # Remove any "Latest News" sections and stock promotions, and everything after them
+        body = body.split("Latest News")[0]
+        body = body.split("Should you invest $1,000 in ")[0]
+        record.body = body
+    return record
+
+
+async def crawl_and_clean(urls: List[str]) -> List[ArticleRecord]:
+    """Crawl the URLs and clean each article, one record per URL"""
+    articles = [clean_article(article) for article in await main(urls)]
+    domain_policy.record([(article.url, article.body is not None) for article in articles])
+    return articles
+
+
+def render_articles(records: List[ArticleRecord]) -> str:
+    """Format the cleaned articles as the text handed to the agents"""
+    rendered = [f"Title: {record.title}\nURL: {record.url}\n{record.body}" for record in records if record.body is not None]
+    if not rendered:
+        return "No article content could be extracted from the provided URLs."
+    return "\n\n" + "-" * 80 + "\n\n".join(rendered)
 
 async def get_stock_news(ticker_symbol,file_path):
     """
@@ -1249,146 +1280,17 @@ async def get_stock_news(ticker_symbol,file_path):
     if not extracted_urls:
         return f"No URLs found in {file_path}"
     
-    # Filter out GuruFocus URLs completely
-    filtered_urls = []
-    for url in extracted_urls:
-        if "gurufocus.com" not in url.lower():
-            filtered_urls.append(url)
+    # Skip denied domains and those demoted for rarely yielding content
+    filtered_urls, skipped_urls = domain_policy.filter(extracted_urls)
+    for url, reason in skipped_urls:
+        print(f"Skipping {url}: {reason}")
     
     if not filtered_urls:
-        return f"No valid URLs found in {file_path} (GuruFocus URLs are excluded)"
+        return f"No valid URLs found in {file_path} (all are on denied or demoted domains)"
     
-    # Process the articles and get the content
-    result = await main(filtered_urls)
-    
-    # Clean up the output to match the required format
-    cleaned_result = []
-    
-    for article in result.split("-" * 80):
-        if not article.strip():
-            continue
-            
-        article_lines = article.strip().split('\n')
-        cleaned_article = []
-        
-        article_title = None
-        url_line = None
-        source_domain = None
-        
-        # Process the basic metadata first
-        for line in article_lines:
-            if "--- ARTICLE FROM" in line:
-                source_domain = line.strip().replace("--- ARTICLE FROM ", "").replace(" ---", "")
-            elif line.startswith("URL:"):
-                url_line = line.strip()
-                
-        # Skip if we don't have basic URL info
-        if not url_line:
-            continue
-            
-        # Process content based on source domain
-        if "BENZINGA.COM" in (source_domain or ""):
-            # Handle Benzinga specific content
-            title_found = False
-            content_lines = []
-            
-            for line in article_lines:
-                # Skip crawling info and other metadata
-                if "Crawling:" in line or "Fetching URL:" in line or "Direct request" in line or "Final URL:" in line:
-                    continue
-                    
-                # Generic title finding from content - first substantial line after URL and metadata
-                if not title_found and not line.startswith("URL:") and len(line.strip()) > 10 and "Using direct" not in line and "--- ARTICLE FROM" not in line:
-                    # This is likely the title
-                    if not line.startswith("Crawling:"):
-                        article_title = line.strip()
-                        title_found = True
-                elif title_found and ("By" in line and len(line) < 50) or "Benzinga" in line:
-                    # Start collecting content after we've found the author/byline
-                    content_lines.append(line)
-                elif len(content_lines) > 0:
-                    # Skip footer content but keep the rest
-                    if any(skip in line for skip in ["Benzinga Rankings", "Trade confidently", "A newsletter built", "Disclosure:"]):
-                        continue
-                    content_lines.append(line)
-        
-        elif "FINVIZ.COM" in (source_domain or ""):
-            # Handle Finviz specific content
-            title_found = False
-            content_lines = []
-            
-            for line in article_lines:
-                # Skip crawling info and other metadata
-                if "Crawling:" in line or "Fetching URL:" in line or "Direct request" in line or "Final URL:" in line or "Using direct" in line:
-                    continue
-                    
-                # Look for title - first substantial line after URL and metadata
-                if not title_found and not line.startswith("URL:") and len(line.strip()) > 10 and "--- ARTICLE FROM" not in line and line.startswith("Title:"):
-                    article_title = line.replace("Title:", "").strip()
-                    title_found = True
-                    continue
-                elif title_found:
-                    # Collect content after title
-                    if line.strip() and not line.startswith("URL:") and "--- ARTICLE FROM" not in line:
-                        content_lines.append(line)
-        
-        else:
-            # Handle general content (other sources)
-            content_start = False
-            content_lines = []
-            
-            for i, line in enumerate(article_lines):
-                if any(marker in line for marker in ["MARKDOWN CONTENT:", "TEXT CONTENT:", "EXTRACTED ARTICLE CONTENT:", "Navigation menu detected."]):
-                    content_start = True
-                    continue
-                elif content_start:
-                    # Skip diagnostic and UI lines
-                    if not any(skip in line for skip in [
-                        "Crawling:", "Using direct", "Trying direct", "Error:", "RAW HTML SNIPPET", 
-                        "No article content extracted", "Unexpected error:"
-                    ]) and not any(ui_text in line.lower() for skip_patterns in [
-                        ["cookie", "privacy policy", "terms of use", "copyright", "all rights reserved"],
-                        ["benzinga rankings", "give you vital metrics", "trade confidently", "newsletter built for"],
-                        ["see the 10 stocks", "stock advisor returns as of", "motley fool", "disclosure policy"],
-                        ["mentioned in this article", "latest news"]
-                    ] for ui_text in skip_patterns):
-                        # If this is likely the title (first non-empty line of content)
-                        if not article_title and line.strip() and len(content_lines) == 0:
-                            article_title = line.strip()
-                        else:
-                            content_lines.append(line)
-        
-        # Format the output according to requirements
-        if article_title and url_line:
-            cleaned_article.append(f"Title: {article_title}")
-            cleaned_article.append(url_line)
-            
-            if len(content_lines) > 0:
-                # Clean up content - remove consecutive empty lines
-                content_text = "\n".join(content_lines)
-                content_text = re.sub(r'\n\s*\n', '\n\n', content_text)
-                
-                # Remove any "Latest News" sections and everything after them
-                if "Latest News" in content_text:
-                    content_text = content_text.split("Latest News")[0]
-                
-                # Remove stock promotion sections
-                if "Should you invest $1,000 in " in content_text:
-                    content_text = content_text.split("Should you invest $1,000 in ")[0]
-                
-                cleaned_article.append(content_text)
-                cleaned_result.append("\n".join(cleaned_article))
-    
-    if not cleaned_result:
-        return "No article content could be extracted from the provided URLs."
-    
-    # Add proper spacing between separator and content
-    formatted_result = []
-    
-    for article in cleaned_result:
-        formatted_result.append(article)
-    
-    return "\n\n" + "-" * 80 + "\n\n".join(formatted_result)
+    # Crawl and clean the articles no other symbol has crawled today, then render them as the final step
+    articles = await article_store.get_many(filtered_urls, crawl_and_clean, ArticleRecord)
+    return render_articles(articles)
 
 
 def get_stock_news_sync(ticker_symbol, file_path):
@@ -1402,4 +1304,12 @@ def get_stock_news_sync(ticker_symbol, file_path):
     Returns:
         str: Formatted string containing extracted articles
     """
-    return asyncio.run(get_stock_news(ticker_symbol, file_path))
+    async def run():
+        try:
+            return await get_stock_news(ticker_symbol, file_path)
+        finally:
+            # The pooled browsers and async HTTP connections belong to this event loop, which ends here
+            await browser_pool.close()
+            await http_client.aclose()
+
+    return asyncio.run(run())
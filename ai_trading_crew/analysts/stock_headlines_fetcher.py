@@ -1,13 +1,16 @@
 import datetime
+import time
 import pytz
-import requests
-from bs4 import BeautifulSoup
-from typing import List, Union
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import List, Optional, Tuple, Union
 from dataclasses import dataclass
 import re
 import json
 import dateutil.parser
+from ai_trading_crew.config import settings
 from ai_trading_crew.utils.company_info import get_company_name
+from ai_trading_crew.utils.html_parsing import parse_html
+from ai_trading_crew.utils.http_client import http_client
 import os
 
 @dataclass
@@ -17,6 +20,31 @@ class NewsItem:
     source: str
     published_at: datetime.datetime
 
+@dataclass
+class SourceStatus:
+    source: str
+    status: str  # "ok", "empty", "error" or "timeout"
+    items: int
+    latency: float
+    error: str = ""
+
+    def describe(self) -> str:
+        detail = f"{self.items} items, " if self.status in ("ok", "empty") else f"{self.error}, " if self.error else ""
+        return f"{self.source} {self.status} ({detail}{self.latency:.2f}s)"
+
+def _request_timeout(deadline: Optional[float], default: float) -> float:
+    """Per-request timeout capped by the time left before a time.monotonic() deadline"""
+    if deadline is None:
+        return default
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise TimeoutError("News fetch deadline passed")
+    return min(default, remaining)
+
+def _with_class(nodes: list, terms: Tuple[str, ...]) -> list:
+    """The nodes whose class attribute contains any of the terms, case-insensitively"""
+    return [node for node in nodes if any(term in node.get('class', '').lower() for term in terms)]
+
 def parse_time_input(time_input: Union[str, int]) -> datetime.datetime:
     """Convert input time to datetime object in UTC"""
     est = pytz.timezone('US/Eastern')
@@ -34,7 +62,7 @@ def parse_time_input(time_input: Union[str, int]) -> datetime.datetime:
     else:
         raise ValueError("Time input must be a string in format 'YYYY-MM-DD HH:MM' or a Unix timestamp")
 
-def fetch_finviz_news(ticker: str, start_time: datetime.datetime) -> List[NewsItem]:
+def fetch_finviz_news(ticker: str, start_time: datetime.datetime, deadline: Optional[float] = None) -> List[NewsItem]:
     """Fetch news from Finviz"""
     url = f"https://finviz.com/quote.ashx?t={ticker}&p=d"
     headers = {
@@ -46,13 +74,13 @@ def fetch_finviz_news(ticker: str, start_time: datetime.datetime) -> List[NewsIt
         'Referer': 'https://www.google.com/'
     }
     try:
-        response = requests.get(url, headers=headers)
+        response = http_client.get(url, headers=headers, timeout=_request_timeout(deadline, http_client.timeout))
         if response.status_code != 200:
             return []
         with open("finviz_response.html", "w", encoding="utf-8") as f:
             f.write(response.text)
-        soup = BeautifulSoup(response.text, 'html.parser')
-        news_table = soup.find('table', class_='fullview-news-outer')
+        page = parse_html(response.text)
+        news_table = page.select_one('table.fullview-news-outer')
         if not news_table:
             # Clean up the debug file
             try:
@@ -60,27 +88,27 @@ def fetch_finviz_news(ticker: str, start_time: datetime.datetime) -> List[NewsIt
             except OSError:
                 pass
             return []
-        rows = news_table.find_all('tr')
+        rows = news_table.select('tr')
         results = []
         est = pytz.timezone('US/Eastern')
         current_date = datetime.datetime.now(est).date()
         current_date_reference = None
         for row in rows:
             try:
-                cells = row.find_all('td')
+                cells = row.select('td')
                 if len(cells) < 2:
                     continue
                 date_cell = cells[0]
                 date_str = date_cell.text.strip()
                 title_cell = cells[1]
-                link = title_cell.find('a')
+                link = title_cell.select_one('a')
                 if not link:
                     continue
                 headline = link.text.strip()
                 article_url = link.get('href')
                 if article_url and article_url.startswith('/'):
                     article_url = f"https://finviz.com{article_url}"
-                source_text = title_cell.find('span', class_='news_source')
+                source_text = title_cell.select_one('span.news_source')
                 source = "Finviz"
                 if source_text:
                     source_str = source_text.text.strip()
@@ -215,7 +243,7 @@ def fetch_finviz_news(ticker: str, start_time: datetime.datetime) -> List[NewsIt
             pass
         return []
 
-def fetch_tipranks_news(ticker: str, start_time: datetime.datetime) -> List[NewsItem]:
+def fetch_tipranks_news(ticker: str, start_time: datetime.datetime, deadline: Optional[float] = None) -> List[NewsItem]:
     """Fetch news from TipRanks website specifically from the All News tab"""
     results = []
     est = pytz.timezone('US/Eastern')
@@ -231,101 +259,103 @@ def fetch_tipranks_news(ticker: str, start_time: datetime.datetime) -> List[News
         'Cache-Control': 'max-age=0'
     }
     try:
-        response = requests.get(news_url, headers=headers, timeout=30)
+        response = http_client.get(news_url, headers=headers, timeout=_request_timeout(deadline, 30))
         if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
+            page = parse_html(response.text)
             news_items = []
-            for link in soup.find_all('a'):
+
+            # 'ago' texts under each element, collected once per element: neighbouring links
+            # share parents and sibling containers, which were otherwise rescanned per link
+            ago_texts = {}
+
+            def texts_ago(node):
+                if node not in ago_texts:
+                    texts = (e.text.strip().lower() for e in node.select('div, span, time'))
+                    ago_texts[node] = [text for text in texts if 'ago' in text]
+                return ago_texts[node]
+
+            def time_candidates(link):
+                """Relative time texts near a link, nearest first: the link, its parent, the parent's siblings"""
+                yield from texts_ago(link)
+                parent = link.parent
+                if parent:
+                    yield from texts_ago(parent)
+                    for p_sibling in parent.siblings():
+                        if isinstance(p_sibling, str):
+                            if 'ago' in p_sibling.lower():
+                                yield p_sibling.strip().lower()
+                        else:
+                            yield from texts_ago(p_sibling)
+
+            for link in page.select('a[href*="/news/"], a[href*="/analysis/"]'):
                 try:
-                    if not link.has_attr('href') or any(nav in link['href'] for nav in ["/search", "/topic/", "/category/", "#", "javascript:"]):
+                    url = link.get('href')
+                    if any(nav in url for nav in ["/search", "/topic/", "/category/", "#", "javascript:"]):
+                        continue
+                    headline_elem = None
+                    for heading_tag in ['h1', 'h2', 'h3', 'h4']:
+                        headline_elem = link.select_one(heading_tag)
+                        if headline_elem:
+                            break
+                    if not headline_elem:
+                        for text_elem in link.select('div, span'):
+                            if text_elem.text and len(text_elem.text.strip()) > 20:
+                                headline_elem = text_elem
+                                break
+                    if not headline_elem and len(link.text.strip()) > 20:
+                        headline = link.text.strip()
+                    elif headline_elem:
+                        headline = headline_elem.text.strip()
+                    else:
+                        continue
+                    if headline in ["All News", "Bearish News", "Bullish News", "News & Insights"] or headline.startswith("More"):
                         continue
-                    url = link['href']
-                    if '/news/' in url or '/analysis/' in url:
-                        headline_elem = None
-                        for heading_tag in ['h1', 'h2', 'h3', 'h4']:
-                            if link.find(heading_tag):
-                                headline_elem = link.find(heading_tag)
+                    for prefix in ["Premium", "Market News", "Stock Analysis & Ideas", "Ratings", "Company Announcements", "Weekend Updates"]:
+                        if headline.startswith(prefix):
+                            headline = headline[len(prefix):].strip()
+                            break
+                    if url.startswith('/'):
+                        url = f"https://www.tipranks.com{url}"
+                    found_time = False
+                    article_date = None
+                    for time_text in time_candidates(link):
+                        try:
+                            time_value = ''.join(filter(str.isdigit, time_text))
+                            if not time_value:
+                                continue
+                            time_value = int(time_value)
+                            if 'hour' in time_text or 'hr' in time_text or 'h ' in time_text or 'h,' in time_text or ' h' in time_text:
+                                article_date = now - datetime.timedelta(hours=time_value)
+                                found_time = True
                                 break
-                        if not headline_elem:
-                            for text_elem in link.find_all(['div', 'span']):
-                                if text_elem.text and len(text_elem.text.strip()) > 20:
-                                    headline_elem = text_elem
-                                    break
-                        if not headline_elem and len(link.text.strip()) > 20:
-                            headline = link.text.strip()
-                        elif headline_elem:
-                            headline = headline_elem.text.strip()
-                        else:
+                            elif 'day' in time_text or ' d ' in time_text or 'd,' in time_text or ' d' in time_text:
+                                article_date = now - datetime.timedelta(days=time_value)
+                                found_time = True
+                                break
+                            elif 'min' in time_text or ' m ' in time_text or 'm,' in time_text or ' m' in time_text:
+                                article_date = now - datetime.timedelta(minutes=time_value)
+                                found_time = True
+                                break
+                            elif 'week' in time_text or ' w ' in time_text:
+                                article_date = now - datetime.timedelta(weeks=time_value)
+                                found_time = True
+                                break
+                        except (ValueError, TypeError):
                             continue
-                        if headline in ["All News", "Bearish News", "Bullish News", "News & Insights"] or headline.startswith("More"):
+                    if not found_time:
+                        if (now.date() - start_time.astimezone(est).date()).days == 0:
                             continue
-                        for prefix in ["Premium", "Market News", "Stock Analysis & Ideas", "Ratings", "Company Announcements", "Weekend Updates"]:
-                            if headline.startswith(prefix):
-                                headline = headline[len(prefix):].strip()
-                                break
-                        if url.startswith('/'):
-                            url = f"https://www.tipranks.com{url}"
-                        found_time = False
-                        article_date = None
-                        time_texts = []
-                        for time_elem in link.find_all(['div', 'span', 'time']):
-                            time_text = time_elem.text.strip().lower()
-                            if 'ago' in time_text:
-                                time_texts.append(time_text)
-                        parent = link.parent
-                        if parent:
-                            for sibling in parent.find_all(['div', 'span', 'time']):
-                                if sibling != link:
-                                    time_text = sibling.text.strip().lower()
-                                    if 'ago' in time_text:
-                                        time_texts.append(time_text)
-                            parent_siblings = list(parent.next_siblings) + list(parent.previous_siblings)
-                            for p_sibling in parent_siblings:
-                                if hasattr(p_sibling, 'find_all'):
-                                    for time_elem in p_sibling.find_all(['div', 'span', 'time']):
-                                        time_text = time_elem.text.strip().lower()
-                                        if 'ago' in time_text:
-                                            time_texts.append(time_text)
-                                elif hasattr(p_sibling, 'text') and 'ago' in p_sibling.text.lower():
-                                    time_texts.append(p_sibling.text.strip().lower())
-                        for time_text in time_texts:
-                            try:
-                                time_value = ''.join(filter(str.isdigit, time_text))
-                                if not time_value:
-                                    continue
-                                time_value = int(time_value)
-                                if 'hour' in time_text or 'hr' in time_text or 'h ' in time_text or 'h,' in time_text or ' h' in time_text:
-                                    article_date = now - datetime.timedelta(hours=time_value)
-                                    found_time = True
-                                    break
-                                elif 'day' in time_text or ' d ' in time_text or 'd,' in time_text or ' d' in time_text:
-                                    article_date = now - datetime.timedelta(days=time_value)
-                                    found_time = True
-                                    break
-                                elif 'min' in time_text or ' m ' in time_text or 'm,' in time_text or ' m' in time_text:
-                                    article_date = now - datetime.timedelta(minutes=time_value)
-                                    found_time = True
-                                    break
-                                elif 'week' in time_text or ' w ' in time_text:
-                                    article_date = now - datetime.timedelta(weeks=time_value)
-                                    found_time = True
-                                    break
-                            except (ValueError, TypeError):
-                                continue
-                        if not found_time:
-                            if (now.date() - start_time.astimezone(est).date()).days == 0:
-                                continue
-                            article_date = now
-                        if article_date.tzinfo is None:
-                            article_date = est.localize(article_date)
-                        article_date_utc = article_date.astimezone(pytz.UTC)
-                        if article_date_utc >= start_time:
-                            news_items.append(NewsItem(
-                                headline=headline,
-                                url=url,
-                                source="TipRanks",
-                                published_at=article_date_utc
-                            ))
+                        article_date = now
+                    if article_date.tzinfo is None:
+                        article_date = est.localize(article_date)
+                    article_date_utc = article_date.astimezone(pytz.UTC)
+                    if article_date_utc >= start_time:
+                        news_items.append(NewsItem(
+                            headline=headline,
+                            url=url,
+                            source="TipRanks",
+                            published_at=article_date_utc
+                        ))
                 except Exception:
                     continue
             unique_urls = {}
@@ -339,7 +369,7 @@ def fetch_tipranks_news(ticker: str, start_time: datetime.datetime) -> List[News
     except Exception:
         return []
 
-def fetch_seeking_alpha_news(ticker: str, start_time: datetime.datetime) -> List[NewsItem]:
+def fetch_seeking_alpha_news(ticker: str, start_time: datetime.datetime, deadline: Optional[float] = None) -> List[NewsItem]:
     """Fetch news from Seeking Alpha using API endpoint"""
     est = pytz.timezone('US/Eastern')
     now = datetime.datetime.now(est)
@@ -352,7 +382,7 @@ def fetch_seeking_alpha_news(ticker: str, start_time: datetime.datetime) -> List
     }
     results = []
     try:
-        response = requests.get(url, headers=headers, timeout=15)
+        response = http_client.get(url, headers=headers, timeout=_request_timeout(deadline, 15))
         if response.status_code == 200:
             try:
                 json_data = response.json()
@@ -399,7 +429,7 @@ def fetch_seeking_alpha_news(ticker: str, start_time: datetime.datetime) -> List
         pass
     return results
 
-def fetch_marketwatch_news(ticker: str, start_time: datetime.datetime) -> List[NewsItem]:
+def fetch_marketwatch_news(ticker: str, start_time: datetime.datetime, deadline: Optional[float] = None) -> List[NewsItem]:
     url = f"https://www.marketwatch.com/investing/stock/{ticker.lower()}"
     
     # List of user agents to try
@@ -410,8 +440,10 @@ def fetch_marketwatch_news(ticker: str, start_time: datetime.datetime) -> List[N
         'Mozilla/5.0 (iPhone; CPU iPhone OS 14_6 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.0 Mobile/15E148 Safari/604.1'
     ]
     
-    # Try with different user agents
+    # Try with different user agents, as long as the deadline leaves time for another attempt
     for user_agent in user_agents:
+        if deadline is not None and time.monotonic() >= deadline:
+            return []
         headers = {
             'User-Agent': user_agent,
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
@@ -428,14 +460,14 @@ def fetch_marketwatch_news(ticker: str, start_time: datetime.datetime) -> List[N
         }
         
         try:
-            response = requests.get(url, headers=headers, timeout=30)
+            response = http_client.get(url, headers=headers, timeout=_request_timeout(deadline, 30))
             
             if response.status_code == 200:
                 # Save the HTML for debugging (commented out)
                 # with open("marketwatch_response.html", "w", encoding="utf-8") as f:
                 #     f.write(response.text)
                 
-                soup = BeautifulSoup(response.text, 'html.parser')
+                page = parse_html(response.text)
                 est = pytz.timezone('US/Eastern')
                 results: List[NewsItem] = []
                 
@@ -443,11 +475,11 @@ def fetch_marketwatch_news(ticker: str, start_time: datetime.datetime) -> List[N
                 # First check for "Other News" or "Other Sources" sections
                 news_sections = []
                 
-                # Look for section headings first
+                # Look for section headings first, lower-casing the page's strings once for all headings
+                page_strings = [(string, string.lower(), parent) for string, parent in page.text_nodes()]
                 for heading_text in ["other news", "other sources", "latest news", "press releases"]:
-                    heading_elements = soup.find_all(string=lambda s: s and heading_text in s.lower())
-                    for heading in heading_elements:
-                        parent = heading.parent
+                    heading_elements = [(string, parent) for string, lowered, parent in page_strings if heading_text in lowered]
+                    for heading, parent in heading_elements:
                         if parent:
                             # Try to find the nearest container holding news items
                             container = parent
@@ -456,7 +488,8 @@ def fetch_marketwatch_news(ticker: str, start_time: datetime.datetime) -> List[N
                                 if container.parent:
                                     container = container.parent
                                     # Check if this contains list items or links
-                                    news_items = container.find_all(['li', 'div', 'article'], class_=lambda c: c and ('article' in str(c).lower() or 'story' in str(c).lower()))
+                                    news_items = _with_class(container.select('li[class], div[class], article[class]'),
+                                                             ('article', 'story'))
                                     if news_items:
                                         news_sections.append((heading.strip(), container, news_items))
                                         break
@@ -470,11 +503,11 @@ def fetch_marketwatch_news(ticker: str, start_time: datetime.datetime) -> List[N
                     for item in items:
                         try:
                             # Find the link
-                            link = item.find('a', href=True)
+                            link = item.select_one('a[href]')
                             if not link:
                                 continue
                             
-                            article_url = link['href']
+                            article_url = link.get('href')
                             if article_url.startswith('/'):
                                 article_url = f"https://www.marketwatch.com{article_url}"
                             
@@ -485,10 +518,10 @@ def fetch_marketwatch_news(ticker: str, start_time: datetime.datetime) -> List[N
                             
                             # Find the date
                             pub_date = None
-                            time_tag = item.find('time')
-                            if time_tag and time_tag.has_attr('datetime'):
+                            time_tag = item.select_one('time')
+                            if time_tag and time_tag.get('datetime') is not None:
                                 try:
-                                    pub_date = dateutil.parser.parse(time_tag['datetime'])
+                                    pub_date = dateutil.parser.parse(time_tag.get('datetime'))
                                 except Exception:
                                     pass
                             
@@ -534,14 +567,15 @@ def fetch_marketwatch_news(ticker: str, start_time: datetime.datetime) -> List[N
                 # If we didn't find proper sections, try a more general approach
                 if not results:
                     # Look for any divs that might contain news items
-                    news_containers = soup.find_all(['div', 'ul', 'section'], class_=lambda c: c and any(term in str(c).lower() for term in ['news', 'article', 'story', 'collection', 'list']))
+                    news_containers = _with_class(page.select('div[class], ul[class], section[class]'),
+                                                  ('news', 'article', 'story', 'collection', 'list'))
                     
                     for container in news_containers:
                         # Find links directly
-                        links = container.find_all('a', href=True)
+                        links = container.select('a[href]')
                         for link in links:
                             try:
-                                url = link['href']
+                                url = link.get('href')
                                 if not url or url.startswith('#') or 'javascript:' in url:
                                     continue
                                 
@@ -587,23 +621,24 @@ def fetch_marketwatch_news(ticker: str, start_time: datetime.datetime) -> List[N
             'Cache-Control': 'no-cache'
         }
         
-        response = requests.get(alt_url, headers=headers, timeout=30)
+        response = http_client.get(alt_url, headers=headers, timeout=_request_timeout(deadline, 30))
         if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
+            page = parse_html(response.text)
             est = pytz.timezone('US/Eastern')
             results = []
             
             # Search results typically have a consistent structure
-            articles = soup.find_all(['div', 'li'], class_=lambda c: c and ('article' in str(c).lower() or 'search-result' in str(c).lower()))
+            articles = _with_class(page.select('div[class], li[class]'), ('article', 'search-result'))
             
             for article in articles:
                 try:
-                    link = article.find('a', href=True)
+                    link = article.select_one('a[href]')
                     if not link:
                         continue
                     
                     headline = None
-                    headline_tag = article.find(['h2', 'h3', 'h4', 'div'], class_=lambda c: c and ('title' in str(c).lower() or 'headline' in str(c).lower()))
+                    headline_tag = next(iter(_with_class(article.select('h2[class], h3[class], h4[class], div[class]'),
+                                                         ('title', 'headline'))), None)
                     
                     if headline_tag:
                         headline = headline_tag.get_text(strip=True)
@@ -613,22 +648,23 @@ def fetch_marketwatch_news(ticker: str, start_time: datetime.datetime) -> List[N
                     if not headline or len(headline) < 5:
                         continue
                     
-                    url = link['href']
+                    url = link.get('href')
                     if url.startswith('/'):
                         url = f"https://www.marketwatch.com{url}"
                     
                     # Get date
                     pub_date = None
-                    time_tag = article.find('time')
-                    if time_tag and time_tag.has_attr('datetime'):
+                    time_tag = article.select_one('time')
+                    if time_tag and time_tag.get('datetime') is not None:
                         try:
-                            pub_date = dateutil.parser.parse(time_tag['datetime'])
+                            pub_date = dateutil.parser.parse(time_tag.get('datetime'))
                         except Exception:
                             pass
                     
                     if not pub_date:
                         # Look for date text
-                        date_tag = article.find(['span', 'div'], class_=lambda c: c and ('date' in str(c).lower() or 'time' in str(c).lower() or 'published' in str(c).lower()))
+                        date_tag = next(iter(_with_class(article.select('span[class], div[class]'),
+                                                         ('date', 'time', 'published'))), None)
                         if date_tag:
                             try:
                                 pub_date = dateutil.parser.parse(date_tag.get_text(strip=True) + " ET")
@@ -661,15 +697,70 @@ def fetch_marketwatch_news(ticker: str, start_time: datetime.datetime) -> List[N
     # Return empty list if all attempts failed
     return []
 
+NEWS_SOURCES = {
+    "Finviz": fetch_finviz_news,
+    "TipRanks": fetch_tipranks_news,
+    "Seeking Alpha": fetch_seeking_alpha_news,
+    "MarketWatch": fetch_marketwatch_news,
+}
+
+def fetch_news_sources(ticker: str, start_time: datetime.datetime,
+                       deadline: Optional[float] = None) -> Tuple[dict, List[SourceStatus]]:
+    """
+    Fetch every news source concurrently under one shared time.monotonic() deadline.
+    Sources still running at the deadline are abandoned and reported as timed out, so a
+    hanging source costs at most the deadline instead of adding to the others.
+    Returns the items per source and the status of each source.
+    """
+    if deadline is None:
+        deadline = time.monotonic() + settings.NEWS_SOURCE_DEADLINE
+    started = time.monotonic()
+    finished_at = {}
+
+    def run(name, fetch):
+        try:
+            return fetch(ticker, start_time, deadline=deadline)
+        finally:
+            finished_at[name] = time.monotonic()
+
+    executor = ThreadPoolExecutor(max_workers=len(NEWS_SOURCES), thread_name_prefix="news")
+    futures = {name: executor.submit(run, name, fetch) for name, fetch in NEWS_SOURCES.items()}
+    wait(futures.values(), timeout=max(0.0, deadline - time.monotonic()))
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    results = {}
+    statuses = []
+    for name, future in futures.items():
+        latency = finished_at.get(name, time.monotonic()) - started
+        if not future.done():
+            results[name] = []
+            statuses.append(SourceStatus(name, "timeout", 0, latency))
+        elif future.exception() is not None:
+            results[name] = []
+            statuses.append(SourceStatus(name, "error", 0, latency, str(future.exception()) or type(future.exception()).__name__))
+        else:
+            results[name] = future.result() or []
+            statuses.append(SourceStatus(name, "ok" if results[name] else "empty", len(results[name]), latency))
+    return results, statuses
+
 def fetch_stock_news(ticker: str, start_time: Union[str, int]) -> List[NewsItem]:
     """
     Fetch stock news from multiple sources including MarketWatch
     """
+    news, _ = fetch_stock_news_with_status(ticker, start_time)
+    return news
+
+def fetch_stock_news_with_status(ticker: str, start_time: Union[str, int]) -> Tuple[List[NewsItem], List[SourceStatus]]:
+    """
+    Fetch stock news from all sources concurrently; also returns each source's status and latency
+    """
     start_datetime = parse_time_input(start_time)
-    finviz_news = fetch_finviz_news(ticker, start_datetime)
-    tipranks_news = fetch_tipranks_news(ticker, start_datetime)
-    seeking_alpha_news = fetch_seeking_alpha_news(ticker, start_datetime)
-    marketwatch_news = fetch_marketwatch_news(ticker, start_datetime)
+    results, statuses = fetch_news_sources(ticker, start_datetime)
+    print(f"[{ticker}] News sources: " + "; ".join(status.describe() for status in statuses))
+    finviz_news = results["Finviz"]
+    tipranks_news = results["TipRanks"]
+    seeking_alpha_news = results["Seeking Alpha"]
+    marketwatch_news = results["MarketWatch"]
 
     # Remove duplicates from MarketWatch news (they sometimes appear twice in the same section)
     unique_mw_urls = {}
@@ -720,16 +811,17 @@ def fetch_stock_news(ticker: str, start_time: Union[str, int]) -> List[NewsItem]
         deduplicated_news.append(news_item)
         
     deduplicated_news.sort(key=lambda x: x.published_at, reverse=True)
-    return deduplicated_news
+    return deduplicated_news, statuses
 
 def get_news_context(symbol: str, start_time: str) -> str:
     """
     Get formatted news context for a stock symbol since a specific time.
     """
-    news_items = fetch_stock_news(symbol, start_time)
+    news_items, statuses = fetch_stock_news_with_status(symbol, start_time)
     company_name = get_company_name(symbol)
+    sources_line = "Sources: " + "; ".join(status.describe() for status in statuses)
     if not news_items:
-        return f"No news found for {company_name} since {start_time}"
+        return f"No news found for {company_name} since {start_time}\n{sources_line}"
     
     # Create the formatted news content with consistent line breaks
     result = f"News for {company_name} since {start_time}:\n\n"
@@ -763,6 +855,8 @@ def get_news_context(symbol: str, start_time: str) -> str:
         result += f"   Published: {formatted_date}\n"
         result += f"   URL: {item.url}\n\n"
     
+    result += f"{sources_line}\n"
+
     # Ensure consistent encoding and line endings
     result = result.replace('\r\n', '\n').replace('\r', '\n')
     
@@ -1,9 +1,13 @@
+import numpy as np
 import pandas as pd
-import talib
 import sys
 from datetime import datetime, timedelta
+from typing import Dict, List, Optional
 from ai_trading_crew.config import settings
-from ai_trading_crew.utils.twelve_data_manager import twelve_data_manager
+from ai_trading_crew.utils.twelve_data_manager import intraday_bar_length, twelve_data_manager
+from ai_trading_crew.analysts.indicator_engine import INDICATORS, IndicatorEngine, MACD_SIGNAL_PERIOD, resolve_indicator_params
+from ai_trading_crew.analysts.indicator_stream import STREAM_INDICATORS, refresh_streaming_indicators
+from ai_trading_crew.analysts.indicator_panel import PricePanel, compute_panel_indicators
 
 from dotenv import load_dotenv
 
@@ -18,6 +22,19 @@ class TwelveTI:
         self._data = None
         self._quote_data = None
         
+        # OHLCV loaded once per object as contiguous float64 arrays, see refresh()
+        self.dates = None
+        self.open = None
+        self.high = None
+        self.low = None
+        self.close = None
+        self.volume = None
+        self.engine = None
+        
+        # Latest values of the streamed indicators for intraday intervals, see _streamed_values()
+        self.stream_params = resolve_indicator_params(settings.TECHNICAL_INDICATOR_DEFAULTS)
+        self._streamed = None
+        
         # Map interval from Twelve Data format to yfinance format
         self.yf_interval_map = {
             "1min": "1m",
@@ -33,10 +50,13 @@ class TwelveTI:
             "1month": "1mo"
         }
         
-    def _get_data(self, period="4mo"):
-        # Use the centralized data manager
-        self._data = twelve_data_manager.get_time_series_data(self.symbol, self.interval, period)
-        
+    def refresh(self, period="4mo"):
+        """Load OHLCV data from the centralized data manager, replacing what this object holds"""
+        data = twelve_data_manager.get_time_series_data(self.symbol, self.interval, period)
+        return self.set_data(data)
+    
+    def set_data(self, data: pd.DataFrame):
+        """Use already loaded OHLCV data, e.g. from a batched fetch"""
         # Ensure consistent column naming to handle any data source variations
         column_mapping = {
             'open': 'Open',
@@ -48,222 +68,233 @@ class TwelveTI:
         
         # Only rename columns that exist and need renaming
         for old_name, new_name in column_mapping.items():
-            if old_name in self._data.columns and new_name not in self._data.columns:
-                self._data = self._data.rename(columns={old_name: new_name})
-        
+            if old_name in data.columns and new_name not in data.columns:
+                data = data.rename(columns={old_name: new_name})
+        
+        self._data = data
+        self.dates = data.index
+        self.open = self._get_column_data(data, 'Open')
+        self.high = self._get_column_data(data, 'High')
+        self.low = self._get_column_data(data, 'Low')
+        self.close = self._get_column_data(data, 'Close')
+        self.volume = self._get_column_data(data, 'Volume')
+        self.engine = IndicatorEngine(self.dates, self.high, self.low, self.close, self.volume)
+        self._streamed = None
         return self._data
     
-
+    def _ensure_data(self):
+        """Load the data on first use; later calls reuse the arrays until refresh()"""
+        if self._data is None:
+            self.refresh()
+    
+    def _get_data(self):
+        self._ensure_data()
+        return self._data
 
     def _get_latest_date(self):
-        data = self._get_data()
-        last_date = data.index[-1]
-        return last_date.strftime('%Y-%m-%d')
+        self._ensure_data()
+        return self.dates[-1].strftime('%Y-%m-%d')
     
     def _get_column_data(self, data, column_name):
-        """Safely get column data with proper error handling"""
+        """Safely get column data as a contiguous float64 array with proper error handling"""
         if column_name not in data.columns:
             available_columns = list(data.columns)
             raise KeyError(f"Column '{column_name}' not found in data. Available columns: {available_columns}. "
                           f"Symbol: {self.symbol}, Interval: {self.interval}")
-        return data[column_name].astype(float).to_numpy().flatten()
+        return np.ascontiguousarray(data[column_name].to_numpy(dtype=np.float64).flatten())
+
+    def indicator_frame(self, params: dict = None) -> pd.DataFrame:
+        """
+        Every indicator series for this symbol as one wide DataFrame (date x indicator column).
+        Computed in a single pass; the fetch_* and fetch_historical_* methods read the same series.
+        """
+        self._ensure_data()
+        return self.engine.frame(params)
+
+    def _indicator(self, name: str, **params):
+        """Output columns of one indicator from the engine"""
+        self._ensure_data()
+        return self.engine.series(name, params)
+
+    def _streamed_values(self) -> Optional[Dict[str, float]]:
+        """
+        Streamed indicator values for the newest bar of an intraday interval, or None.
+        The rolling state is checkpointed between refreshes, so only the bars added since
+        the last one are fed instead of recomputing every series over the whole history.
+        """
+        if intraday_bar_length(self.interval) is None:
+            return None
+        if self._streamed is None:
+            try:
+                self._streamed = refresh_streaming_indicators(self.symbol, self.interval, self.stream_params,
+                                                              data=self._data)
+            except (OSError, ValueError) as e:
+                print(f"Streaming indicators unavailable for {self.symbol} {self.interval}: {e}")
+                self._streamed = {}
+        return self._streamed or None
+
+    def _latest(self, name: str, **params) -> Dict[str, float]:
+        """
+        Newest value of each output column of one indicator. Intraday intervals read it from
+        the streamed indicators when they cover the indicator with these parameters; anything
+        else is the last value of the engine's series.
+        """
+        self._ensure_data()
+        resolved = resolve_indicator_params(params)
+        streamed = self._streamed_values() if name in STREAM_INDICATORS else None
+        if streamed is not None and all(resolved[key] == self.stream_params[key] for key in STREAM_INDICATORS[name]):
+            return {column: streamed[column] for column in INDICATORS[name][1]}
+        return {column: values[-1] for column, values in self.engine.series(name, params).items()}
+
+    def _historical_frame(self, columns: dict, days: int) -> pd.DataFrame:
+        """Last `days` complete rows of indicator columns, newest first, with the change of 'value' in percent"""
+        # Select the rows on the arrays so only `days` rows are ever put into a DataFrame
+        complete = np.flatnonzero(~np.any(np.isnan(np.column_stack(list(columns.values()))), axis=1))
+        rows = complete[-days:] if days > 0 else complete[:0]
+        window = {name: values[rows] for name, values in columns.items()}
+        
+        pct_change = np.full(len(rows), np.nan)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pct_change[1:] = (window['value'][1:] / window['value'][:-1] - 1) * 100
+        window['pct_change'] = pct_change
+        
+        # Newest first
+        df = pd.DataFrame({name: values[::-1] for name, values in window.items()},
+                          index=pd.Index(self.dates[rows][::-1], name='date'))
+        return df
 
     def fetch_adx(self, time_period: int = 14):
-        data = self._get_data()
         tp = time_period if time_period is not None else 14
 
-        high = self._get_column_data(data, 'High')
-        low = self._get_column_data(data, 'Low')
-        close = self._get_column_data(data, 'Close')
-        adx = talib.ADX(high, low, close, timeperiod=tp)
-        latest = adx[-1]
+        latest = self._latest("adx", adx_time_period=tp)["adx"]
         last_date = self._get_latest_date()
         return f"ADX with time_period of {tp} days has a latest value of {round(latest, 4)} on {last_date}."
 
     def fetch_bbands(self, time_period: int = 20):
-        data = self._get_data()
         tp = time_period if time_period is not None else 20
 
-        close = data['Close'].astype(float).to_numpy().flatten()
-        upper, middle, lower = talib.BBANDS(close, timeperiod=tp, nbdevup=2.0, nbdevdn=2.0, matype=0)
-        upper_band, middle_band, lower_band = upper[-1], middle[-1], lower[-1]
+        bands = self._latest("bbands", bbands_time_period=tp)
+        upper_band, middle_band, lower_band = bands["bbands_upper"], bands["bbands_middle"], bands["bbands_lower"]
         last_date = self._get_latest_date()
         return (f"BBANDS with time_period of {tp} days, sd of 2.0 and ma_type sma "
                 f"has an upper_band value of {round(upper_band, 4)}, middle_band value of {round(middle_band, 4)}, "
                 f"and lower_band value of {round(lower_band, 4)} on {last_date}.")
 
     def fetch_ema(self, time_period: int = 9):
-        data = self._get_data()
         tp = time_period if time_period is not None else 9
 
-        close = data['Close'].astype(float).to_numpy().flatten()
-        ema = talib.EMA(close, timeperiod=tp)
-        value = ema[-1]
+        value = self._latest("ema", ema_time_period=tp)["ema"]
         last_date = self._get_latest_date()
         return f"EMA with time_period of {tp} days has a value of {round(value, 4)} on {last_date}."
 
     def fetch_macd(self, macd_fast_period: int = 12, macd_slow_period: int = 26):
-        data = self._get_data()
         fp = macd_fast_period if macd_fast_period is not None else 12
         sp = macd_slow_period if macd_slow_period is not None else 26
-        sig = 9
+        sig = MACD_SIGNAL_PERIOD
 
-        close = data['Close'].astype(float).to_numpy().flatten()
-        macd, macdsignal, macdhist = talib.MACD(close, fastperiod=fp, slowperiod=sp, signalperiod=sig)
-        v, s, h = macd[-1], macdsignal[-1], macdhist[-1]
+        macd = self._latest("macd", macd_fast_period=fp, macd_slow_period=sp)
+        v, s, h = macd["macd"], macd["macd_signal"], macd["macd_hist"]
         last_date = self._get_latest_date()
         return (f"MACD with fast_period {fp}, slow_period {sp} and signal_period {sig} "
                 f"has a macd value of {round(v, 4)}, macd_signal of {round(s, 4)} "
                 f"and macd_hist of {round(h, 4)} on {last_date}.")
 
     def fetch_percent_b(self, time_period: int = 20):
-        data = self._get_data()
         tp = time_period if time_period is not None else 20
 
-        close_arr = data['Close'].astype(float).to_numpy().flatten()
-        upper, middle, lower = talib.BBANDS(close_arr, timeperiod=tp, nbdevup=2.0, nbdevdn=2.0, matype=0)
-        c = close_arr[-1]
-        upper_band, lower_band = upper[-1], lower[-1]
-        percent_b_value = (c - lower_band) / (upper_band - lower_band)
+        percent_b_value = self._latest("percent_b", percent_b_time_period=tp)["percent_b"]
         last_date = self._get_latest_date()
         return (f"PERCENT_B with time_period of {tp} days, sd of 2.0 and ma_type sma "
                 f"has a value of {round(percent_b_value, 4)} on {last_date}.")
 
     def fetch_rsi(self, time_period: int = 14):
-        data = self._get_data()
         tp = time_period if time_period is not None else 14
 
-        close = data['Close'].astype(float).to_numpy().flatten()
-        rsi = talib.RSI(close, timeperiod=tp)
-        value = rsi[-1]
+        value = self._latest("rsi", rsi_time_period=tp)["rsi"]
         last_date = self._get_latest_date()
         return f"RSI with time_period of {tp} days has a value of {round(value, 4)} on {last_date}."
 
     def fetch_sma(self, time_period: int = 20):
-        data = self._get_data()
         tp = time_period if time_period is not None else 20
 
-        close = data['Close'].astype(float).to_numpy().flatten()
-        sma = talib.SMA(close, timeperiod=tp)
-        value = sma[-1]
+        value = self._latest("sma", sma_time_period=tp)["sma"]
         last_date = self._get_latest_date()
         return f"SMA with time_period of {tp} days has a value of {round(value, 4)} on {last_date}."
 
     def fetch_stoch(self, fast_k_period: int = 14, slow_k_period: int = 3, slow_d_period: int = 3):
-        data = self._get_data()
         fk = fast_k_period if fast_k_period is not None else 14
         sk = slow_k_period if slow_k_period is not None else 3
         sd = slow_d_period if slow_d_period is not None else 3
 
-        high = data['High'].astype(float).to_numpy().flatten()
-        low = data['Low'].astype(float).to_numpy().flatten()
-        close = data['Close'].astype(float).to_numpy().flatten()
-        slowk, slowd = talib.STOCH(high, low, close, fastk_period=fk, slowk_period=sk, slowk_matype=0, slowd_period=sd, slowd_matype=0)
-        k_val, d_val = slowk[-1], slowd[-1]
+        stoch = self._latest("stoch", stoch_fast_period=fk, stoch_slow_period=sk, stoch_d_period=sd)
+        k_val, d_val = stoch["stoch_slowk"], stoch["stoch_slowd"]
         last_date = self._get_latest_date()
         return (f"STOCH with fast_k_period {fk}, slow_k_period {sk} and slow_d_period {sd} "
                 f"has slow_k value of {round(k_val, 4)} and slow_d value of {round(d_val, 4)} on {last_date}.")
 
     def fetch_cci(self, time_period: int = 20):
-        data = self._get_data()
         tp = time_period if time_period is not None else 20
 
-        high = data['High'].astype(float).to_numpy().flatten()
-        low = data['Low'].astype(float).to_numpy().flatten()
-        close = data['Close'].astype(float).to_numpy().flatten()
-        cci = talib.CCI(high, low, close, timeperiod=tp)
-        value = cci[-1]
+        value = self._latest("cci", cci_time_period=tp)["cci"]
         last_date = self._get_latest_date()
         return f"CCI with time_period of {tp} days has a value of {round(value, 4)} on {last_date}."
 
     def fetch_sar(self):
-        data = self._get_data()
-
-        high = data['High'].astype(float).to_numpy().flatten()
-        low = data['Low'].astype(float).to_numpy().flatten()
-        sar = talib.SAR(high, low, acceleration=0.02, maximum=0.2)
-        value = sar[-1]
+        value = self._latest("sar")["sar"]
         last_date = self._get_latest_date()
         return f"SAR has a value of {round(value, 4)} on {last_date}."
 
     def fetch_stochrsi(self, rsi_length: int = 14, stoch_length: int = 14, k_period: int = 3, d_period: int = 3):
-        data = self._get_data()
         rl = rsi_length if rsi_length is not None else 14
         sl = stoch_length if stoch_length is not None else 14
         kp = k_period if k_period is not None else 3
         dp = d_period if d_period is not None else 3
 
-        close = data['Close'].astype(float).to_numpy().flatten()
-        fastk, fastd = talib.STOCHRSI(close, timeperiod=rl, fastk_period=kp, fastd_period=dp, fastd_matype=0)
-        k_val, d_val = fastk[-1], fastd[-1]
+        stochrsi = self._latest("stochrsi", rsi_length=rl, k_period=kp, d_period=dp)
+        k_val, d_val = stochrsi["stochrsi_fastk"], stochrsi["stochrsi_fastd"]
         last_date = self._get_latest_date()
         return (f"STOCHRSI with rsi_length {rl}, stoch_length {sl}, "
                 f"k_period {kp} and d_period {dp} has values of k: {round(k_val, 4)} and d: {round(d_val, 4)} on {last_date}.")
 
     def fetch_ichimoku(self, tenkan_period: int = 9, kijun_period: int = 26, senkou_span_b_period: int = 52):
-        data = self._get_data(period="12mo")
         tp = tenkan_period if tenkan_period is not None else 9
         kp = kijun_period if kijun_period is not None else 26
         sb = senkou_span_b_period if senkou_span_b_period is not None else 52
 
-        high = data['High'].astype(float)
-        low = data['Low'].astype(float)
-        conv_line = (high.rolling(tp).max() + low.rolling(tp).min()) / 2
-        base_line = (high.rolling(kp).max() + low.rolling(kp).min()) / 2
-        senkou_a = ((conv_line + base_line) / 2).shift(kp)
-        senkou_b = ((high.rolling(sb).max() + low.rolling(sb).min()) / 2).shift(kp)
-        if len(senkou_a) < kp + 1 or len(senkou_b) < kp + 1:
+        ichimoku = self._latest("ichimoku", tenkan_period=tp, kijun_period=kp, senkou_span_b_period=sb)
+        if len(self.dates) < kp + 1:
             print(f"Not enough data for Ichimoku calculation with current periods for {self.symbol}")
             sys.exit(1)
-        spanA = senkou_a.iloc[-1]
-        spanB = senkou_b.iloc[-1]
+        spanA = ichimoku["ichimoku_senkou_a"]
+        spanB = ichimoku["ichimoku_senkou_b"]
         last_date = self._get_latest_date()
         return (f"ICHIMOKU with conversion_line_period {tp}, base_line_period {kp}, "
                 f"leading_span_b_period {sb}, lagging_span_period 26 has "
                 f"senkou_span_a of {round(spanA, 4)}, senkou_span_b of {round(spanB, 4)} on {last_date}.")
 
     def fetch_mfi(self, time_period: int = 14):
-        data = self._get_data()
         tp = time_period if time_period is not None else 14
 
-        high = data['High'].astype(float).to_numpy().flatten()
-        low = data['Low'].astype(float).to_numpy().flatten()
-        close = data['Close'].astype(float).to_numpy().flatten()
-        volume = data['Volume'].astype(float).to_numpy().flatten()
-        mfi = talib.MFI(high, low, close, volume, timeperiod=tp)
-        value = mfi[-1]
+        value = self._latest("mfi", mfi_time_period=tp)["mfi"]
         last_date = self._get_latest_date()
         return f"MFI with time_period of {tp} days has a value of {round(value, 4)} on {last_date}."
 
     def fetch_obv(self):
-        data = self._get_data()
-
-        close = data['Close'].astype(float).to_numpy().flatten()
-        volume = data['Volume'].astype(float).to_numpy().flatten()
-        obv = talib.OBV(close, volume)
-        value = obv[-1]
+        value = self._latest("obv")["obv"]
         last_date = self._get_latest_date()
         return f"OBV has a value of {round(float(value), 4)} on {last_date}."
 
     def fetch_mom(self, time_period: int = 10):
-        data = self._get_data()
         tp = time_period if time_period is not None else 10
 
-        close = data['Close'].astype(float).to_numpy().flatten()
-        mom = talib.MOM(close, timeperiod=tp)
-        value = mom[-1]
+        value = self._latest("mom", mom_time_period=tp)["mom"]
         last_date = self._get_latest_date()
         return f"MOM with time_period of {tp} days has a value of {round(value, 4)} on {last_date}."
 
     def fetch_willr(self, time_period: int = 14):
-        data = self._get_data()
         tp = time_period if time_period is not None else 14
 
-        high = data['High'].astype(float).to_numpy().flatten()
-        low = data['Low'].astype(float).to_numpy().flatten()
-        close = data['Close'].astype(float).to_numpy().flatten()
-        willr = talib.WILLR(high, low, close, timeperiod=tp)
-        value = willr[-1]
+        value = self._latest("willr", willr_time_period=tp)["willr"]
         last_date = self._get_latest_date()
         return f"WILLR with time_period of {tp} days has a value of {round(value, 4)} on {last_date}."
 
@@ -292,356 +323,169 @@ class TwelveTI:
     
     def fetch_historical_adx(self, time_period: int = 14, days: int = 30):
         """Fetch historical ADX values"""
-        data = self._get_data()
         tp = time_period if time_period is not None else 14
 
-        high = data['High'].astype(float).to_numpy().flatten()
-        low = data['Low'].astype(float).to_numpy().flatten()
-        close = data['Close'].astype(float).to_numpy().flatten()
-        adx = talib.ADX(high, low, close, timeperiod=tp)
-        
-        # Create DataFrame with dates and ADX values
-        df = pd.DataFrame({
-            'date': data.index,
-            'value': adx
-        })
-        df.set_index('date', inplace=True)
-        df = df.dropna()
-        df = df.tail(days)
-        df['pct_change'] = df['value'].pct_change() * 100
-        df = df.sort_index(ascending=False)
+        adx = self._indicator("adx", adx_time_period=tp)
+        df = self._historical_frame({'value': adx["adx"]}, days)
         
         return df, tp
 
     def fetch_historical_bbands(self, time_period: int = 20, days: int = 30):
         """Fetch historical Bollinger Bands values"""
-        data = self._get_data()
         tp = time_period if time_period is not None else 20
 
-        close = data['Close'].astype(float).to_numpy().flatten()
-        upper, middle, lower = talib.BBANDS(close, timeperiod=tp, nbdevup=2.0, nbdevdn=2.0, matype=0)
-        
-        # Create DataFrame with dates and BBANDS values (using middle band as main value)
-        df = pd.DataFrame({
-            'date': data.index,
-            'value': middle,
-            'upper': upper,
-            'lower': lower
-        })
-        df.set_index('date', inplace=True)
-        df = df.dropna()
-        df = df.tail(days)
-        df['pct_change'] = df['value'].pct_change() * 100
-        df = df.sort_index(ascending=False)
+        bands = self._indicator("bbands", bbands_time_period=tp)
+        
+        # Using middle band as main value
+        df = self._historical_frame({
+            'value': bands["bbands_middle"],
+            'upper': bands["bbands_upper"],
+            'lower': bands["bbands_lower"]
+        }, days)
         
         return df, tp
 
     def fetch_historical_ema(self, time_period: int = 9, days: int = 30):
         """Fetch historical EMA values"""
-        data = self._get_data()
         tp = time_period if time_period is not None else 9
 
-        close = data['Close'].astype(float).to_numpy().flatten()
-        ema = talib.EMA(close, timeperiod=tp)
-        
-        df = pd.DataFrame({
-            'date': data.index,
-            'value': ema
-        })
-        df.set_index('date', inplace=True)
-        df = df.dropna()
-        df = df.tail(days)
-        df['pct_change'] = df['value'].pct_change() * 100
-        df = df.sort_index(ascending=False)
+        ema = self._indicator("ema", ema_time_period=tp)
+        df = self._historical_frame({'value': ema["ema"]}, days)
         
         return df, tp
 
     def fetch_historical_macd(self, macd_fast_period: int = 12, macd_slow_period: int = 26, days: int = 30):
         """Fetch historical MACD values"""
-        data = self._get_data()
         fp = macd_fast_period if macd_fast_period is not None else 12
         sp = macd_slow_period if macd_slow_period is not None else 26
-        sig = 9
-
-        close = data['Close'].astype(float).to_numpy().flatten()
-        macd, macdsignal, macdhist = talib.MACD(close, fastperiod=fp, slowperiod=sp, signalperiod=sig)
-        
-        df = pd.DataFrame({
-            'date': data.index,
-            'value': macd,
-            'signal': macdsignal,
-            'hist': macdhist
-        })
-        df.set_index('date', inplace=True)
-        df = df.dropna()
-        df = df.tail(days)
-        df['pct_change'] = df['value'].pct_change() * 100
-        df = df.sort_index(ascending=False)
+        sig = MACD_SIGNAL_PERIOD
+
+        macd = self._indicator("macd", macd_fast_period=fp, macd_slow_period=sp)
+        df = self._historical_frame({
+            'value': macd["macd"],
+            'signal': macd["macd_signal"],
+            'hist': macd["macd_hist"]
+        }, days)
         
         return df, fp, sp, sig
 
     def fetch_historical_percent_b(self, time_period: int = 20, days: int = 30):
         """Fetch historical Percent B values"""
-        data = self._get_data()
         tp = time_period if time_period is not None else 20
 
-        close_arr = data['Close'].astype(float).to_numpy().flatten()
-        upper, middle, lower = talib.BBANDS(close_arr, timeperiod=tp, nbdevup=2.0, nbdevdn=2.0, matype=0)
-        
-        percent_b_values = (close_arr - lower) / (upper - lower)
-        
-        df = pd.DataFrame({
-            'date': data.index,
-            'value': percent_b_values
-        })
-        df.set_index('date', inplace=True)
-        df = df.dropna()
-        df = df.tail(days)
-        df['pct_change'] = df['value'].pct_change() * 100
-        df = df.sort_index(ascending=False)
+        percent_b = self._indicator("percent_b", percent_b_time_period=tp)
+        df = self._historical_frame({'value': percent_b["percent_b"]}, days)
         
         return df, tp
 
     def fetch_historical_rsi(self, time_period: int = 14, days: int = 30):
         """Fetch historical RSI values"""
-        data = self._get_data()
         tp = time_period if time_period is not None else 14
 
-        close = data['Close'].astype(float).to_numpy().flatten()
-        rsi = talib.RSI(close, timeperiod=tp)
-        
-        df = pd.DataFrame({
-            'date': data.index,
-            'value': rsi
-        })
-        df.set_index('date', inplace=True)
-        df = df.dropna()
-        df = df.tail(days)
-        df['pct_change'] = df['value'].pct_change() * 100
-        df = df.sort_index(ascending=False)
+        rsi = self._indicator("rsi", rsi_time_period=tp)
+        df = self._historical_frame({'value': rsi["rsi"]}, days)
         
         return df, tp
 
     def fetch_historical_sma(self, time_period: int = 20, days: int = 30):
         """Fetch historical SMA values"""
-        data = self._get_data()
         tp = time_period if time_period is not None else 20
 
-        close = data['Close'].astype(float).to_numpy().flatten()
-        sma = talib.SMA(close, timeperiod=tp)
-        
-        df = pd.DataFrame({
-            'date': data.index,
-            'value': sma
-        })
-        df.set_index('date', inplace=True)
-        df = df.dropna()
-        df = df.tail(days)
-        df['pct_change'] = df['value'].pct_change() * 100
-        df = df.sort_index(ascending=False)
+        sma = self._indicator("sma", sma_time_period=tp)
+        df = self._historical_frame({'value': sma["sma"]}, days)
         
         return df, tp
 
     def fetch_historical_stoch(self, fast_k_period: int = 14, slow_k_period: int = 3, slow_d_period: int = 3, days: int = 30):
         """Fetch historical Stochastic values"""
-        data = self._get_data()
         fk = fast_k_period if fast_k_period is not None else 14
         sk = slow_k_period if slow_k_period is not None else 3
         sd = slow_d_period if slow_d_period is not None else 3
 
-        high = data['High'].astype(float).to_numpy().flatten()
-        low = data['Low'].astype(float).to_numpy().flatten()
-        close = data['Close'].astype(float).to_numpy().flatten()
-        slowk, slowd = talib.STOCH(high, low, close, fastk_period=fk, slowk_period=sk, slowk_matype=0, slowd_period=sd, slowd_matype=0)
-        
-        df = pd.DataFrame({
-            'date': data.index,
-            'value': slowk,
-            'slowd': slowd
-        })
-        df.set_index('date', inplace=True)
-        df = df.dropna()
-        df = df.tail(days)
-        df['pct_change'] = df['value'].pct_change() * 100
-        df = df.sort_index(ascending=False)
+        stoch = self._indicator("stoch", stoch_fast_period=fk, stoch_slow_period=sk, stoch_d_period=sd)
+        df = self._historical_frame({
+            'value': stoch["stoch_slowk"],
+            'slowd': stoch["stoch_slowd"]
+        }, days)
         
         return df, fk, sk, sd
 
     def fetch_historical_cci(self, time_period: int = 20, days: int = 30):
         """Fetch historical CCI values"""
-        data = self._get_data()
         tp = time_period if time_period is not None else 20
 
-        high = data['High'].astype(float).to_numpy().flatten()
-        low = data['Low'].astype(float).to_numpy().flatten()
-        close = data['Close'].astype(float).to_numpy().flatten()
-        cci = talib.CCI(high, low, close, timeperiod=tp)
-        
-        df = pd.DataFrame({
-            'date': data.index,
-            'value': cci
-        })
-        df.set_index('date', inplace=True)
-        df = df.dropna()
-        df = df.tail(days)
-        df['pct_change'] = df['value'].pct_change() * 100
-        df = df.sort_index(ascending=False)
+        cci = self._indicator("cci", cci_time_period=tp)
+        df = self._historical_frame({'value': cci["cci"]}, days)
         
         return df, tp
 
     def fetch_historical_sar(self, days: int = 30):
         """Fetch historical SAR values"""
-        data = self._get_data()
-
-        high = data['High'].astype(float).to_numpy().flatten()
-        low = data['Low'].astype(float).to_numpy().flatten()
-        sar = talib.SAR(high, low, acceleration=0.02, maximum=0.2)
-        
-        df = pd.DataFrame({
-            'date': data.index,
-            'value': sar
-        })
-        df.set_index('date', inplace=True)
-        df = df.dropna()
-        df = df.tail(days)
-        df['pct_change'] = df['value'].pct_change() * 100
-        df = df.sort_index(ascending=False)
+        sar = self._indicator("sar")
+        df = self._historical_frame({'value': sar["sar"]}, days)
         
         return df
 
     def fetch_historical_stochrsi(self, rsi_length: int = 14, stoch_length: int = 14, k_period: int = 3, d_period: int = 3, days: int = 30):
         """Fetch historical StochRSI values"""
-        data = self._get_data()
         rl = rsi_length if rsi_length is not None else 14
         sl = stoch_length if stoch_length is not None else 14
         kp = k_period if k_period is not None else 3
         dp = d_period if d_period is not None else 3
 
-        close = data['Close'].astype(float).to_numpy().flatten()
-        fastk, fastd = talib.STOCHRSI(close, timeperiod=rl, fastk_period=kp, fastd_period=dp, fastd_matype=0)
-        
-        df = pd.DataFrame({
-            'date': data.index,
-            'value': fastk,
-            'fastd': fastd
-        })
-        df.set_index('date', inplace=True)
-        df = df.dropna()
-        df = df.tail(days)
-        df['pct_change'] = df['value'].pct_change() * 100
-        df = df.sort_index(ascending=False)
+        stochrsi = self._indicator("stochrsi", rsi_length=rl, k_period=kp, d_period=dp)
+        df = self._historical_frame({
+            'value': stochrsi["stochrsi_fastk"],
+            'fastd': stochrsi["stochrsi_fastd"]
+        }, days)
         
         return df, rl, sl, kp, dp
 
     def fetch_historical_ichimoku(self, tenkan_period: int = 9, kijun_period: int = 26, senkou_span_b_period: int = 52, days: int = 30):
         """Fetch historical Ichimoku values"""
-        data = self._get_data(period="12mo")
         tp = tenkan_period if tenkan_period is not None else 9
         kp = kijun_period if kijun_period is not None else 26
         sb = senkou_span_b_period if senkou_span_b_period is not None else 52
 
-        high = data['High'].astype(float)
-        low = data['Low'].astype(float)
-        conv_line = (high.rolling(tp).max() + low.rolling(tp).min()) / 2
-        base_line = (high.rolling(kp).max() + low.rolling(kp).min()) / 2
-        senkou_a = ((conv_line + base_line) / 2).shift(kp)
-        senkou_b = ((high.rolling(sb).max() + low.rolling(sb).min()) / 2).shift(kp)
-        
-        df = pd.DataFrame({
-            'date': data.index,
-            'value': senkou_a,
-            'senkou_b': senkou_b
-        })
-        df.set_index('date', inplace=True)
-        df = df.dropna()
-        df = df.tail(days)
-        df['pct_change'] = df['value'].pct_change() * 100
-        df = df.sort_index(ascending=False)
+        ichimoku = self._indicator("ichimoku", tenkan_period=tp, kijun_period=kp, senkou_span_b_period=sb)
+        df = self._historical_frame({
+            'value': ichimoku["ichimoku_senkou_a"],
+            'senkou_b': ichimoku["ichimoku_senkou_b"]
+        }, days)
         
         return df, tp, kp, sb
 
     def fetch_historical_mfi(self, time_period: int = 14, days: int = 30):
         """Fetch historical MFI values"""
-        data = self._get_data()
         tp = time_period if time_period is not None else 14
 
-        high = data['High'].astype(float).to_numpy().flatten()
-        low = data['Low'].astype(float).to_numpy().flatten()
-        close = data['Close'].astype(float).to_numpy().flatten()
-        volume = data['Volume'].astype(float).to_numpy().flatten()
-        mfi = talib.MFI(high, low, close, volume, timeperiod=tp)
-        
-        df = pd.DataFrame({
-            'date': data.index,
-            'value': mfi
-        })
-        df.set_index('date', inplace=True)
-        df = df.dropna()
-        df = df.tail(days)
-        df['pct_change'] = df['value'].pct_change() * 100
-        df = df.sort_index(ascending=False)
+        mfi = self._indicator("mfi", mfi_time_period=tp)
+        df = self._historical_frame({'value': mfi["mfi"]}, days)
         
         return df, tp
 
     def fetch_historical_obv(self, days: int = 30):
         """Fetch historical OBV values"""
-        data = self._get_data()
-
-        close = data['Close'].astype(float).to_numpy().flatten()
-        volume = data['Volume'].astype(float).to_numpy().flatten()
-        obv = talib.OBV(close, volume)
-        
-        df = pd.DataFrame({
-            'date': data.index,
-            'value': obv
-        })
-        df.set_index('date', inplace=True)
-        df = df.dropna()
-        df = df.tail(days)
-        df['pct_change'] = df['value'].pct_change() * 100
-        df = df.sort_index(ascending=False)
+        obv = self._indicator("obv")
+        df = self._historical_frame({'value': obv["obv"]}, days)
         
         return df
 
     def fetch_historical_mom(self, time_period: int = 10, days: int = 30):
         """Fetch historical Momentum values"""
-        data = self._get_data()
         tp = time_period if time_period is not None else 10
 
-        close = data['Close'].astype(float).to_numpy().flatten()
-        mom = talib.MOM(close, timeperiod=tp)
-        
-        df = pd.DataFrame({
-            'date': data.index,
-            'value': mom
-        })
-        df.set_index('date', inplace=True)
-        df = df.dropna()
-        df = df.tail(days)
-        df['pct_change'] = df['value'].pct_change() * 100
-        df = df.sort_index(ascending=False)
+        mom = self._indicator("mom", mom_time_period=tp)
+        df = self._historical_frame({'value': mom["mom"]}, days)
         
         return df, tp
 
     def fetch_historical_willr(self, time_period: int = 14, days: int = 30):
         """Fetch historical Williams %R values"""
-        data = self._get_data()
         tp = time_period if time_period is not None else 14
 
-        high = data['High'].astype(float).to_numpy().flatten()
-        low = data['Low'].astype(float).to_numpy().flatten()
-        close = data['Close'].astype(float).to_numpy().flatten()
-        willr = talib.WILLR(high, low, close, timeperiod=tp)
-        
-        df = pd.DataFrame({
-            'date': data.index,
-            'value': willr
-        })
-        df.set_index('date', inplace=True)
-        df = df.dropna()
-        df = df.tail(days)
-        df['pct_change'] = df['value'].pct_change() * 100
-        df = df.sort_index(ascending=False)
+        willr = self._indicator("willr", willr_time_period=tp)
+        df = self._historical_frame({'value': willr["willr"]}, days)
         
         return df, tp
 
@@ -670,9 +514,9 @@ class TwelveTI:
         df_sorted = df.sort_index(ascending=True)
         latest_date = df.index[0].strftime('%Y-%m-%d') if len(df) > 0 else ""
         
-        for date, row in df_sorted.iterrows():
+        for date, raw_value in zip(df_sorted.index, df_sorted['value'].to_numpy()):
             date_str = date.strftime('%Y-%m-%d')
-            value = "No data available" if pd.isna(row['value']) else round(float(row['value']), 4)
+            value = "No data available" if pd.isna(raw_value) else round(float(raw_value), 4)
             
             if date_str == latest_date:
                 result += f"* {date_str}: {value} (LATEST {indicator_name.upper()} VALUE)\n"
@@ -705,12 +549,12 @@ class TwelveTI:
         df_sorted = df.sort_index(ascending=True)
         latest_date = df.index[0].strftime('%Y-%m-%d') if len(df) > 0 else ""
         
-        for date, row in df_sorted.iterrows():
+        for date, close, pct_change in zip(df_sorted.index, df_sorted['Close'].to_numpy(), df_sorted['pct_change'].to_numpy()):
             date_str = date.strftime('%Y-%m-%d')
-            value = "No data available" if pd.isna(row['Close']) else round(float(row['Close']), 4)
+            value = "No data available" if pd.isna(close) else round(float(close), 4)
             
             if date_str == latest_date:
-                daily_change = row['pct_change'] if not pd.isna(row['pct_change']) else "N/A"
+                daily_change = pct_change if not pd.isna(pct_change) else "N/A"
                 daily_change_str = f"{daily_change:.2f}%" if isinstance(daily_change, (int, float)) else daily_change
                 result += f"* {date_str}: {value} (LATEST PRICE VALUE, Daily change from previous day: {daily_change_str})\n"
             else:
@@ -785,6 +629,34 @@ class TwelveTI:
         kijun_period: int = None,
         senkou_span_b_period: int = None,
     ):
+        # Compute every indicator in one pass; the fetch_* calls below read from it. Intraday
+        # intervals read the latest values of the streamed indicators from their checkpoint instead
+        if intraday_bar_length(self.interval) is None:
+            self.indicator_frame({
+                "adx_time_period": adx_time_period,
+                "bbands_time_period": bbands_time_period,
+                "ema_time_period": ema_time_period,
+                "macd_fast_period": macd_fast_period,
+                "macd_slow_period": macd_slow_period,
+                "percent_b_time_period": percent_b_time_period,
+                "rsi_time_period": rsi_time_period,
+                "sma_time_period": sma_time_period,
+                "stoch_fast_period": stoch_fast_period,
+                "stoch_slow_period": stoch_slow_period,
+                "stoch_d_period": stoch_d_period,
+                "cci_time_period": cci_time_period,
+                "mom_time_period": mom_time_period,
+                "willr_time_period": willr_time_period,
+                "mfi_time_period": mfi_time_period,
+                "rsi_length": rsi_length,
+                "stoch_length": stoch_length,
+                "k_period": k_period,
+                "d_period": d_period,
+                "tenkan_period": tenkan_period,
+                "kijun_period": kijun_period,
+                "senkou_span_b_period": senkou_span_b_period,
+            })
+        
         # Get the latest date for technical indicators
         last_date = self._get_latest_date()
         
@@ -826,6 +698,37 @@ class TwelveTI:
 
 def get_ti_context(symbol: str, indicator_params: dict = settings.TECHNICAL_INDICATOR_DEFAULTS, interval: str = "1day", days: int = 30) -> str:
     ti = TwelveTI(symbol, interval)
+    return _format_ti_context(ti, indicator_params, days)
+
+
+def get_ti_contexts(symbols: List[str], indicator_params: dict = settings.TECHNICAL_INDICATOR_DEFAULTS, interval: str = "1day", days: int = 30) -> Dict[str, str]:
+    """
+    Technical indicator contexts for several symbols, identical to calling get_ti_context for each.
+    Price data is fetched in batches and the indicators are computed across all symbols at once
+    over a price panel, then handed to each symbol's TwelveTI for formatting.
+    """
+    symbols = list(dict.fromkeys(symbols))
+    frames = twelve_data_manager.get_time_series_batch(symbols, interval)
+
+    tis = {}
+    for symbol in symbols:
+        ti = TwelveTI(symbol, interval)
+        if symbol in frames:
+            ti.set_data(frames[symbol])
+        else:
+            ti._ensure_data()
+        tis[symbol] = ti
+
+    panel = PricePanel({symbol: (ti.dates, ti.high, ti.low, ti.close, ti.volume) for symbol, ti in tis.items()})
+    for key, columns in compute_panel_indicators(panel, indicator_params).items():
+        for symbol, ti in tis.items():
+            ti.engine.seed(key, {name: panel.column(values, symbol) for name, values in columns.items()})
+
+    return {symbol: _format_ti_context(ti, indicator_params, days) for symbol, ti in tis.items()}
+
+
+def _format_ti_context(ti: TwelveTI, indicator_params: dict, days: int) -> str:
+    symbol = ti.symbol
     result = ti.fetch_all(**indicator_params)
     
     # Get specific fields for formatting
@@ -1,14 +1,17 @@
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-import pandas_market_calendars as mcal
+from pathlib import Path
 from typing import Optional, Tuple, List, Dict
+import hashlib
 import logging
 import os
-import pickle
 from pandas.tseries.offsets import CustomBusinessDay
 from nixtla import NixtlaClient
-from ai_trading_crew.config import settings, AGENT_INPUTS_FOLDER
-from ai_trading_crew.utils.dates import get_today_str_no_min
+from ai_trading_crew.config import settings
+from ai_trading_crew.utils.forecast_store import forecast_key, forecast_store
+from ai_trading_crew.utils.market_calendar import get_trading_calendar
+from ai_trading_crew.utils.storage import atomic_write
 from ai_trading_crew.utils.twelve_data_manager import twelve_data_manager
 
 # Configure logging
@@ -16,45 +19,160 @@ logging.basicConfig(level=logging.INFO)
 
 
 def obtain_market_schedule(start_date: datetime, end_date: datetime, market: Optional[str] = "NYSE") -> pd.DataFrame:
-    start_str = start_date.strftime('%Y-%m-%d')
-    end_str = end_date.strftime('%Y-%m-%d')
-    calendar = mcal.get_calendar(market)
-    market_schedule = calendar.schedule(start_date=start_str, end_date=end_str)
-    return market_schedule
+    return get_trading_calendar(market).schedule(start_date, end_date)
 
 def obtain_business_dates(start_date: datetime, end_date: datetime, market: Optional[str] = "NYSE") -> pd.DataFrame:
-    business_days = pd.date_range(start=start_date, end=end_date, freq='B')
-    return pd.DataFrame(index=business_days)
+    """The exchange's trading sessions between the dates, as the index of an empty frame"""
+    return pd.DataFrame(index=get_trading_calendar(market).sessions(start_date, end_date))
 
 
-def get_timegpt_forecast(symbols: List[str] = settings.SYMBOLS, time_series_defaults: Dict = settings.TIME_SERIES_DEFAULTS) -> pd.DataFrame:
+class NaiveForecastClient:
     """
-    Get TimeGPT forecasts with automatic caching. Calls API only once per day.
+    Local stand-in for NixtlaClient, for tests and runs without a TimeGPT key: every series
+    is forecast as the mean of its last `window` values, in the same output format.
     """
-    
-    # Add STOCK_MARKET_OVERVIEW_SYMBOL to symbols for TimeGPT (if not already included)
-    timegpt_symbols = symbols.copy()
-    if settings.STOCK_MARKET_OVERVIEW_SYMBOL not in timegpt_symbols:
-        timegpt_symbols.append(settings.STOCK_MARKET_OVERVIEW_SYMBOL)
-    
-    # Set up pickle file path in agents_inputs with current date
-    today_str_no_min = get_today_str_no_min()
-    input_dir = os.path.join(AGENT_INPUTS_FOLDER, today_str_no_min)
-    os.makedirs(input_dir, exist_ok=True)
-    pickle_file = os.path.join(input_dir, "timegpt_forecasts.pkl")
-    
-    # Check if pickle file exists and is from today
-    if os.path.exists(pickle_file):
-        file_mtime = datetime.fromtimestamp(os.path.getmtime(pickle_file))
-        today = datetime.now().date()
-        
-        # If file was created today, load from pickle
-        if file_mtime.date() == today:
-            print("Loading TimeGPT forecasts from cache...")
-            with open(pickle_file, 'rb') as f:
-                return pickle.load(f)
-    
-    # Call TimeGPT API if no cache or cache is old
+
+    def __init__(self, window: int = 20):
+        self.window = window
+
+    def validate_api_key(self) -> bool:
+        return True
+
+    def forecast(self, df: pd.DataFrame, h: int, freq, time_col: str = 'ds', target_col: str = 'y',
+                 id_col: str = 'unique_id', model: Optional[str] = None, **kwargs) -> pd.DataFrame:
+        rows = []
+        for unique_id, series in df.groupby(id_col, sort=False):
+            value = float(series[target_col].tail(self.window).mean())
+            for ds in pd.date_range(series[time_col].max(), periods=h + 1, freq=freq)[1:]:
+                rows.append({id_col: unique_id, time_col: ds, 'TimeGPT': value})
+        return pd.DataFrame(rows, columns=[id_col, time_col, 'TimeGPT'])
+
+
+def make_forecast_client(kind: Optional[str] = None):
+    """The forecast client named in TIMEGPT_DEFAULTS: 'nixtla' (TimeGPT API) or 'naive'"""
+    kind = kind or settings.TIMEGPT_DEFAULTS["client"]
+    if kind == "naive":
+        return NaiveForecastClient()
+    if kind == "nixtla":
+        nixtla_client = NixtlaClient(api_key=os.getenv('TIMEGPT_API_KEY'))
+        if not nixtla_client.validate_api_key():
+            raise ValueError("Problem with Nixtla API key validation")
+        return nixtla_client
+    raise ValueError(f"Unknown TimeGPT client: {kind}")
+
+
+class SymbolForecastCache:
+    """
+    Raw forecasts per symbol, stored as <cache_dir>/<symbol>/<fingerprint>.csv. The
+    fingerprint covers the symbol's whole input series, the model and the forecast dates,
+    so a series is only forecast again when its data (or the calendar ahead) changes.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = Path(cache_dir)
+
+    @staticmethod
+    def fingerprint(series: pd.DataFrame, model: str, forecast_dates: pd.DatetimeIndex) -> str:
+        digest = hashlib.sha256()
+        digest.update(",".join(map(str, series.columns)).encode("utf-8"))
+        digest.update(pd.util.hash_pandas_object(series, index=False).values.tobytes())
+        digest.update(model.encode("utf-8"))
+        digest.update(",".join(forecast_dates.strftime('%Y-%m-%d')).encode("utf-8"))
+        return digest.hexdigest()[:32]
+
+    def _symbol_dir(self, symbol: str) -> Path:
+        return self.cache_dir / symbol.replace("/", "_")
+
+    def load(self, symbol: str, key: str) -> Optional[pd.DataFrame]:
+        try:
+            forecast = pd.read_csv(self._symbol_dir(symbol) / f"{key}.csv", dtype={'unique_id': str},
+                                   parse_dates=['ds'], float_precision='round_trip')
+        except (OSError, ValueError):
+            return None
+        return forecast
+
+    def save(self, symbol: str, key: str, forecast: pd.DataFrame):
+        symbol_dir = self._symbol_dir(symbol)
+        atomic_write(symbol_dir / f"{key}.csv", lambda tmp_path: forecast.to_csv(tmp_path, index=False))
+        # Only the latest input of a symbol is ever asked for again
+        for stale in symbol_dir.glob("*.csv"):
+            if stale.stem != key:
+                stale.unlink(missing_ok=True)
+
+
+def forecast_symbols(combined_df: pd.DataFrame, freq, client=None,
+                     timegpt_defaults: Dict = settings.TIMEGPT_DEFAULTS,
+                     cache: Optional[SymbolForecastCache] = None, model_name: Optional[str] = None) -> pd.DataFrame:
+    """
+    Raw forecasts of every series in combined_df. Series whose fingerprint is cached are not
+    sent; the others go out in chunks of chunk_size series, max_concurrency calls at a time.
+    The client (anything with NixtlaClient's forecast()) is only created if something is sent.
+    """
+    horizon = timegpt_defaults["horizon"]
+    model = timegpt_defaults["model"]
+    cache = cache or SymbolForecastCache(timegpt_defaults["cache_dir"])
+    model_name = model_name or forecast_model_name(client, timegpt_defaults)
+
+    series = {unique_id: frame for unique_id, frame in combined_df.groupby('unique_id', sort=False)}
+    keys, forecasts = {}, {}
+    for unique_id, frame in series.items():
+        forecast_dates = pd.date_range(frame['ds'].max(), periods=horizon + 1, freq=freq)[1:]
+        keys[unique_id] = cache.fingerprint(frame, model_name, forecast_dates)
+        cached = cache.load(unique_id, keys[unique_id])
+        if cached is not None:
+            forecasts[unique_id] = cached
+
+    missing = [unique_id for unique_id in series if unique_id not in forecasts]
+    print(f"TimeGPT forecasts: {len(forecasts)} cached, {len(missing)} to forecast")
+
+    if missing:
+        client = client or make_forecast_client(timegpt_defaults["client"])
+        chunk_size = timegpt_defaults["chunk_size"]
+        chunks = [missing[i:i + chunk_size] for i in range(0, len(missing), chunk_size)]
+
+        def forecast_chunk(chunk: List[str]) -> pd.DataFrame:
+            return client.forecast(
+                df=pd.concat([series[unique_id] for unique_id in chunk], ignore_index=True),
+                h=horizon,
+                freq=freq,
+                time_col='ds',
+                target_col='y',
+                model=model
+            )
+
+        # Keep what the successful chunks returned, so a retry only sends the failed ones
+        error = None
+        with ThreadPoolExecutor(max_workers=min(timegpt_defaults["max_concurrency"], len(chunks))) as executor:
+            futures = [executor.submit(forecast_chunk, chunk) for chunk in chunks]
+            for chunk, future in zip(chunks, futures):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"TimeGPT forecast failed for {', '.join(chunk)}: {str(e)}")
+                    error = error or e
+                    continue
+                for unique_id, forecast in result.groupby('unique_id', sort=False):
+                    forecasts[unique_id] = forecast.reset_index(drop=True)
+                    try:
+                        cache.save(unique_id, keys[unique_id], forecasts[unique_id])
+                    except (OSError, KeyError) as e:
+                        print(f"Error caching TimeGPT forecast for {unique_id}: {str(e)}")
+        if error is not None:
+            raise error
+
+    return pd.concat([forecasts[unique_id] for unique_id in series if unique_id in forecasts], ignore_index=True)
+
+
+def forecast_model_name(client=None, timegpt_defaults: Dict = settings.TIMEGPT_DEFAULTS) -> str:
+    """What produces the forecasts, so caches never mix TimeGPT and stand-in results"""
+    if client is not None:
+        return type(client).__name__
+    if timegpt_defaults["client"] != "nixtla":
+        return timegpt_defaults["client"]
+    return timegpt_defaults["model"]
+
+
+def _compute_timegpt_forecast(timegpt_symbols: List[str], time_series_defaults: Dict, client, model_name: str) -> pd.DataFrame:
     print("Calling TimeGPT API to get forecasts...")
     
     max_missing_data = time_series_defaults["max_missing_data"]
@@ -70,57 +188,57 @@ def get_timegpt_forecast(symbols: List[str] = settings.SYMBOLS, time_series_defa
         start_date=start_date,
         end_date=end_date,
         max_missing_data=max_missing_data,
-        data_folder=data_folder
+        data_folder=data_folder,
+        workers=time_series_defaults["prep_workers"]
     )
     combined_df = handler.run()
 
-    # Get forecast using Nixtla TimeGPT
-    nixtla_client = NixtlaClient(api_key=os.getenv('TIMEGPT_API_KEY'))
-    if not nixtla_client.validate_api_key():
-        raise ValueError("Problem with Nixtla API key validation")
-
     # Create custom business day frequency that matches the actual trading days in the data
     # This follows Nixtla's documentation for handling irregular timestamps
     print("Creating custom market frequency for TimeGPT...")
     
-    # Get all unique dates from the combined data
-    all_dates = pd.to_datetime(combined_df['ds']).dt.normalize().unique()
-    all_dates = pd.DatetimeIndex(sorted(all_dates))
+    # Get the date range of the combined data
+    all_dates = pd.to_datetime(combined_df['ds']).dt.normalize()
     
-    # Generate all business days in the date range
-    full_business_days = pd.bdate_range(
-        start=all_dates.min(),
-        end=all_dates.max() + timedelta(days=30),  # Extend for forecast horizon
-        freq='B'
-    )
-    
-    # Find the market holidays (business days not in our data)
-    market_holidays = full_business_days.difference(all_dates)
+    # Find the market holidays (weekdays the exchange is closed), extended for the forecast horizon
+    market_holidays = get_trading_calendar().holidays(all_dates.min(), all_dates.max() + timedelta(days=30))
     
     # Create custom business day frequency excluding market holidays
     custom_market_freq = CustomBusinessDay(holidays=market_holidays)
     
     print(f"Created custom frequency excluding {len(market_holidays)} market holidays")
 
-    # Generate forecasts using the custom frequency
-    df_forecast = nixtla_client.forecast(
-        df=combined_df,
-        h=1,  # 1-day ahead forecast
-        freq=custom_market_freq,  # Use custom market frequency instead of 'B'
-        time_col='ds',
-        target_col='y'
-    )
+    # Generate forecasts using the custom frequency, sending only the series not forecast yet
+    df_forecast = forecast_symbols(combined_df, custom_market_freq, client=client, model_name=model_name)
     
     df_forecast['TimeGPT'] = df_forecast['TimeGPT'] * 100
-    
-    # Save to pickle for reuse
-    with open(pickle_file, 'wb') as f:
-        pickle.dump(df_forecast, f)
-    
-    print(f"TimeGPT forecasts saved to {pickle_file}")
     return df_forecast
 
 
+def get_timegpt_forecast(symbols: List[str] = settings.SYMBOLS, time_series_defaults: Dict = settings.TIME_SERIES_DEFAULTS,
+                         client=None) -> pd.DataFrame:
+    """
+    Get TimeGPT forecasts from the forecast store, keyed by the symbol set, horizon, last
+    data date and model. Only a missing key prepares data and calls the API, and then only
+    for the symbols whose input series is not already forecast. Pass client to replace the
+    Nixtla client (e.g. with a NaiveForecastClient).
+    """
+    
+    # Add STOCK_MARKET_OVERVIEW_SYMBOL to symbols for TimeGPT (if not already included)
+    timegpt_symbols = symbols.copy()
+    if settings.STOCK_MARKET_OVERVIEW_SYMBOL not in timegpt_symbols:
+        timegpt_symbols.append(settings.STOCK_MARKET_OVERVIEW_SYMBOL)
+
+    # The data ends on the last session on or before the configured end date
+    model_name = forecast_model_name(client)
+    last_data_date = get_trading_calendar().latest_session(settings.time_series_dates["end_date"].date())
+    key = forecast_key(timegpt_symbols, settings.TIMEGPT_DEFAULTS["horizon"], last_data_date, model_name)
+
+    return forecast_store.get_or_compute(
+        key, lambda: _compute_timegpt_forecast(timegpt_symbols, time_series_defaults, client, model_name)
+    )
+
+
 def format_timegpt_forecast(forecast_df: pd.DataFrame, symbol: str, company_name: str) -> str:
     symbol_forecast = forecast_df[forecast_df['unique_id'] == symbol]
     
@@ -133,7 +251,7 @@ def format_timegpt_forecast(forecast_df: pd.DataFrame, symbol: str, company_name
 
 
 class TwelveDataHandler:
-    def __init__(self, symbols_list: Optional[List[str]] = None, start_date: datetime = None, end_date: datetime = None, max_missing_data: float = None, data_folder: str = None):
+    def __init__(self, symbols_list: Optional[List[str]] = None, start_date: datetime = None, end_date: datetime = None, max_missing_data: float = None, data_folder: str = None, workers: Optional[int] = None):
 
         self.symbols = symbols_list if symbols_list is not None else settings.SYMBOLS
         if start_date is None or end_date is None or max_missing_data is None or data_folder is None:
@@ -143,9 +261,11 @@ class TwelveDataHandler:
         self.end_date = end_date
         self.max_missing_data = max_missing_data
         self.data_folder = data_folder
+        self.workers = workers if workers is not None else settings.TIME_SERIES_DEFAULTS["prep_workers"]
 
         self.market_dates = obtain_business_dates(start_date=self.start_date, end_date=self.end_date)
         self.symbol_data = {}
+        self.failures: Dict[str, str] = {}
 
 
     def fetch_data_with_std_check(self, ticker: str) -> pd.DataFrame:
@@ -166,8 +286,8 @@ class TwelveDataHandler:
         if data.empty:
             raise ValueError(f"No data fetched for ticker {ticker}.")
             
-        # Reset index to get dates as a column
-        data.reset_index(inplace=True)
+        # Reset index to get dates as a column (not in place: the manager may hand out its cached frame)
+        data = data.reset_index()
         
         # Rename columns to match Yahoo Finance format
         data.rename(columns={'datetime': 'ds'}, inplace=True)
@@ -206,62 +326,62 @@ class TwelveDataHandler:
         return df.loc[~rows_to_remove]
 
     def handle_missing_data(self, data: pd.DataFrame, data_series: str) -> Tuple[pd.DataFrame, Optional[pd.DataFrame]]:
-        modified_data = data.copy()
-
-        # Convert market dates to datetime objects
-        expected_dates = pd.to_datetime(self.market_dates.index).date
-        fetched_dates = pd.to_datetime(data['ds']).dt.date
-
-        # Find missing dates
-        missing_dates = [d for d in expected_dates if d not in fetched_dates.values]
-
-        if missing_dates:
-            max_count = len(expected_dates) * self.max_missing_data
-            if len(missing_dates) > max_count:
-                raise Exception(
-                    f"For the asset {data_series} there are {len(missing_dates)} missing trading days, which exceeds the maximum threshold of {self.max_missing_data * 100} %."
-                )
-            for missing_date in missing_dates:
-                modified_data = self.insert_missing_date(modified_data, pd.Timestamp(missing_date), 'ds')
-        missing_dates_df = pd.DataFrame(index=pd.to_datetime(missing_dates))
+        # Expected and fetched dates are compared by calendar day
+        expected_dates = pd.DatetimeIndex(self.market_dates.index).normalize()
+        fetched_dates = pd.to_datetime(data['ds'])
+        missing_dates = expected_dates[~expected_dates.isin(fetched_dates.dt.normalize())]
+        missing_dates_df = pd.DataFrame(index=missing_dates)
+
+        if missing_dates.empty:
+            return data.copy(), missing_dates_df
+
+        max_count = len(expected_dates) * self.max_missing_data
+        if len(missing_dates) > max_count:
+            raise Exception(
+                f"For the asset {data_series} there are {len(missing_dates)} missing trading days, which exceeds the maximum threshold of {self.max_missing_data * 100} %."
+            )
+
+        # Fill every missing date at once with a copy of the latest row before it (the first row if there is none)
+        ordered = data.assign(ds=fetched_dates).sort_values(by='ds', kind='stable')
+        previous = pd.DatetimeIndex(ordered['ds']).searchsorted(missing_dates, side='left') - 1
+        filled = ordered.iloc[previous.clip(min=0)].copy()
+        filled['ds'] = missing_dates.as_unit(pd.DatetimeIndex(ordered['ds']).unit)
+
+        modified_data = pd.concat([ordered, filled], ignore_index=True)
+        modified_data = modified_data.sort_values(by='ds', kind='stable').reset_index(drop=True)
         return modified_data, missing_dates_df
 
+    def prepare_symbol(self, symbol: str) -> pd.DataFrame:
+        data = self.fetch_data_with_std_check(symbol)
+        data = self.replace_empty_data(data)
+        data, missing = self.handle_missing_data(data, symbol)
 
+        # Round numeric columns to 2 decimals except for 'volume' and 'y'
+        numeric_cols = data.select_dtypes(include=['float']).columns
+        for col in numeric_cols:
+            if col not in ['volume', 'y']:
+                data[col] = data[col].round(2)
 
-
-    @staticmethod
-    def insert_missing_date(data: pd.DataFrame, date: pd.Timestamp, date_column: str) -> pd.DataFrame:
-        # Ensure the comparison is done in datetime format.
-        date = pd.to_datetime(date)
-        if date not in pd.to_datetime(data[date_column]).values:
-            # Get the most recent available row before the missing date.
-            filtered = data[pd.to_datetime(data[date_column]) < date]
-            if not filtered.empty:
-                prev_date = filtered.iloc[-1]
-            else:
-                prev_date = data.iloc[0]
-            new_row = prev_date.copy()
-            new_row[date_column] = date
-            # Append the new row and sort by the date column.
-            data = pd.concat([data, pd.DataFrame([new_row])], ignore_index=True)
-            data = data.sort_values(by=date_column).reset_index(drop=True)
+        # Save the individual symbol dataframe to CSV
+        data.to_csv(os.path.join(self.data_folder, f'{symbol.lower()}.csv'), index=False)
         return data
 
     def process_data(self):
-        for symbol in self.symbols:
-
-            data = self.fetch_data_with_std_check(symbol)
-            data = self.replace_empty_data(data)
-            data, missing = self.handle_missing_data(data, symbol)
-
-            # Round numeric columns to 2 decimals except for 'volume' and 'y'
-            numeric_cols = data.select_dtypes(include=['float']).columns
-            for col in numeric_cols:
-                if col not in ['volume', 'y']:
-                    data[col] = data[col].round(2)
-
-            self.symbol_data[symbol] = data
-
+        """
+        Prepare all symbols on a thread pool (fetching is I/O bound and the shared Twelve Data
+        manager is thread-safe). A symbol that fails is recorded in self.failures and left out
+        of the forecast instead of aborting the others.
+        """
+        workers = max(1, min(self.workers, len(self.symbols)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="timegpt-prep") as executor:
+            futures = {symbol: executor.submit(self.prepare_symbol, symbol) for symbol in self.symbols}
+
+        for symbol, future in futures.items():
+            try:
+                self.symbol_data[symbol] = future.result()
+            except Exception as e:
+                self.failures[symbol] = str(e)
+                print(f"Skipping {symbol} for TimeGPT: {e}")
 
     def run(self) -> pd.DataFrame:
         self.process_data()
@@ -269,12 +389,6 @@ class TwelveDataHandler:
         return self.combined_df
 
     def combine_data(self):
-        # Save individual symbol dataframes to CSV
-        self.combined_df = pd.DataFrame()  # Create empty DataFrame
-        for symbol, df in self.symbol_data.items():
-            file_path = os.path.join(self.data_folder, f'{symbol.lower()}.csv')
-            df.to_csv(file_path, index=False)
-
         dataframes = list(self.symbol_data.values())
         if not dataframes:
             raise ValueError("No data available to combine.")
@@ -286,11 +400,11 @@ class TwelveDataHandler:
                 raise ValueError(f"DataFrame for {symbol} does not match the expected columns: {expected_columns}")
 
         self.combined_df = pd.concat(dataframes, ignore_index=True)
-        self.combined_df = self.combined_df.sort_values(by='ds').reset_index(drop=True)
+        self.combined_df = self.combined_df.sort_values(by='ds', kind='stable').reset_index(drop=True)
 
-        market_calendar = obtain_market_schedule(start_date=self.start_date, end_date=self.end_date)
-        last_trading_date = pd.to_datetime(market_calendar.index[-1])
-        self.combined_df = self.combined_df[pd.to_datetime(self.combined_df['ds']) <= last_trading_date]
+        # Keep only the exchange's sessions, so the rows match the custom frequency used for TimeGPT
+        trading_dates = pd.to_datetime(self.combined_df['ds']).dt.normalize()
+        self.combined_df = self.combined_df[trading_dates.isin(self.market_dates.index)]
         self.combined_df = self.combined_df.drop_duplicates(subset=['ds', 'unique_id'], keep='first')
 
         combined_file_path = os.path.join(self.data_folder, 'combined.csv')
@@ -0,0 +1,555 @@
+"""
+Micro-benchmarks for the data paths the crew leans on.
+Run with `ai_trading_crew benchmark <name>`; every benchmark works offline on synthetic data.
+"""
+
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict
+
+import numpy as np
+import pandas as pd
+
+from ai_trading_crew.utils.storage import CsvStore, ParquetStore, parquet_available
+
+
+def make_ohlcv(rows: int = 5000, seed: int = 0, end: pd.Timestamp = None) -> pd.DataFrame:
+    """Random-walk daily OHLCV frame shaped like a full Twelve Data history"""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, rows)))
+    open_ = close * (1 + rng.normal(0, 0.003, rows))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.005, rows)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.005, rows)))
+    volume = rng.integers(1_000_000, 50_000_000, rows).astype('float64')
+    end = end if end is not None else pd.Timestamp.today().normalize()
+    index = pd.bdate_range(end=end, periods=rows, name='datetime')
+    return pd.DataFrame(
+        {'Open': open_, 'High': high, 'Low': low, 'Close': close, 'Volume': volume},
+        index=index,
+    ).round(4)
+
+
+def _time_per_call(func: Callable[[], object], repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        func()
+    return (time.perf_counter() - start) / repeats
+
+
+def _dir_size(path: Path) -> int:
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+
+
+def benchmark_storage(symbols: int = 10, rows: int = 5000, repeats: int = 20) -> Dict[str, float]:
+    """
+    Compare the CSV and Parquet time series stores: time to load one symbol and disk size.
+    "csv reparse" is the old cache path, which parsed the CSV once in the freshness check
+    and once more in the load on every call.
+    """
+    if not parquet_available():
+        print("pyarrow is not installed, only the CSV store can be benchmarked")
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        frames = {f"SYM{i}": make_ohlcv(rows, seed=i) for i in range(symbols)}
+        stores = {"csv": CsvStore(Path(tmp) / "csv")}
+        if parquet_available():
+            stores["parquet"] = ParquetStore(Path(tmp) / "parquet")
+
+        for name, store in stores.items():
+            for symbol, df in frames.items():
+                store.save(symbol, "1day", df)
+            results[f"{name}_disk_kb"] = _dir_size(store.root) / 1024
+
+        csv_store = stores["csv"]
+        results["csv_reparse_ms"] = 1000 * _time_per_call(
+            lambda: [
+                [pd.read_csv(csv_store.path(symbol, "1day"), index_col=0, parse_dates=True) for _ in range(2)]
+                for symbol in frames
+            ],
+            repeats,
+        ) / symbols
+
+        for name, store in stores.items():
+            def cold_load():
+                for symbol in frames:
+                    store._memo.clear()
+                    store.load(symbol, "1day")
+
+            results[f"{name}_cold_load_ms"] = 1000 * _time_per_call(cold_load, repeats) / symbols
+            cold_load()
+            for symbol in frames:
+                store.load(symbol, "1day")
+            results[f"{name}_memoized_load_ms"] = 1000 * _time_per_call(
+                lambda: [store.load(symbol, "1day") for symbol in frames], repeats
+            ) / symbols
+
+    print(f"Time series store benchmark ({symbols} symbols x {rows} rows, {repeats} repeats)")
+    for key, value in results.items():
+        print(f"  {key}: {value:.3f}")
+    return results
+
+
+def benchmark_technical_indicators(rows: int = 5000, repeats: int = 5) -> Dict[str, float]:
+    """
+    Per-symbol cost of get_ti_context when TwelveTI holds its OHLCV arrays for its lifetime,
+    against reloading the data through the manager before every indicator as it used to.
+    Runs against a temporary store seeded with a synthetic symbol and a cached quote.
+    """
+    from ai_trading_crew.analysts import technical_indicators
+    from ai_trading_crew.config import settings
+    from ai_trading_crew.utils.twelve_data_manager import twelve_data_manager
+
+    class ReloadingTI(technical_indicators.TwelveTI):
+        def _ensure_data(self):
+            self.refresh()
+
+    symbol = "BENCH"
+    original_store = twelve_data_manager.store
+    original_ti = technical_indicators.TwelveTI
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            # End past today so the manager treats the synthetic history as up to date
+            end = pd.Timestamp.today().normalize() + pd.offsets.BDay(1)
+            twelve_data_manager.store = CsvStore(Path(tmp))
+            twelve_data_manager.store.save(symbol, "1day", make_ohlcv(rows, end=end))
+            twelve_data_manager._cached_quotes[symbol] = twelve_data_manager._normalize_quote(
+                symbol, {"name": "Benchmark Corp", "datetime": end.strftime('%Y-%m-%d')}
+            )
+            twelve_data_manager._last_quote_fetch_times[symbol] = float("inf")
+
+            load_count = 0
+            original_refresh = original_ti.refresh
+
+            def counting_refresh(self, *args, **kwargs):
+                nonlocal load_count
+                load_count += 1
+                return original_refresh(self, *args, **kwargs)
+
+            for name, ti_class in (("reload_per_call", ReloadingTI), ("load_once", original_ti)):
+                technical_indicators.TwelveTI = ti_class
+                original_ti.refresh = counting_refresh
+                load_count = 0
+                technical_indicators.get_ti_context(symbol, settings.TECHNICAL_INDICATOR_DEFAULTS)
+                results[f"{name}_loads"] = load_count
+                original_ti.refresh = original_refresh
+
+                results[f"{name}_ms"] = 1000 * _time_per_call(
+                    lambda: technical_indicators.get_ti_context(symbol, settings.TECHNICAL_INDICATOR_DEFAULTS),
+                    repeats,
+                )
+        finally:
+            technical_indicators.TwelveTI = original_ti
+            twelve_data_manager.store = original_store
+            twelve_data_manager._cached_quotes.pop(symbol, None)
+            twelve_data_manager._last_quote_fetch_times.pop(symbol, None)
+
+    print(f"get_ti_context per-symbol benchmark ({rows} rows, {repeats} repeats)")
+    for key, value in results.items():
+        print(f"  {key}: {value:.3f}")
+    return results
+
+
+def benchmark_indicator_panel(symbols: int = 500, rows: int = 5000, repeats: int = 3) -> Dict[str, float]:
+    """
+    Compute every indicator for a whole symbol universe: one IndicatorEngine frame per symbol
+    against a single pass over the cross-symbol price panel (building the panel included).
+    Also reports the largest relative gap between the panel's values and IndicatorEngine's on 20 symbols.
+    """
+    from ai_trading_crew.analysts.indicator_engine import IndicatorEngine
+    from ai_trading_crew.analysts.indicator_panel import PricePanel, compute_panel_indicators, verify_against_engine
+    from ai_trading_crew.config import settings
+
+    params = settings.TECHNICAL_INDICATOR_DEFAULTS
+    histories = {}
+    for i in range(symbols):
+        df = make_ohlcv(rows, seed=i)
+        histories[f"SYM{i}"] = (df.index, *(df[column].to_numpy() for column in ('High', 'Low', 'Close', 'Volume')))
+
+    results = {}
+    results["per_symbol_ms"] = 1000 * _time_per_call(
+        lambda: [IndicatorEngine(*history).frame(params) for history in histories.values()], repeats
+    )
+    results["panel_ms"] = 1000 * _time_per_call(
+        lambda: compute_panel_indicators(PricePanel(histories), params), repeats
+    )
+    sample = dict(list(histories.items())[:20])
+    results["max_relative_gap_vs_engine"] = max(verify_against_engine(sample, params).values())
+
+    print(f"Indicator panel benchmark ({symbols} symbols x {rows} rows, {repeats} repeats)")
+    for key, value in results.items():
+        print(f"  {key}: {value:.3f}")
+    return results
+
+
+def benchmark_streaming_indicators(rows: int = 5000, new_bars: int = 200) -> Dict[str, float]:
+    """
+    Cost of one more bar in an intraday refresh loop: recomputing the streamed indicators over
+    the whole history with TA-Lib against appending the bar to the incremental state.
+    Also reports the largest relative gap between the streamed values and TA-Lib's.
+    """
+    from ai_trading_crew.analysts.indicator_engine import IndicatorEngine
+    from ai_trading_crew.analysts.indicator_stream import STREAM_INDICATORS, StreamingIndicators, verify_against_talib
+    from ai_trading_crew.config import settings
+
+    params = settings.TECHNICAL_INDICATOR_DEFAULTS
+    df = make_ohlcv(rows + new_bars)
+    arrays = [df[column].to_numpy() for column in ('High', 'Low', 'Close', 'Volume')]
+
+    results = {}
+    start = time.perf_counter()
+    for end in range(rows, rows + new_bars):
+        IndicatorEngine(df.index[:end], *(a[:end] for a in arrays)).frame(params, STREAM_INDICATORS)
+    results["recompute_per_bar_ms"] = 1000 * (time.perf_counter() - start) / new_bars
+
+    stream = StreamingIndicators(params)
+    stream.catch_up(df.iloc[:rows], commit_last=True)
+    start = time.perf_counter()
+    for i in range(rows, rows + new_bars):
+        stream.update(*(a[i] for a in arrays), df.index[i])
+    results["stream_per_bar_ms"] = 1000 * (time.perf_counter() - start) / new_bars
+
+    results["max_relative_gap_vs_talib"] = max(verify_against_talib(df, params).values())
+    results["refresh_sees_new_bars"] = float(_refresh_sees_new_bars(rows))
+
+    print(f"Streaming indicators benchmark ({rows} rows of history, {new_bars} new bars)")
+    for key, value in results.items():
+        print(f"  {key}: {value:.3g}")
+    return results
+
+
+def _refresh_sees_new_bars(rows: int, new_bars: int = 10) -> bool:
+    """
+    Run refresh_streaming_indicators twice against a temporary store whose 1min history stops
+    short of the latest bar, with the API stubbed to serve new bars only on the second call.
+    True if the second call fetched those bars and returned different values.
+    """
+    from ai_trading_crew.analysts.indicator_stream import refresh_streaming_indicators
+    from ai_trading_crew.utils.twelve_data_manager import intraday_bar_length, twelve_data_manager
+
+    symbol = "BENCH"
+    latest = twelve_data_manager.get_latest_bar_time(intraday_bar_length("1min"))
+    df = make_ohlcv(rows + new_bars)
+    df.index = pd.date_range(end=latest, periods=rows + new_bars, freq="1min", name='datetime')
+
+    def values(frame: pd.DataFrame) -> dict:
+        return {"values": [
+            {"datetime": ts.strftime('%Y-%m-%d %H:%M:%S'), "open": row.Open, "high": row.High,
+             "low": row.Low, "close": row.Close, "volume": row.Volume}
+            for ts, row in frame.iloc[::-1].iterrows()
+        ]}
+
+    # The first refresh only gets the last cached bar back, the second the new bars as well
+    responses = [values(df.iloc[rows - 1:rows]), values(df.iloc[rows - 1:])]
+    requests = []
+
+    def fake_request(url, *args, **kwargs):
+        requests.append(url)
+        return responses[min(len(requests), len(responses)) - 1]
+
+    original_store = twelve_data_manager.store
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            twelve_data_manager.store = CsvStore(Path(tmp))
+            twelve_data_manager.store.save(symbol, "1min", df.iloc[:rows])
+            twelve_data_manager._make_api_request = fake_request
+            first = refresh_streaming_indicators(symbol, "1min", state_dir=Path(tmp) / "state")
+            second = refresh_streaming_indicators(symbol, "1min", state_dir=Path(tmp) / "state")
+        finally:
+            del twelve_data_manager._make_api_request
+            twelve_data_manager.store = original_store
+            twelve_data_manager._cached_data.pop(f"{symbol}_1min_4mo", None)
+            twelve_data_manager._last_fetch_times.pop(f"{symbol}_1min_4mo", None)
+    return len(requests) == 2 and first != second
+
+
+_FILLER_WORDS = (
+    "shares", "market", "investors", "quarter", "revenue", "growth", "analyst", "from", "the", "high", "low",
+    "buy", "hold", "sell", "target", "price", "stock", "earnings", "report", "guidance", "week", "trading",
+    "session", "volume", "sector", "index", "rates", "inflation", "outlook", "company", "product", "launch",
+)
+
+
+def _filler_html(rng: np.random.Generator, blocks: int) -> str:
+    """Navigation, news lists and footers: the bulk of a scraped page that holds none of the fields"""
+    html = []
+    for i in range(blocks):
+        words = rng.choice(_FILLER_WORDS, size=int(rng.integers(8, 30)))
+        html.append(f"<li><a href='/news/{i}'>{' '.join(words).capitalize()}</a> <span>{int(rng.integers(1, 59))} min ago</span></li>")
+    return "<ul>" + "\n".join(html) + "</ul>"
+
+
+def make_fundamentals_fixtures(directory: Path, symbols: int = 5, blocks: int = 2500) -> Dict[str, Dict[str, Path]]:
+    """
+    Write synthetic TipRanks analysis/forecast and ValueInvesting.io pages shaped like the real
+    ones: a few hundred KB of text with the extracted fields in one block near the end.
+    Returns {symbol: {page kind: path}}.
+    """
+    rng = np.random.default_rng(0)
+    bodies = {
+        "tipranks_analysis": (
+            "<h2>Positive Factors</h2><p>Product Innovation</p><p>strong demand for new devices drives revenue growth.</p>"
+            "<h2>Negative Factors</h2><p>Market Competition</p><p>pricing pressure from rivals weighs on margins.</p>"
+            "<h2>Financial Statement Overview</h2><p>Summary</p><p>The company shows solid profitability and cash generation.</p>"
+            "<p>Income Statement</p><p>78 Positive</p><p>Revenue grew while margins stayed high across segments this year.</p>"
+            "<p>Balance Sheet</p><p>65 Positive</p><p>Leverage is moderate with ample liquidity and manageable debt levels.</p>"
+            "<p>Cash Flow</p><p>80 Very Positive</p><p>Free cash flow covers buybacks and dividends comfortably.</p>"
+        ),
+        "tipranks_forecast": (
+            "<p>Strong Buy 32 Ratings</p><p>Based on 32 Wall Street analysts offering 12 month price targets in the past 3 months</p>"
+            "<p>25 Buy 6 Hold 1 Sell</p><p>Average Price Target $245.50 ▲( 12.40% Upside)</p>"
+            "<p>The average price target is $245.50 with a high forecast of $300.00 and a low forecast of $180.00.</p>"
+            "<p>The average price target represents a 12.40% change from the last price of $218.40.</p>"
+        ),
+        "valueinvesting": (
+            "<p>183.20 USD Intrinsic Value</p><p>16.1% overvalued</p><p>218.40 USD Stock Price</p>"
+            "<p>DCF Model</p><p>Peter Lynch</p><table><tr><td>DCF (Growth 5y)</td><td>170.10</td><td>-22.1%</td></tr>"
+            "<tr><td>Fair Value</td><td>190.00</td><td>-13.0%</td></tr><tr><td>P/E</td><td>205.30</td><td>-6.0%</td></tr>"
+            "<tr><td>EV/EBITDA</td><td>199.80</td><td>-8.5%</td></tr></table>"
+            "<p>The stock appears to be overvalued by our estimates.</p><p>Our DCF model suggests a fair price below market.</p>"
+        ),
+    }
+    fixtures = {}
+    for i in range(symbols):
+        symbol = f"SYM{i}"
+        fixtures[symbol] = {}
+        for kind, body in bodies.items():
+            html = f"<html><head><title>{symbol}</title></head><body>{_filler_html(rng, blocks)}{body}{_filler_html(rng, blocks // 4)}</body></html>"
+            path = Path(directory) / f"{symbol}_{kind}.html"
+            path.write_text(html, encoding="utf-8")
+            fixtures[symbol][kind] = path
+    return fixtures
+
+
+def benchmark_fundamentals_extraction(symbols: int = 5, repeats: int = 5) -> Dict[str, float]:
+    """
+    CPU per symbol for extracting the TipRanks forecast and ValueInvesting.io fields from page
+    text: every rule pattern searched over the whole text, as the extractors used to, against
+    the anchored single pass. Pages are parsed to text once, outside the timings.
+    """
+    from ai_trading_crew.analysts import fundamental_analysis as fa
+    from ai_trading_crew.utils import extraction
+    from ai_trading_crew.utils.html_parsing import parse_html
+
+    with tempfile.TemporaryDirectory() as tmp:
+        fixtures = make_fundamentals_fixtures(Path(tmp), symbols)
+        texts = {
+            symbol: {kind: parse_html(path.read_text(encoding="utf-8")).text
+                     for kind, path in pages.items()}
+            for symbol, pages in fixtures.items()
+        }
+
+    def extract_all():
+        outputs = []
+        for symbol, pages in texts.items():
+            outputs.append(fa._extract_financial_info(pages["tipranks_analysis"]))
+            outputs.append(fa._extract_analyst_ratings(pages["tipranks_forecast"], symbol))
+            outputs.append(fa._extract_price_forecast(pages["tipranks_forecast"], symbol))
+            outputs.append(fa._extract_intrinsic_overview(pages["valueinvesting"], symbol))
+            outputs.append(fa._extract_valuation_summary(pages["valueinvesting"]))
+        return outputs
+
+    original_extract = extraction.extract_fields
+    results = {"page_text_kb": sum(len(t) for pages in texts.values() for t in pages.values()) / 1024 / symbols}
+    try:
+        fa.extract_fields = lambda text, rules: original_extract(text, rules, anchored=False)
+        full_scan = extract_all()
+        results["full_scan_ms_per_symbol"] = 1000 * _time_per_call(extract_all, repeats) / symbols
+    finally:
+        fa.extract_fields = original_extract
+    anchored = extract_all()
+    results["anchored_ms_per_symbol"] = 1000 * _time_per_call(extract_all, repeats) / symbols
+    results["identical_output"] = float(full_scan == anchored)
+
+    print(f"Fundamentals extraction benchmark ({symbols} symbols, {repeats} repeats)")
+    for key, value in results.items():
+        print(f"  {key}: {value:.3f}")
+    return results
+
+
+def make_news_fixtures(directory: Path, items: int = 60, blocks: int = 3000) -> Dict[str, Path]:
+    """
+    Write synthetic Finviz quote, TipRanks news and MarketWatch quote pages: a few hundred
+    headlines each, buried in the navigation and link lists that make up most of the real pages.
+    Returns {source: path}.
+    """
+    rng = np.random.default_rng(1)
+
+    def headline(i):
+        return f"{' '.join(rng.choice(_FILLER_WORDS, size=8)).capitalize()} {i}"
+
+    rows = ["<tr><td>Today 09:30AM</td><td><a href='/news/0'>Opening headline for the session</a>"
+            "<span class='news_source'>(Reuters)</span></td></tr>"]
+    for i in range(1, items):
+        day = "" if i % 10 else f"{['Jan', 'Feb', 'Mar'][i % 3]}-{10 + i % 18:02d}-25 "
+        rows.append(f"<tr><td>{day}{1 + i % 12:02d}:{i % 60:02d}{'AM' if i % 2 else 'PM'}</td>"
+                    f"<td><a href='https://example.com/news/{i}'>{headline(i)}</a>"
+                    f"<span class='news_source'>(Source {i % 7})</span></td></tr>")
+    finviz = (f"<html><head><title>AAPL Stock Quote</title></head><body>{_filler_html(rng, blocks)}"
+              f"<table class='snapshot-table2'><tr><td>P/E</td><td>30.1</td></tr></table>"
+              f"<table class='fullview-news-outer'>{''.join(rows)}</table>{_filler_html(rng, blocks // 4)}</body></html>")
+
+    cards = []
+    for i in range(items):
+        if i % 3:
+            cards.append(f"<div class='card'><a href='/news/story-{i}'><h3>Market News{headline(i)}</h3>"
+                         f"<span>{1 + i % 20} hours ago</span></a></div>")
+        else:
+            cards.append(f"<div class='row'><div><a href='/analysis/idea-{i}'><div>{headline(i)}</div></a></div>"
+                         f"<span>{1 + i % 5} days ago</span></div>")
+    tipranks = (f"<html><body><nav><a href='/search'>Search</a><a href='/topic/tech'>Tech</a></nav>"
+                f"{''.join(cards)}{_filler_html(rng, blocks)}</body></html>")
+
+    articles = "".join(
+        f"<div class='element element--article'><h3><a href='/story/item-{i}'>{headline(i)}</a></h3>"
+        f"<time datetime='2025-03-{1 + i % 28:02d}T{i % 24:02d}:15:00-05:00'>Mar. {1 + i % 28}</time></div>"
+        for i in range(items)
+    )
+    marketwatch = (f"<html><body>{_filler_html(rng, blocks)}<div class='region'><h2><span>Other News</span></h2>"
+                   f"<div class='collection__elements'>{articles}</div></div>{_filler_html(rng, blocks // 4)}</body></html>")
+
+    fixtures = {}
+    for source, html in (("finviz", finviz), ("tipranks", tipranks), ("marketwatch", marketwatch)):
+        fixtures[source] = Path(directory) / f"{source}_news.html"
+        fixtures[source].write_text(html, encoding="utf-8")
+    return fixtures
+
+
+class _FixtureClient:
+    """Stands in for the shared HTTP client, answering every GET with the fixture page of its host"""
+
+    timeout = 30
+
+    def __init__(self, pages: Dict[str, str]):
+        self.pages = pages
+
+    def get(self, url, **kwargs):
+        import httpx
+        host = httpx.URL(url).host
+        page = next((html for source, html in self.pages.items() if source in host), None)
+        return httpx.Response(200 if page else 404, text=page or "", request=httpx.Request("GET", url))
+
+
+def _same_news(a: list, b: list) -> bool:
+    """Equal headline lists; times derived from "N hours ago" may differ by the seconds between runs"""
+    return len(a) == len(b) and all(
+        (x.headline, x.url, x.source) == (y.headline, y.url, y.source)
+        and abs(x.published_at - y.published_at).total_seconds() < 60
+        for x, y in zip(a, b)
+    )
+
+
+def benchmark_news_parsing(items: int = 60, blocks: int = 3000, repeats: int = 3) -> Dict[str, float]:
+    """
+    Parse time and full extraction time of the Finviz, TipRanks and MarketWatch headline
+    scrapers on fixture pages, with each HTML parser backend. The extracted NewsItems must
+    be the same under every backend.
+    """
+    from ai_trading_crew.analysts import stock_headlines_fetcher as news
+    from ai_trading_crew.config import settings
+    from ai_trading_crew.utils.html_parsing import HTML_PARSERS, lxml_available, parse_html
+
+    parsers = [p for p in HTML_PARSERS if p != "lxml" or lxml_available()]
+    fetchers = {"finviz": news.fetch_finviz_news, "tipranks": news.fetch_tipranks_news,
+                "marketwatch": news.fetch_marketwatch_news}
+    start_time = pd.Timestamp("2000-01-01", tz="UTC").to_pydatetime()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pages = {source: path.read_text(encoding="utf-8") for source, path in make_news_fixtures(Path(tmp), items, blocks).items()}
+
+    results = {"page_kb": sum(len(html) for html in pages.values()) / 1024 / len(pages)}
+    outputs = {}
+    original_client, original_parser = news.http_client, settings.HTML_PARSER
+    try:
+        news.http_client = _FixtureClient(pages)
+        for parser in parsers:
+            settings.HTML_PARSER = parser
+            for source, fetch in fetchers.items():
+                label = parser.replace(".", "_")
+                results[f"{source}_parse_ms_{label}"] = 1000 * _time_per_call(lambda: parse_html(pages[source], parser), repeats)
+                results[f"{source}_fetch_ms_{label}"] = 1000 * _time_per_call(lambda: fetch("AAPL", start_time), repeats)
+                outputs[(parser, source)] = fetch("AAPL", start_time)
+    finally:
+        news.http_client, settings.HTML_PARSER = original_client, original_parser
+
+    for source in fetchers:
+        results[f"{source}_items"] = len(outputs[(parsers[0], source)])
+    results["identical_output"] = float(all(
+        _same_news(outputs[(parsers[0], source)], outputs[(parser, source)]) for parser in parsers for source in fetchers
+    ))
+
+    print(f"News parsing benchmark ({', '.join(parsers)}; {repeats} repeats)")
+    for key, value in results.items():
+        print(f"  {key}: {value:.3f}")
+    return results
+
+
+def _fill_gaps_row_by_row(data: pd.DataFrame, expected_dates: pd.DatetimeIndex) -> pd.DataFrame:
+    """The old gap filling: scan the expected dates in Python, then insert and re-sort one row per gap"""
+    fetched = pd.to_datetime(data['ds']).dt.date
+    for date in [d for d in expected_dates.date if d not in fetched.values]:
+        date = pd.Timestamp(date)
+        before = data[pd.to_datetime(data['ds']) < date]
+        row = (before.iloc[-1] if not before.empty else data.iloc[0]).copy()
+        row['ds'] = date
+        data = pd.concat([data, pd.DataFrame([row])], ignore_index=True)
+        data = data.sort_values(by='ds').reset_index(drop=True)
+    return data
+
+
+def benchmark_gap_filling(symbols: int = 7, years: int = 5, missing: float = 0.03, repeats: int = 3) -> Dict[str, float]:
+    """
+    Align every symbol's daily history to the expected trading sessions before the TimeGPT call:
+    the row-by-row insertion handle_missing_data used to do against its reindex in one step.
+    """
+    from ai_trading_crew.analysts.timegpt import TwelveDataHandler
+
+    end = pd.Timestamp.today().normalize()
+    start = end - pd.DateOffset(years=years)
+    handler = TwelveDataHandler(["SYM"], start_date=start, end_date=end, max_missing_data=0.05, data_folder=".")
+    expected_dates = pd.DatetimeIndex(handler.market_dates.index)
+
+    rng = np.random.default_rng(0)
+    frames = []
+    for i in range(symbols):
+        df = make_ohlcv(len(expected_dates), seed=i).set_axis(expected_dates.rename('datetime'))
+        df = df.reset_index().rename(columns={'datetime': 'ds'})
+        df.columns = df.columns.str.lower()
+        keep = rng.random(len(df)) >= missing
+        keep[0] = True
+        frames.append(df[keep].reset_index(drop=True))
+
+    for df in frames:
+        if not _fill_gaps_row_by_row(df, expected_dates).equals(handler.handle_missing_data(df, "SYM")[0]):
+            raise AssertionError("Vectorized gap filling differs from the row-by-row result")
+
+    results = {
+        "row_by_row_ms": 1000 * _time_per_call(lambda: [_fill_gaps_row_by_row(df, expected_dates) for df in frames], 1),
+        "vectorized_ms": 1000 * _time_per_call(lambda: [handler.handle_missing_data(df, "SYM") for df in frames], repeats),
+    }
+
+    print(f"Gap filling benchmark ({symbols} symbols x {len(expected_dates)} sessions, "
+          f"{missing:.0%} missing, {repeats} repeats)")
+    for key, value in results.items():
+        print(f"  {key}: {value:.3f}")
+    return results
+
+
+BENCHMARKS: Dict[str, Callable[[], Dict[str, float]]] = {
+    "storage": benchmark_storage,
+    "technical_indicators": benchmark_technical_indicators,
+    "indicator_panel": benchmark_indicator_panel,
+    "streaming_indicators": benchmark_streaming_indicators,
+    "fundamentals_extraction": benchmark_fundamentals_extraction,
+    "news_parsing": benchmark_news_parsing,
+    "gap_filling": benchmark_gap_filling,
+}
+
+
+def run_benchmark(name: str) -> Dict[str, float]:
+    """Run a benchmark by name"""
+    if name not in BENCHMARKS:
+        raise ValueError(f"Unknown benchmark '{name}', expected one of: {', '.join(BENCHMARKS)}")
+    return BENCHMARKS[name]()
@@ -63,14 +63,101 @@ class Settings(BaseSettings):
             "max_missing_data": 0.05,
             "data_folder": 'resources/data',
             "end_date_offset": 0,
+            "prep_workers": 8,
         },
-        description="Default time series parameters for TimeGPT functionality."
+        description="Default time series parameters for TimeGPT functionality (prep_workers: symbols prepared in parallel)."
+    )
+
+    TIMEGPT_DEFAULTS: dict = Field(
+        default={
+            "client": "nixtla",
+            "model": "timegpt-1",
+            "horizon": 1,
+            "chunk_size": 25,
+            "max_concurrency": 4,
+            "cache_dir": 'resources/timegpt_cache',
+        },
+        description="TimeGPT forecast parameters (client: 'nixtla' or the offline 'naive' stand-in; chunk_size: series per forecast call; max_concurrency: calls in flight)."
+    )
+
+    TIME_SERIES_STORE: str = Field(
+        default="parquet",
+        description="Backend for cached Twelve Data time series: 'parquet' (needs pyarrow, falls back to CSV) or 'csv'."
     )
 
     NEWS_FETCH_LIMIT: int = Field(
         default=30,
         description="Maximum number of news articles to fetch per symbol."
     )
+    NEWS_SOURCE_DEADLINE: float = Field(
+        default=45,
+        description="Seconds all headline sources share when fetched concurrently; sources still running are skipped."
+    )
+    FUNDAMENTALS_FETCH_DEFAULTS: dict = Field(
+        default={"section_timeout": 20, "deadline": 40},
+        description="Seconds allowed per fundamentals request and for all four fundamentals sections of a symbol together."
+    )
+    ARTICLE_CRAWL_DEFAULTS: dict = Field(
+        default={
+            "max_concurrency": 6,
+            "default_domain_limit": 2,
+            "domain_limits": {
+                "finance.yahoo.com": 3,
+                "benzinga.com": 2,
+                "finviz.com": 2,
+                "seekingalpha.com": 1,
+            },
+            "url_timeout": 60,
+        },
+        description=(
+            "Article crawls in flight across all symbols, per domain (also applied to subdomains), "
+            "and the seconds one article may take before it is skipped."
+        )
+    )
+    ARTICLE_DOMAIN_POLICY: dict = Field(
+        default={
+            "deny": ["gurufocus.com", "wsj.com", "barrons.com", "ft.com", "bloomberg.com"],
+            "allow": ["finviz.com", "benzinga.com", "finance.yahoo.com", "seekingalpha.com"],
+            "min_attempts": 5,
+            "min_success_rate": 0.2,
+            "demotion_days": 7,
+        },
+        description=(
+            "Article domains never crawled (deny, e.g. hard paywalls) or never demoted (allow). Other domains with at "
+            "least min_attempts crawls and a success rate under min_success_rate are skipped for demotion_days."
+        )
+    )
+    ARTICLE_STORE_DEFAULTS: dict = Field(
+        default={
+            "persist": True,
+            "ttl": 24 * 3600,
+            "tracking_params": [
+                "guccounter", "guce_referrer", "guce_referrer_sig", ".tsrc", "ncid", "soc_src", "soc_trk",
+                "yptr", "cmpid", "fbclid", "gclid", "mc_cid", "mc_eid",
+            ],
+        },
+        description=(
+            "Crawled articles shared by all symbols, keyed by canonical URL (utm_* and the tracking_params are "
+            "dropped) and kept on disk for ttl seconds so each article is crawled once per day."
+        )
+    )
+    BROWSER_POOL_DEFAULTS: dict = Field(
+        default={
+            "size": 3,
+            "max_pages_per_browser": 40,
+            "start_timeout": 30,
+            "headless": True,
+            "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
+        },
+        description=(
+            "Headless browsers kept warm for article crawls across all symbols, pages each serves before "
+            "it is recycled, and the seconds a browser may take to start."
+        )
+    )
+    HTML_PARSER: str = Field(
+        default="lxml",
+        description="BeautifulSoup tree builder for scraped pages: 'lxml' (falls back to 'html.parser' if not installed) or 'html.parser'."
+    )
     SOCIAL_FETCH_LIMIT: int = Field(
         default=500,
         description="Maximum number of social media posts to fetch per symbol."
@@ -103,6 +190,56 @@ class Settings(BaseSettings):
         description="Default technical indicator parameters."
     )
 
+    TWELVE_DATA_CREDITS_PER_MINUTE: int = Field(
+        default=8,
+        description="Twelve Data plan limit in API credits per minute (the free Basic plan allows 8)."
+    )
+
+    HTTP_CLIENT_DEFAULTS: dict = Field(
+        default={
+            "timeout": 30,
+            "http2": True,
+            "max_connections": 100,
+            "max_keepalive_connections": 20,
+            "keepalive_expiry": 60,
+            "default_host_limit": 4,
+            "host_limits": {
+                "api.twelvedata.com": 8,
+                "finviz.com": 4,
+                "tipranks.com": 4,
+                "valueinvesting.io": 4,
+                "seekingalpha.com": 2,
+                "marketwatch.com": 2,
+                "finance.yahoo.com": 4,
+            },
+        },
+        description="Shared HTTP client pooling and per-host concurrency limits (host limits also apply to subdomains)."
+    )
+
+    HTTP_CACHE_DEFAULTS: dict = Field(
+        default={
+            "enabled": True,
+            "offline": False,
+            "max_size_mb": 500,
+            "default_ttl": 0,
+            "ttls": {
+                "finviz.com": 6 * 3600,
+                "tipranks.com": 12 * 3600,
+                "valueinvesting.io": 24 * 3600,
+                "seekingalpha.com": 6 * 3600,
+                "marketwatch.com": 6 * 3600,
+                "finance.yahoo.com": 3600,
+                "api.twelvedata.com": 0,
+            },
+            "vary_headers": ["Accept", "Accept-Language"],
+            "ignored_params": ["apikey"],
+        },
+        description=(
+            "On-disk cache for scraped pages and API responses. TTLs are in seconds per host (also applied to "
+            "subdomains); hosts with a TTL of 0 always hit the network but are recorded for offline replay."
+        )
+    )
+
 
     @property
     def time_series_dates(self):
@@ -8,11 +8,17 @@ import typer
 from typing_extensions import Annotated
 
 from ai_trading_crew.config import settings
-from ai_trading_crew.analysts.market_overview import HistoricalMarketFetcher
+from ai_trading_crew.analysts.market_overview import HistoricalMarketFetcher, GLOBAL_MARKET_TICKERS
 from ai_trading_crew.market_overview_agents import MarketOverviewAnalyst
 from ai_trading_crew.stock_processor import process_stock_symbol
 from ai_trading_crew.crew import StockComponentsSummarizeCrew
+from ai_trading_crew.analysts.technical_indicators import get_ti_contexts
 from ai_trading_crew.analysts.timegpt import get_timegpt_forecast
+from ai_trading_crew.utils.twelve_data_manager import twelve_data_manager
+from ai_trading_crew.utils.article_store import article_store
+from ai_trading_crew.utils.browser_pool import browser_pool
+from ai_trading_crew.utils.forecast_store import forecast_store
+from ai_trading_crew.utils.http_client import http_client
 
 # Load environment variables
 load_dotenv()
@@ -31,34 +37,61 @@ async def run_crew_async():
     print(f"Kicking off AI Trading Crew for symbols: {settings.SYMBOLS}")
     start_time = datetime.datetime.now()
 
-    vix_data = HistoricalMarketFetcher().get_vix(days=30)
-    global_market_data = HistoricalMarketFetcher().get_global_market(days=30)
-    get_timegpt_forecast()
-
-    market_analyst = MarketOverviewAnalyst()
-    market_agent, market_task = market_analyst.get_agent_and_task()
+    # Warm the Twelve Data caches for the whole universe with a few batched requests
+    stock_symbols = [settings.STOCK_MARKET_OVERVIEW_SYMBOL, *settings.SYMBOLS]
+    await asyncio.to_thread(
+        twelve_data_manager.prefetch,
+        [*stock_symbols, *GLOBAL_MARKET_TICKERS.values()],
+        quote_symbols=stock_symbols,
+    )
 
-    print(f"Processing market overview symbol: {settings.STOCK_MARKET_OVERVIEW_SYMBOL}")
-    await process_stock_symbol(
-        settings.STOCK_MARKET_OVERVIEW_SYMBOL,
-        vix_data=vix_data,
-        global_market_data=global_market_data,
-        additional_agents=[market_agent],
-        additional_tasks=[market_task]
+    # Run the blocking market-wide fetchers off the event loop so rate-limited requests just queue
+    # Technical indicators are computed for the whole universe at once over a price panel
+    vix_data, global_market_data, _, ti_contexts = await asyncio.gather(
+        asyncio.to_thread(HistoricalMarketFetcher().get_vix, days=30),
+        asyncio.to_thread(HistoricalMarketFetcher().get_global_market, days=30),
+        asyncio.to_thread(get_timegpt_forecast),
+        asyncio.to_thread(get_ti_contexts, stock_symbols),
     )
-    print("Market overview processing complete.")
 
-    print(f"Starting concurrent processing for {len(settings.SYMBOLS)} symbols...")
-    tasks = [process_stock_symbol(symbol) for symbol in settings.SYMBOLS]
-    await asyncio.gather(*tasks)
+    # The warm crawl4ai browsers and the async HTTP pool are shared by all symbols; close them however the run ends
+    try:
+        market_analyst = MarketOverviewAnalyst()
+        market_agent, market_task = market_analyst.get_agent_and_task()
+
+        print(f"Processing market overview symbol: {settings.STOCK_MARKET_OVERVIEW_SYMBOL}")
+        await process_stock_symbol(
+            settings.STOCK_MARKET_OVERVIEW_SYMBOL,
+            vix_data=vix_data,
+            global_market_data=global_market_data,
+            additional_agents=[market_agent],
+            additional_tasks=[market_task],
+            ti_context=ti_contexts.get(settings.STOCK_MARKET_OVERVIEW_SYMBOL)
+        )
+        print("Market overview processing complete.")
+
+        print(f"Starting concurrent processing for {len(settings.SYMBOLS)} symbols...")
+        tasks = [process_stock_symbol(symbol, ti_context=ti_contexts.get(symbol)) for symbol in settings.SYMBOLS]
+        await asyncio.gather(*tasks)
+
+        print(f"Twelve Data rate limiter: {twelve_data_manager.get_rate_limit_metrics()}")
+        print(f"HTTP cache: {http_client.cache_metrics()}")
+        print(f"Article store: {article_store.metrics()}")
+        print(f"Browser pool: {browser_pool.metrics()}")
+        print(f"Forecast store: {forecast_store.metrics()}")
+    finally:
+        await browser_pool.close()
+        await http_client.aclose()
 
     end_time = datetime.datetime.now()
     print(f"\n🎉 Crew run complete. Total execution time: {end_time - start_time}")
 
 
 @app.command()
-def run():
+def run(offline: Annotated[bool, typer.Option("--offline", help="Replay HTTP responses from the on-disk cache without touching the network")] = False):
     """Main entry point to run the full trading crew analysis."""
+    if offline:
+        http_client.set_offline()
     asyncio.run(run_crew_async())
 
 
@@ -104,5 +137,12 @@ def test(n_iterations: Annotated[int, typer.Option(help="Number of test iteratio
     print("Test complete.")
 
 
+@app.command()
+def benchmark(name: Annotated[str, typer.Argument(help="Benchmark to run")] = "storage"):
+    """Run one of the offline data-path benchmarks."""
+    from ai_trading_crew.benchmarks import run_benchmark
+    run_benchmark(name)
+
+
 if __name__ == "__main__":
     app()
@@ -2,8 +2,10 @@
 import asyncio
 import datetime
 import os
+import time
 import json
 import dataclasses
+from typing import Optional
 
 from ai_trading_crew.crew import StockComponentsSummarizeCrew, AiArticlesPickerCrew, DayTraderAdvisorCrew
 from ai_trading_crew.analysts.social import get_stocktwits_context
@@ -33,35 +35,79 @@ def _write_to_file(filepath: str, content: str):
         f.write(content)
 
 
-async def _gather_input_data(symbol: str, company_name: str, input_dir: str):
-    """Gathers all necessary data for a stock symbol and saves it to files."""
-    today_str = get_today_str()
-    yesterday_str = get_yesterday_str()
-    
+async def _timed(name: str, timings: dict, awaitable):
+    """Awaits a collector and records its wall time (in seconds) under the given name."""
+    start = time.perf_counter()
+    try:
+        return await awaitable
+    finally:
+        timings[name] = time.perf_counter() - start
+
+
+async def _collect(name: str, timings: dict, func, *args, **kwargs):
+    """Runs a blocking collector in the default executor so it overlaps with the others."""
+    return await _timed(name, timings, asyncio.to_thread(func, *args, **kwargs))
+
+
+def _report_timings(symbol: str, timings: dict, wall_time: float):
+    """Prints per-collector wall times next to the symbol's overall gathering wall time."""
+    for name, elapsed in sorted(timings.items(), key=lambda item: item[1], reverse=True):
+        print(f"[{symbol}] {name}: {elapsed:.2f}s")
+    print(f"[{symbol}] Data gathering took {wall_time:.2f}s (sum of collectors: {sum(timings.values()):.2f}s)")
+
+
+async def _gather_news_chain(symbol: str, company_name: str, input_dir: str, today_str: str, yesterday_str: str, timings: dict):
+    """Runs the dependent headlines -> article picker -> article fetch chain in order."""
     # Get and save stock headlines
-    stock_headlines = get_news_context(symbol=symbol, start_time=f"{yesterday_str} 18:00")
+    stock_headlines = await _collect("headlines", timings, get_news_context, symbol=symbol, start_time=f"{yesterday_str} 18:00")
     _write_to_file(os.path.join(input_dir, f"{symbol}_market_headlines.txt"), stock_headlines)
 
     # Run AiArticlesPickerCrew to select relevant articles
     picker_inputs = {'company_name': company_name, 'stock_headlines': stock_headlines, 'today_str': today_str}
-    await AiArticlesPickerCrew(symbol).crew().kickoff_async(inputs=picker_inputs)
+    await _timed("article_picker", timings, AiArticlesPickerCrew(symbol).crew().kickoff_async(inputs=picker_inputs))
 
     # Get and save stock news from selected articles
     relevant_articles_file = os.path.join(input_dir, f"{symbol}_{RELEVANT_ARTICLES_FILE}")
-    stock_news = await get_stock_news(symbol, relevant_articles_file)
+    stock_news = await _timed("stock_news", timings, get_stock_news(symbol, relevant_articles_file))
     _write_to_file(os.path.join(input_dir, f"{symbol}_stock_news.txt"), stock_news)
 
-    # Get and save other context data
-    ti_data = get_ti_context(symbol=symbol)
-    _write_to_file(os.path.join(input_dir, f"{symbol}_technical_indicators.txt"), ti_data)
+    return stock_headlines, stock_news
 
-    fundamental_data = get_fundamental_context(symbol=symbol)
-    _write_to_file(os.path.join(input_dir, f"{symbol}_fundamental_analysis.txt"), fundamental_data)
 
-    stocktwits_data = get_stocktwits_context(symbol, settings.SOCIAL_FETCH_LIMIT, get_yesterday_18_est())
+async def _precomputed(value):
+    """Stands in for a collector whose result was computed for the whole universe up front."""
+    return value
+
+
+async def _gather_input_data(symbol: str, company_name: str, input_dir: str, ti_context: Optional[str] = None):
+    """Gathers all necessary data for a stock symbol and saves it to files.
+
+    The headline/picker/article chain runs in order, while the independent collectors
+    (technical indicators, fundamentals, StockTwits and TimeGPT) run side by side with it.
+    A ti_context computed up front (see get_ti_contexts) is used instead of computing it here.
+    """
+    today_str = get_today_str()
+    yesterday_str = get_yesterday_str()
+    timings = {}
+    start = time.perf_counter()
+
+    ti_collector = (_collect("technical_indicators", timings, get_ti_context, symbol=symbol)
+                    if ti_context is None else _precomputed(ti_context))
+    (stock_headlines, stock_news), ti_data, fundamental_data, stocktwits_data, timegpt_forecasts = await asyncio.gather(
+        _gather_news_chain(symbol, company_name, input_dir, today_str, yesterday_str, timings),
+        ti_collector,
+        _collect("fundamental_analysis", timings, get_fundamental_context, symbol=symbol),
+        _collect("stocktwits", timings, get_stocktwits_context, symbol, settings.SOCIAL_FETCH_LIMIT, get_yesterday_18_est()),
+        _collect("timegpt", timings, get_timegpt_forecast),
+    )
+
+    _report_timings(symbol, timings, time.perf_counter() - start)
+
+    # Save the other context data
+    _write_to_file(os.path.join(input_dir, f"{symbol}_technical_indicators.txt"), ti_data)
+    _write_to_file(os.path.join(input_dir, f"{symbol}_fundamental_analysis.txt"), fundamental_data)
     _write_to_file(os.path.join(input_dir, f"{symbol}_stocktwits.txt"), stocktwits_data)
 
-    timegpt_forecasts = get_timegpt_forecast()
     timegpt_forecast = format_timegpt_forecast(timegpt_forecasts, symbol, company_name)
     _write_to_file(os.path.join(input_dir, f"{symbol}_timegpt_forecast.txt"), timegpt_forecast)
 
@@ -155,7 +201,8 @@ def _save_final_result(symbol: str, result):
         json.dump(result_data, f, indent=2)
 
 
-async def process_stock_symbol(symbol: str, vix_data=None, global_market_data=None, additional_agents=None, additional_tasks=None):
+async def process_stock_symbol(symbol: str, vix_data=None, global_market_data=None, additional_agents=None, additional_tasks=None,
+                               ti_context: Optional[str] = None):
     """
     Process a stock symbol by gathering all necessary data and running the analysis crews.
     
@@ -165,14 +212,15 @@ async def process_stock_symbol(symbol: str, vix_data=None, global_market_data=No
         global_market_data: Global market data (optional, for market overview)
         additional_agents: Additional agents for the crew (optional, for market overview)
         additional_tasks: Additional tasks for the crew (optional, for market overview)
+        ti_context: Technical indicator context computed for the whole universe (optional)
     """
     print(f"[{datetime.datetime.now()}] Starting processing for symbol: {symbol}")
     
-    company_name = get_company_name(symbol)
+    company_name = await asyncio.to_thread(get_company_name, symbol)
     input_dir, _ = _get_paths(symbol)
 
     # Step 1: Gather all input data
-    final_inputs = await _gather_input_data(symbol, company_name, input_dir)
+    final_inputs = await _gather_input_data(symbol, company_name, input_dir, ti_context)
     final_inputs['vix_data'] = vix_data
     final_inputs['global_market_data'] = global_market_data
 
@@ -189,8 +237,9 @@ async def process_stock_symbol(symbol: str, vix_data=None, global_market_data=No
     return day_trader_result
 
 
-def process_stock_symbol_sync(symbol: str, vix_data=None, global_market_data=None, additional_agents=None, additional_tasks=None):
+def process_stock_symbol_sync(symbol: str, vix_data=None, global_market_data=None, additional_agents=None, additional_tasks=None,
+                              ti_context: Optional[str] = None):
     """
     Synchronous wrapper for process_stock_symbol that maintains backward compatibility.
     """
-    return asyncio.run(process_stock_symbol(symbol, vix_data, global_market_data, additional_agents, additional_tasks))
\ No newline at end of file
+    return asyncio.run(process_stock_symbol(symbol, vix_data, global_market_data, additional_agents, additional_tasks, ti_context))
\ No newline at end of file
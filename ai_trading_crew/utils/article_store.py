@@ -0,0 +1,174 @@
+"""
+Shared store of crawled and cleaned news articles.
+
+The same article is often picked for several symbols (a piece covering AAPL and MSFT, or
+one also relevant to SPY). Articles are keyed by their canonical URL: lower-cased host
+without "www.", no fragment or trailing slash, tracking parameters dropped and the rest
+of the query sorted. A symbol asking for an article another symbol is already crawling
+waits on that crawl instead of starting its own, and every successfully crawled article
+is kept on disk for a TTL (a day by default), so each unique article is crawled and
+cleaned once per day however many symbols and runs ask for it. Crawls that yielded no
+article body (crawler errors, or extractors answering "Error fetching content: 403") are
+not kept, so the next request retries them.
+"""
+
+import asyncio
+import dataclasses
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from ai_trading_crew.config import settings
+from ai_trading_crew.utils.storage import atomic_write
+
+ARTICLE_STORE_DIR = Path(__file__).parent.parent.parent / "resources" / "article_store"
+
+
+class ArticleStore:
+    """Crawls each canonical article URL at most once per TTL, shared by all symbols"""
+
+    def __init__(self, root: Path = ARTICLE_STORE_DIR, config: Optional[dict] = None):
+        config = config or settings.ARTICLE_STORE_DEFAULTS
+        self.root = Path(root)
+        self.persist = config["persist"]
+        self.ttl = config["ttl"]
+        self.tracking_params = set(config["tracking_params"])
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "coalesced": 0, "crawled": 0}
+        self._records: Dict[str, Tuple[float, object]] = {}  # canonical URL -> (stored at, record)
+        self._crawls = set()
+        self._pruned = False
+
+        # Futures of in-flight crawls are bound to the loop that created them
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+    def metrics(self) -> Dict[str, int]:
+        """Articles served from memory or disk, joined to another symbol's crawl, or crawled"""
+        return dict(self.stats)
+
+    def canonical_url(self, url: str) -> str:
+        parts = urlsplit(url.strip())
+        host = (parts.hostname or "").lower()
+        if host.startswith("www."):
+            host = host[4:]
+        query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                       if k not in self.tracking_params and not k.startswith("utm_"))
+        return urlunsplit((parts.scheme.lower(), host, parts.path.rstrip("/") or "/", urlencode(query), ""))
+
+    def _path(self, canonical: str) -> Path:
+        key = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+        return self.root / key[:2] / f"{key}.json"
+
+    def _load(self, canonical: str, record_type):
+        try:
+            with open(self._path(canonical), encoding="utf-8") as f:
+                stored = json.load(f)
+            if time.time() - stored["stored_at"] >= self.ttl:
+                return None
+            record = record_type(**stored["record"])
+            if record.body is None:
+                return None
+            return stored["stored_at"], record
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _save(self, canonical: str, record):
+        data = json.dumps({"url": canonical, "stored_at": time.time(), "record": dataclasses.asdict(record)})
+        atomic_write(self._path(canonical), lambda tmp_path: tmp_path.write_text(data, encoding="utf-8"))
+
+    def prune(self):
+        """Delete stored articles older than the TTL"""
+        now = time.time()
+        removed = 0
+        for path in self.root.rglob("*.json"):
+            try:
+                if now - path.stat().st_mtime >= self.ttl:
+                    path.unlink()
+                    removed += 1
+            except OSError:
+                continue
+        if removed:
+            print(f"Article store pruned {removed} expired articles")
+
+    def _in_flight_crawls(self) -> Dict[str, asyncio.Future]:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._in_flight = {}
+        return self._in_flight
+
+    async def _crawl(self, pending: Dict[str, str], crawl: Callable[[List[str]], Awaitable[list]],
+                     futures: Dict[str, asyncio.Future], in_flight: Dict[str, asyncio.Future]):
+        try:
+            records = await crawl(list(pending.values()))
+            for canonical, record in zip(pending, records):
+                self.stats["crawled"] += 1
+                if record.body is not None:
+                    self._records[canonical] = (time.time(), record)
+                    if self.persist:
+                        try:
+                            self._save(canonical, record)
+                        except OSError as e:
+                            print(f"Error saving article {canonical}: {str(e)}")
+                futures[canonical].set_result(record)
+        except BaseException as e:
+            for canonical in pending:
+                if not futures[canonical].done():
+                    futures[canonical].set_exception(e)
+            if not isinstance(e, Exception):
+                raise
+        finally:
+            for canonical in pending:
+                in_flight.pop(canonical, None)
+
+    async def get_many(self, urls: List[str], crawl: Callable[[List[str]], Awaitable[list]],
+                       record_type) -> list:
+        """
+        The records for the distinct articles among urls, in order. Articles neither stored
+        nor being crawled are crawled together with crawl(urls), which returns one
+        record_type dataclass per URL; records without a body are not stored.
+        """
+        if self.persist and not self._pruned:
+            self._pruned = True
+            self.prune()
+
+        in_flight = self._in_flight_crawls()
+        loop = asyncio.get_running_loop()
+        futures: Dict[str, asyncio.Future] = {}
+        pending: Dict[str, str] = {}
+        for url in urls:
+            canonical = self.canonical_url(url)
+            if canonical in futures:
+                continue
+            future = loop.create_future()
+            stored = self._records.get(canonical)
+            if stored is not None and time.time() - stored[0] < self.ttl:
+                self.stats["memory_hits"] += 1
+            elif self.persist and (stored := self._load(canonical, record_type)) is not None:
+                self.stats["disk_hits"] += 1
+                self._records[canonical] = stored
+            else:
+                stored = None
+            if stored is not None:
+                future.set_result(stored[1])
+            elif canonical in in_flight:
+                self.stats["coalesced"] += 1
+                future = in_flight[canonical]
+            else:
+                in_flight[canonical] = future
+                pending[canonical] = url
+            futures[canonical] = future
+
+        if pending:
+            # A separate task, so one symbol being cancelled does not cancel a crawl others wait on
+            task = asyncio.ensure_future(self._crawl(pending, crawl, futures, in_flight))
+            self._crawls.add(task)
+            task.add_done_callback(self._crawls.discard)
+        return [await asyncio.shield(future) for future in futures.values()]
+
+
+# Create a singleton instance
+article_store = ArticleStore()
@@ -0,0 +1,154 @@
+"""
+Process-wide pool of warm crawl4ai browsers.
+
+Starting headless Chromium takes seconds, so article crawls lease an already started
+AsyncWebCrawler from this pool instead of launching one per symbol or per article.
+Browsers are started lazily, on the first lease that finds none idle, up to the
+configured size, and stay warm for every later symbol. A browser is recycled after
+serving max_pages_per_browser pages to keep its memory in check, and one found
+disconnected (crashed) when leased or returned is discarded and replaced by a fresh one.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional
+
+from crawl4ai import AsyncWebCrawler, BrowserConfig
+
+from ai_trading_crew.config import settings
+
+
+class _PooledBrowser:
+    __slots__ = ("crawler", "pages")
+
+    def __init__(self, crawler: AsyncWebCrawler):
+        self.crawler = crawler
+        self.pages = 0
+
+
+class BrowserPool:
+    """Leases started AsyncWebCrawler instances, shared by every symbol and extractor"""
+
+    def __init__(self, config: Optional[dict] = None):
+        config = config or settings.BROWSER_POOL_DEFAULTS
+        self.size = config["size"]
+        self.max_pages_per_browser = config["max_pages_per_browser"]
+        self.start_timeout = config["start_timeout"]
+        self.browser_config = BrowserConfig(headless=config["headless"], user_agent=config["user_agent"])
+        self._metrics = {"started": 0, "recycled": 0, "restarted": 0, "leases": 0}
+
+        # Playwright browsers and asyncio.Condition are bound to the loop that created them
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._available: Optional[asyncio.Condition] = None
+        self._idle: List[_PooledBrowser] = []
+        self._open = 0
+
+    def metrics(self) -> Dict[str, int]:
+        """Browsers started, recycled after max_pages_per_browser, restarted after a crash, and leases served"""
+        return dict(self._metrics)
+
+    def _bind(self) -> asyncio.Condition:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Browsers of a previous (finished) loop cannot be driven from this one
+            self._loop = loop
+            self._available = asyncio.Condition()
+            self._idle = []
+            self._open = 0
+        return self._available
+
+    @staticmethod
+    def is_healthy(crawler: AsyncWebCrawler) -> bool:
+        """Whether the crawler is started and its browser still connected"""
+        if not getattr(crawler, "ready", True):
+            return False
+        manager = getattr(getattr(crawler, "crawler_strategy", None), "browser_manager", None)
+        browser = getattr(manager, "browser", None)
+        return browser is None or browser.is_connected()
+
+    async def _start(self) -> _PooledBrowser:
+        crawler = AsyncWebCrawler(config=self.browser_config)
+        await asyncio.wait_for(crawler.start(), self.start_timeout)
+        self._metrics["started"] += 1
+        return _PooledBrowser(crawler)
+
+    @staticmethod
+    async def _stop(browser: _PooledBrowser):
+        try:
+            await browser.crawler.close()
+        except Exception as e:
+            print(f"Error closing browser: {str(e)}")
+
+    async def _acquire(self, available: asyncio.Condition) -> _PooledBrowser:
+        async with available:
+            while True:
+                while self._idle:
+                    browser = self._idle.pop()
+                    if self.is_healthy(browser.crawler):
+                        return browser
+                    print("Pooled browser is no longer connected, restarting it")
+                    self._metrics["restarted"] += 1
+                    self._open -= 1
+                    asyncio.create_task(self._stop(browser))
+                if self._open < self.size:
+                    self._open += 1
+                    break
+                await available.wait()
+        try:
+            return await self._start()
+        except BaseException:
+            async with available:
+                self._open -= 1
+                available.notify()
+            raise
+
+    async def _release(self, available: asyncio.Condition, browser: _PooledBrowser):
+        browser.pages += 1
+        retire = None
+        if not self.is_healthy(browser.crawler):
+            print("Browser crashed during a crawl, it will be restarted on the next lease")
+            self._metrics["restarted"] += 1
+            retire = browser
+        elif browser.pages >= self.max_pages_per_browser:
+            self._metrics["recycled"] += 1
+            retire = browser
+        async with available:
+            if retire is None and self._available is available:
+                self._idle.append(browser)
+            elif self._available is available:
+                self._open -= 1
+            available.notify()
+        if retire is not None or self._available is not available:
+            await self._stop(browser)
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[AsyncWebCrawler]:
+        """
+        Borrow a started crawler for one page, waiting while all pooled browsers are busy:
+
+            async with browser_pool.lease() as crawler:
+                result = await crawler.arun(url=url, config=run_config)
+        """
+        available = self._bind()
+        browser = await self._acquire(available)
+        self._metrics["leases"] += 1
+        try:
+            yield browser.crawler
+        finally:
+            await asyncio.shield(self._release(available, browser))
+
+    async def close(self):
+        """Close the idle browsers; leased ones are closed when they are returned"""
+        if self._available is None:
+            return
+        available = self._available
+        async with available:
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+            self._available = None
+            self._loop = None
+        await asyncio.gather(*(self._stop(browser) for browser in idle))
+
+
+# Create a singleton instance
+browser_pool = BrowserPool()
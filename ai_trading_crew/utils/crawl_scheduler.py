@@ -0,0 +1,84 @@
+"""
+Bounded-concurrency scheduler for article crawls.
+
+Articles are fetched concurrently under three bounds: a global limit on crawls in flight
+(each may hold a browser page), a per-domain limit so no single site is hammered, and a
+per-URL timeout so one slow page cannot hold up a symbol's news. A crawl waits for its
+domain slot before taking a global slot, so URLs queued behind a busy domain never
+block other domains. The limits are process-wide and shared by every symbol.
+"""
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar, Union
+from urllib.parse import urlsplit
+
+from ai_trading_crew.config import settings
+
+T = TypeVar("T")
+
+
+class CrawlScheduler:
+    """Runs async article fetches under global and per-domain concurrency limits with a per-URL timeout"""
+
+    def __init__(self, config: Optional[dict] = None):
+        config = config or settings.ARTICLE_CRAWL_DEFAULTS
+        self.max_concurrency = config["max_concurrency"]
+        self.default_domain_limit = config["default_domain_limit"]
+        self.domain_limits = config["domain_limits"]
+        self.url_timeout = config["url_timeout"]
+
+        # asyncio.Semaphore is bound to the loop that created it
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._global: Optional[asyncio.Semaphore] = None
+        self._domains: Dict[str, asyncio.Semaphore] = {}
+
+    def domain_limit(self, host: str) -> int:
+        """Get the concurrency limit for a domain, matching configured domains and their subdomains"""
+        for domain, limit in self.domain_limits.items():
+            if host == domain or host.endswith(f".{domain}"):
+                return limit
+        return self.default_domain_limit
+
+    def _semaphores(self, host: str) -> Tuple[asyncio.Semaphore, asyncio.Semaphore]:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._global = asyncio.Semaphore(self.max_concurrency)
+            self._domains = {}
+        if host not in self._domains:
+            self._domains[host] = asyncio.Semaphore(self.domain_limit(host))
+        return self._global, self._domains[host]
+
+    async def run(self, url: str, fetch: Callable[[str], Awaitable[T]], timeout: Optional[float] = None) -> T:
+        """Fetch one URL once its domain and a global slot are free; raises asyncio.TimeoutError past the timeout"""
+        global_slot, domain_slot = self._semaphores(urlsplit(url).hostname or "")
+        async with domain_slot:
+            async with global_slot:
+                return await asyncio.wait_for(fetch(url), timeout or self.url_timeout)
+
+    async def map(self, urls: List[str], fetch: Callable[[str], Awaitable[T]],
+                  timeout: Optional[float] = None) -> List[Tuple[Union[T, BaseException], float]]:
+        """
+        Fetch every URL concurrently. Returns (result or exception, seconds) per URL in input
+        order; the seconds cover the fetch itself, not the time spent waiting for a slot.
+        """
+        async def timed(url):
+            started = None
+
+            async def fetch_timed(u):
+                nonlocal started
+                started = time.perf_counter()
+                return await fetch(u)
+
+            try:
+                result = await self.run(url, fetch_timed, timeout)
+            except Exception as e:
+                result = e
+            return result, time.perf_counter() - started if started is not None else 0.0
+
+        return await asyncio.gather(*(timed(url) for url in urls))
+
+
+# Create a singleton instance
+crawl_scheduler = CrawlScheduler()
@@ -0,0 +1,116 @@
+"""
+Domain policy for the article URLs picked for crawling.
+
+Before any crawl, each URL's domain is checked against a policy table:
+
+- deny: never crawled (paywalled sites, or sites whose pages are not usable)
+- allow: always crawled, whatever their track record
+- anything else is crawled unless it is currently demoted
+
+Every crawl outcome (whether the article yielded content) is counted per domain and kept
+on disk across runs. A domain that keeps failing, with at least min_attempts crawls and
+a success rate under min_success_rate, is demoted: its URLs are skipped for
+demotion_days, after which its counts start over and it gets a fresh trial.
+"""
+
+import json
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from ai_trading_crew.config import settings
+from ai_trading_crew.utils.storage import atomic_write
+
+DOMAIN_STATS_FILE = Path(__file__).parent.parent.parent / "resources" / "article_domain_stats.json"
+
+
+def _matches(host: str, domains) -> Optional[str]:
+    """The configured domain the host is or is a subdomain of"""
+    for domain in domains:
+        if host == domain or host.endswith(f".{domain}"):
+            return domain
+    return None
+
+
+class DomainPolicy:
+    """Allow/deny rules plus per-domain crawl success tracking with automatic demotion"""
+
+    def __init__(self, path: Path = DOMAIN_STATS_FILE, config: Optional[dict] = None):
+        config = config or settings.ARTICLE_DOMAIN_POLICY
+        self.path = Path(path)
+        self.allow = config["allow"]
+        self.deny = config["deny"]
+        self.min_attempts = config["min_attempts"]
+        self.min_success_rate = config["min_success_rate"]
+        self.demotion_seconds = config["demotion_days"] * 24 * 3600
+        self._stats: Optional[Dict[str, dict]] = None
+
+    @staticmethod
+    def domain(url: str) -> str:
+        host = (urlsplit(url).hostname or "").lower()
+        return host[4:] if host.startswith("www.") else host
+
+    def _load(self) -> Dict[str, dict]:
+        if self._stats is None:
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    self._stats = json.load(f)
+            except (OSError, ValueError):
+                self._stats = {}
+        return self._stats
+
+    def _save(self):
+        data = json.dumps(self._stats, indent=2, sort_keys=True)
+        atomic_write(self.path, lambda tmp_path: tmp_path.write_text(data, encoding="utf-8"))
+
+    def rejection(self, url: str) -> Optional[str]:
+        """Why the URL should not be crawled, or None if it should"""
+        domain = self.domain(url)
+        denied = _matches(domain, self.deny)
+        if denied:
+            return f"{denied} is denied"
+        if _matches(domain, self.allow):
+            return None
+        stats = self._load().get(domain)
+        if stats and stats.get("demoted_until", 0) > time.time():
+            return f"{domain} is demoted after {stats['demoted_successes']}/{stats['demoted_attempts']} successful crawls"
+        return None
+
+    def filter(self, urls: List[str]) -> Tuple[List[str], List[Tuple[str, str]]]:
+        """Split URLs into those to crawl and (url, reason) pairs for those skipped"""
+        kept, skipped = [], []
+        for url in urls:
+            reason = self.rejection(url)
+            if reason:
+                skipped.append((url, reason))
+            else:
+                kept.append(url)
+        return kept, skipped
+
+    def record(self, outcomes: List[Tuple[str, bool]]):
+        """Count crawl outcomes (url, yielded content) and demote domains that keep failing"""
+        stats = self._load()
+        now = time.time()
+        for url, success in outcomes:
+            domain = self.domain(url)
+            entry = stats.setdefault(domain, {"attempts": 0, "successes": 0})
+            if entry.get("demoted_until", 0) and entry["demoted_until"] <= now:
+                # The demotion ran out: start a fresh trial
+                entry.update(attempts=0, successes=0, demoted_until=0)
+            entry["attempts"] += 1
+            entry["successes"] += int(success)
+            entry["last_attempt"] = now
+            if (not _matches(domain, self.allow) and entry["attempts"] >= self.min_attempts
+                    and entry["successes"] / entry["attempts"] < self.min_success_rate):
+                print(f"Demoting {domain} for article crawls: {entry['successes']}/{entry['attempts']} crawls yielded content")
+                entry.update(demoted_until=now + self.demotion_seconds, demoted_attempts=entry["attempts"],
+                             demoted_successes=entry["successes"], attempts=0, successes=0)
+        try:
+            self._save()
+        except OSError as e:
+            print(f"Error saving article domain stats: {str(e)}")
+
+
+# Create a singleton instance
+domain_policy = DomainPolicy()
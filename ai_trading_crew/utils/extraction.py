@@ -0,0 +1,173 @@
+"""
+Declarative regex extraction over scraped page text.
+
+A page's fields are described by a table of Rules, compiled once at import. Each rule
+holds regex alternatives, and most alternatives name an anchor: a literal their matches
+begin with (starts_with) or contain (contains). extract_fields lower-cases the page once
+and locates every anchor in that one copy, then only tries each regex where a match can
+actually be:
+
+- starts_with: at the anchor's occurrences, instead of at every position of the page
+- contains with `before`: just before the anchor's occurrences, where `before` is a
+  character class covering everything a match can hold ahead of its anchor
+- contains without `before`: the whole page, and only if the anchor occurs at all
+- anywhere: the whole page
+
+The results are exactly those of re.search / re.findall over the whole text, tried
+alternative by alternative.
+"""
+
+import re
+from bisect import bisect_left
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+# Characters that match an ASCII letter case-insensitively without lower-casing to it
+# (long s, Kelvin sign, dotted/dotless I); pages containing them are searched in full
+_CASE_FOLD_TRAPS = ("ſ", "K", "İ", "ı")
+
+
+class Alternative(NamedTuple):
+    regex: re.Pattern
+    anchors: Tuple[str, ...]  # lower-case literals; empty for anywhere()
+    leading: bool  # every match starts with one of the anchors
+    before: Optional[re.Pattern]  # class of the characters a match can have ahead of its anchor
+
+
+def starts_with(anchors: Union[str, Tuple[str, ...]], pattern: str, flags: int = re.IGNORECASE) -> Alternative:
+    """An alternative whose matches all begin with the literal anchor (or one of several), case-insensitively"""
+    anchors = (anchors,) if isinstance(anchors, str) else anchors
+    return Alternative(re.compile(pattern, flags), tuple(a.lower() for a in anchors), True, None)
+
+
+def contains(anchor: str, pattern: str, before: Optional[str] = None, flags: int = re.IGNORECASE) -> Alternative:
+    """
+    An alternative whose matches all contain the literal anchor, case-insensitively.
+    before: a character class (e.g. r'[\\d\\s]') every character of a match ahead of the anchor belongs to
+    """
+    return Alternative(re.compile(pattern, flags), (anchor.lower(),), False,
+                       re.compile(before, flags) if before else None)
+
+
+def anywhere(pattern: str, flags: int = re.IGNORECASE) -> Alternative:
+    """An alternative without an anchor, always searched over the whole text"""
+    return Alternative(re.compile(pattern, flags), (), False, None)
+
+
+class Rule:
+    """
+    One extracted field.
+    mode "first": the first alternative (in order) that matches anywhere wins -> Match or None
+    mode "each": every alternative is searched -> list of Match or None
+    mode "findall": every alternative's findall -> list of lists
+    """
+
+    def __init__(self, name: str, alternatives: Iterable[Union[Alternative, str]], mode: str = "first"):
+        if mode not in ("first", "each", "findall"):
+            raise ValueError(f"Unknown extraction mode '{mode}'")
+        self.name = name
+        self.mode = mode
+        self.alternatives = [anywhere(a) if isinstance(a, str) else a for a in alternatives]
+
+
+def _findall_item(match: re.Match):
+    """One element of re.findall's result for a match"""
+    if match.re.groups == 0:
+        return match.group(0)
+    if match.re.groups == 1:
+        return match.group(1) or ""
+    return match.groups("")
+
+
+class _Page:
+    """Page text with the occurrences of each anchor located at most once"""
+
+    def __init__(self, text: str, anchored: bool):
+        self.text = text
+        self.lowered = None
+        if anchored and not any(trap in text for trap in _CASE_FOLD_TRAPS):
+            lowered = text.lower()
+            # Some characters lower-case to more than one, which would shift positions
+            if len(lowered) == len(text):
+                self.lowered = lowered
+        self._occurrences: Dict[str, List[int]] = {}
+
+    def occurrences(self, anchors: Tuple[str, ...]) -> List[int]:
+        positions = []
+        for anchor in anchors:
+            if anchor not in self._occurrences:
+                found = []
+                position = self.lowered.find(anchor)
+                while position != -1:
+                    found.append(position)
+                    position = self.lowered.find(anchor, position + 1)
+                self._occurrences[anchor] = found
+            positions.extend(self._occurrences[anchor])
+        return sorted(set(positions)) if len(anchors) > 1 else positions
+
+    def candidates(self, alternative: Alternative, start: int = 0):
+        """
+        Positions (ascending) where a match of the alternative can start, from `start` on,
+        or None when every position has to be tried
+        """
+        if self.lowered is None or not alternative.anchors:
+            return None
+        occurrences = self.occurrences(alternative.anchors)
+        if alternative.leading:
+            return occurrences[bisect_left(occurrences, start):]
+        if alternative.before is None:
+            return None if occurrences else []
+        return self._windows(occurrences, alternative.before, start)
+
+    def _windows(self, occurrences: List[int], before: re.Pattern, start: int):
+        # Every start position from the beginning of the run of `before` characters ending at
+        # each anchor occurrence up to the occurrence itself; runs never move backwards
+        tried = start
+        for occurrence in occurrences:
+            if occurrence < tried:
+                continue
+            position = occurrence
+            while position > tried and before.fullmatch(self.text, position - 1, position):
+                position -= 1
+            yield from range(position, occurrence + 1)
+            tried = occurrence + 1
+
+    def search(self, alternative: Alternative) -> Optional[re.Match]:
+        candidates = self.candidates(alternative)
+        if candidates is None:
+            return alternative.regex.search(self.text)
+        for position in candidates:
+            match = alternative.regex.match(self.text, position)
+            if match:
+                return match
+        return None
+
+    def findall(self, alternative: Alternative) -> List:
+        if self.candidates(alternative) is None:
+            return alternative.regex.findall(self.text)
+        results = []
+        position = 0
+        while True:
+            for candidate in self.candidates(alternative, position):
+                match = alternative.regex.match(self.text, candidate)
+                if match:
+                    break
+            else:
+                return results
+            results.append(_findall_item(match))
+            position = match.end() if match.end() > match.start() else match.end() + 1
+
+
+def extract_fields(text: str, rules: Iterable[Rule], anchored: bool = True) -> Dict[str, object]:
+    """Fill every rule's field from the page text (anchored=False searches every pattern over the full text)"""
+    page = _Page(text, anchored)
+    fields = {}
+    for rule in rules:
+        if rule.mode == "first":
+            fields[rule.name] = next(
+                (match for match in map(page.search, rule.alternatives) if match is not None), None
+            )
+        elif rule.mode == "each":
+            fields[rule.name] = [page.search(alternative) for alternative in rule.alternatives]
+        else:
+            fields[rule.name] = [page.findall(alternative) for alternative in rule.alternatives]
+    return fields
@@ -0,0 +1,108 @@
+"""
+Keyed store of TimeGPT forecast frames.
+
+A forecast is keyed by what produced it: a hash of the (sorted) symbol set, the horizon,
+the last data date and the model. Frames are kept in memory once loaded or computed, so
+the repeated lookups of a run (the market-wide prefetch, then every symbol's input
+gathering) are dictionary hits, and on disk as Parquet (CSV when pyarrow is missing)
+under a directory named after the store version, so a format change starts a new store
+instead of misreading the old one.
+"""
+
+import hashlib
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, NamedTuple, Optional
+
+import pandas as pd
+
+from ai_trading_crew.utils.storage import atomic_write, parquet_available
+
+FORECAST_STORE_DIR = Path(__file__).parent.parent.parent / "resources" / "forecast_store"
+FORECAST_STORE_VERSION = 1
+
+
+class ForecastKey(NamedTuple):
+    symbols_hash: str
+    horizon: int
+    last_date: str
+    model: str
+
+
+def forecast_key(symbols: Iterable[str], horizon: int, last_date, model: str) -> ForecastKey:
+    symbols_hash = hashlib.sha256(",".join(sorted(set(symbols))).encode("utf-8")).hexdigest()[:16]
+    return ForecastKey(symbols_hash, int(horizon), pd.Timestamp(last_date).strftime("%Y-%m-%d"), model)
+
+
+class ForecastStore:
+    """Forecast frames by ForecastKey, memoized in memory and kept on disk in a columnar format"""
+
+    def __init__(self, root: Path = FORECAST_STORE_DIR, use_parquet: Optional[bool] = None):
+        self.use_parquet = parquet_available() if use_parquet is None else use_parquet
+        self.root = Path(root) / f"v{FORECAST_STORE_VERSION}"
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "computed": 0}
+        self._frames: Dict[ForecastKey, pd.DataFrame] = {}
+        self._lock = threading.Lock()
+        self._key_locks: Dict[ForecastKey, threading.Lock] = {}
+
+    def metrics(self) -> Dict[str, int]:
+        """Lookups answered from memory or disk, and forecasts computed"""
+        return dict(self.stats)
+
+    def path(self, key: ForecastKey) -> Path:
+        suffix = "parquet" if self.use_parquet else "csv"
+        return self.root / key.last_date / f"{key.model}_h{key.horizon}_{key.symbols_hash}.{suffix}"
+
+    def _read(self, path: Path) -> pd.DataFrame:
+        if self.use_parquet:
+            return pd.read_parquet(path)
+        return pd.read_csv(path, dtype={"unique_id": str}, parse_dates=["ds"], float_precision="round_trip")
+
+    def _write(self, frame: pd.DataFrame, path: Path):
+        if self.use_parquet:
+            atomic_write(path, lambda tmp_path: frame.to_parquet(tmp_path, engine="pyarrow", compression="snappy", index=False))
+        else:
+            atomic_write(path, lambda tmp_path: frame.to_csv(tmp_path, index=False))
+
+    def get(self, key: ForecastKey) -> Optional[pd.DataFrame]:
+        """The stored forecast, loaded from disk on the first lookup only"""
+        frame = self._frames.get(key)
+        if frame is not None:
+            self.stats["memory_hits"] += 1
+            return frame
+        try:
+            frame = self._read(self.path(key))
+        except (OSError, ValueError):
+            return None
+        self.stats["disk_hits"] += 1
+        self._frames[key] = frame
+        return frame
+
+    def put(self, key: ForecastKey, frame: pd.DataFrame):
+        self._frames[key] = frame
+        try:
+            self._write(frame, self.path(key))
+        except (OSError, ValueError) as e:
+            print(f"Error saving forecast {key}: {str(e)}")
+
+    def get_or_compute(self, key: ForecastKey, compute: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+        """
+        The stored forecast, or compute() stored under the key. Concurrent callers of the
+        same key wait for a single computation.
+        """
+        frame = self.get(key)
+        if frame is not None:
+            return frame
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            frame = self.get(key)
+            if frame is None:
+                frame = compute()
+                self.stats["computed"] += 1
+                self.put(key, frame)
+        return frame
+
+
+# Create a singleton instance
+forecast_store = ForecastStore()
@@ -0,0 +1,238 @@
+"""
+HTML parsing backends shared by the scrapers.
+
+parse_html returns the page as an HtmlNode: the small slice of the BeautifulSoup API the
+hot scraping loops use (CSS select, text, attributes, parent and siblings), backed by
+the parser configured in settings.HTML_PARSER:
+
+- "lxml": lxml's native C tree, with CSS selectors compiled to XPath once by cssselect.
+  A large news page parses and queries in milliseconds, where building the equivalent
+  BeautifulSoup tree takes hundreds.
+- "html.parser": BeautifulSoup over Python's html.parser, the fallback when lxml (or
+  cssselect) is not installed.
+
+Text follows BeautifulSoup's get_text on both backends: comments and the contents of
+script, style and template elements are left out.
+
+make_soup keeps the full BeautifulSoup API for the less frequently run extractors; it
+uses lxml as BeautifulSoup's tree builder when available.
+"""
+
+import importlib.util
+from functools import lru_cache
+from typing import List, Optional, Tuple, Union
+
+from bs4 import BeautifulSoup, NavigableString, SoupStrainer
+
+from ai_trading_crew.config import settings
+
+HTML_PARSERS = ("lxml", "html.parser")
+
+# Elements whose strings BeautifulSoup's get_text leaves out
+_HIDDEN_TEXT_TAGS = ("script", "style", "template")
+
+_fallback_reported = False
+
+
+def lxml_available() -> bool:
+    return importlib.util.find_spec("lxml") is not None and importlib.util.find_spec("cssselect") is not None
+
+
+def resolve_parser(name: Optional[str] = None) -> str:
+    """The backend to use for a configured parser name (defaults to settings.HTML_PARSER)"""
+    global _fallback_reported
+    name = name or settings.HTML_PARSER
+    if name not in HTML_PARSERS:
+        raise ValueError(f"Unknown HTML parser '{name}', expected one of {', '.join(HTML_PARSERS)}")
+    if name == "lxml" and not lxml_available():
+        if not _fallback_reported:
+            print("lxml/cssselect are not installed, falling back to Python's html.parser")
+            _fallback_reported = True
+        return "html.parser"
+    return name
+
+
+def make_soup(markup: Union[str, bytes], parse_only: Optional[SoupStrainer] = None,
+              parser: Optional[str] = None) -> BeautifulSoup:
+    """Parse a page (or the parts of it matching parse_only) into a BeautifulSoup tree"""
+    return BeautifulSoup(markup, resolve_parser(parser), parse_only=parse_only)
+
+
+def parse_html(markup: Union[str, bytes], parser: Optional[str] = None) -> "HtmlNode":
+    """Parse a page with the configured backend and return its document node"""
+    if resolve_parser(parser) == "lxml":
+        return _LxmlNode(_lxml_document(markup))
+    return _SoupNode(BeautifulSoup(markup, "html.parser"))
+
+
+class HtmlNode:
+    """An element of a parsed page; nodes compare and hash by the element they wrap"""
+
+    __slots__ = ("element",)
+
+    def __init__(self, element):
+        self.element = element
+
+    def __eq__(self, other):
+        return isinstance(other, HtmlNode) and self.element is other.element
+
+    def __hash__(self):
+        return id(self.element)
+
+    @property
+    def tag(self) -> str:
+        raise NotImplementedError
+
+    @property
+    def text(self) -> str:
+        """All text under the element, like BeautifulSoup's .text"""
+        return self.get_text()
+
+    def get_text(self, separator: str = "", strip: bool = False) -> str:
+        raise NotImplementedError
+
+    def get(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        """Attribute value; multi-valued attributes such as class come back space-joined"""
+        raise NotImplementedError
+
+    def select(self, selector: str) -> List["HtmlNode"]:
+        """Descendants matching a CSS selector, in document order"""
+        raise NotImplementedError
+
+    def select_one(self, selector: str) -> Optional["HtmlNode"]:
+        matches = self.select(selector)
+        return matches[0] if matches else None
+
+    @property
+    def parent(self) -> Optional["HtmlNode"]:
+        raise NotImplementedError
+
+    def siblings(self) -> List[Union["HtmlNode", str]]:
+        """Following siblings, then preceding ones nearest first, like BeautifulSoup's next_siblings + previous_siblings"""
+        raise NotImplementedError
+
+    def text_nodes(self) -> List[Tuple[str, "HtmlNode"]]:
+        """Every text node under the element with the element directly containing it, in document order"""
+        raise NotImplementedError
+
+
+class _SoupNode(HtmlNode):
+    __slots__ = ()
+
+    @property
+    def tag(self) -> str:
+        return self.element.name
+
+    def get_text(self, separator: str = "", strip: bool = False) -> str:
+        return self.element.get_text(separator, strip=strip)
+
+    def get(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        value = self.element.get(name, default)
+        return " ".join(value) if isinstance(value, list) else value
+
+    def select(self, selector: str) -> List[HtmlNode]:
+        return [_SoupNode(element) for element in self.element.select(selector)]
+
+    @property
+    def parent(self) -> Optional[HtmlNode]:
+        return _SoupNode(self.element.parent) if self.element.parent is not None else None
+
+    def siblings(self) -> List[Union[HtmlNode, str]]:
+        siblings = []
+        for sibling in list(self.element.next_siblings) + list(self.element.previous_siblings):
+            if type(sibling) is NavigableString:
+                siblings.append(str(sibling))
+            elif not isinstance(sibling, NavigableString):
+                siblings.append(_SoupNode(sibling))
+        return siblings
+
+    def text_nodes(self) -> List[Tuple[str, HtmlNode]]:
+        return [(str(string), _SoupNode(string.parent)) for string in self.element.find_all(string=True)
+                if type(string) is NavigableString]
+
+
+@lru_cache(maxsize=None)
+def _lxml_text_query(smart_strings: bool):
+    from lxml import etree
+    hidden = " or ".join(f"ancestor::{tag}" for tag in _HIDDEN_TEXT_TAGS)
+    return etree.XPath(f"descendant::text()[not({hidden})]", smart_strings=smart_strings)
+
+
+@lru_cache(maxsize=256)
+def _lxml_css_query(selector: str):
+    """A CSS selector compiled to an XPath over the descendants of the context element"""
+    from cssselect import HTMLTranslator
+    from lxml import etree
+    return etree.XPath(HTMLTranslator().css_to_xpath(selector, prefix="descendant::"))
+
+
+def _lxml_document(markup: Union[str, bytes]):
+    import lxml.html
+    from lxml.etree import ParserError
+    try:
+        return lxml.html.document_fromstring(markup)
+    except ValueError:
+        # lxml refuses str input that carries an XML encoding declaration
+        if isinstance(markup, bytes):
+            raise
+        return lxml.html.document_fromstring(markup.encode("utf-8"), parser=lxml.html.HTMLParser(encoding="utf-8"))
+    except ParserError:
+        # Empty or whitespace-only page
+        return lxml.html.document_fromstring("<html></html>")
+
+
+def _is_lxml_element(node) -> bool:
+    # Comments and processing instructions have a function as their tag
+    return isinstance(node.tag, str)
+
+
+class _LxmlNode(HtmlNode):
+    __slots__ = ()
+
+    @property
+    def tag(self) -> str:
+        return self.element.tag
+
+    def get_text(self, separator: str = "", strip: bool = False) -> str:
+        strings = _lxml_text_query(False)(self.element)
+        if strip:
+            strings = [s for s in (string.strip() for string in strings) if s]
+        return separator.join(strings)
+
+    def get(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        return self.element.get(name, default)
+
+    def select(self, selector: str) -> List[HtmlNode]:
+        return [_LxmlNode(element) for element in _lxml_css_query(selector)(self.element)]
+
+    @property
+    def parent(self) -> Optional[HtmlNode]:
+        parent = self.element.getparent()
+        return _LxmlNode(parent) if parent is not None else None
+
+    def siblings(self) -> List[Union[HtmlNode, str]]:
+        # lxml keeps the text after an element as its tail rather than as a sibling node
+        siblings = [self.element.tail] if self.element.tail else []
+        for sibling in self.element.itersiblings():
+            if _is_lxml_element(sibling):
+                siblings.append(_LxmlNode(sibling))
+            if sibling.tail:
+                siblings.append(sibling.tail)
+        for sibling in self.element.itersiblings(preceding=True):
+            if sibling.tail:
+                siblings.append(sibling.tail)
+            if _is_lxml_element(sibling):
+                siblings.append(_LxmlNode(sibling))
+        parent = self.element.getparent()
+        if parent is not None and parent.text:
+            siblings.append(parent.text)
+        return siblings
+
+    def text_nodes(self) -> List[Tuple[str, HtmlNode]]:
+        nodes = []
+        for string in _lxml_text_query(True)(self.element):
+            holder = string.getparent()
+            if string.is_tail:
+                holder = holder.getparent()
+            nodes.append((str(string), _LxmlNode(holder)))
+        return nodes
@@ -0,0 +1,208 @@
+"""
+Persistent on-disk cache for GET responses made through the shared HTTP client.
+
+Entries are keyed by a normalized request: the URL with lower-cased host, sorted query
+parameters and secrets (e.g. apikey) removed, plus the few request headers that change
+the representation. Bodies are stored content-addressed (by SHA-256), so pages that come
+back identical under different URLs are stored once.
+
+Each source (host) has its own TTL. Within it a response is served straight from disk;
+after it, the request is revalidated with If-None-Match / If-Modified-Since when the
+server sent an ETag or Last-Modified, and a 304 renews the entry without a new body.
+Hosts with a TTL of 0 always go to the network, but their responses are still recorded
+so that offline mode can replay them. In offline mode every request is answered from
+disk regardless of age, and a miss returns 504 like an HTTP "only-if-cached" request.
+
+The total body size is capped; entries are evicted least recently used first.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlencode
+
+import httpx
+
+from ai_trading_crew.utils.storage import atomic_write
+
+
+# Stored responses are decoded, so the headers describing the transfer no longer apply
+UNCACHED_RESPONSE_HEADERS = {
+    "connection", "keep-alive", "transfer-encoding", "content-encoding", "content-length", "set-cookie",
+}
+
+# Fetches of one key are serialized by a fixed set of locks, picked by the key's hash; two keys
+# rarely share a lock, and the set doesn't grow with the number of URLs a run touches
+KEY_LOCK_STRIPES = 256
+
+
+def key_stripe(key: str) -> int:
+    """Index of the lock (out of KEY_LOCK_STRIPES) that serializes fetches of a cache key"""
+    return int(key[:8], 16) % KEY_LOCK_STRIPES
+
+
+class NotCachedError(LookupError):
+    """An offline request the cache has no recorded response for"""
+
+
+class HttpCache:
+    """Disk-backed response cache shared by the blocking and async HTTP client paths"""
+
+    def __init__(self, root: Path, config: dict):
+        self.root = Path(root)
+        self.entries_dir = self.root / "entries"
+        self.bodies_dir = self.root / "bodies"
+        self.max_size = int(config["max_size_mb"] * 1024 * 1024)
+        self.default_ttl = config["default_ttl"]
+        self.ttls = config["ttls"]
+        self.vary_headers = [h.lower() for h in config["vary_headers"]]
+        self.ignored_params = set(config["ignored_params"])
+        self.offline = config.get("offline", False)
+
+        self._lock = threading.Lock()
+        self._key_locks = [threading.Lock() for _ in range(KEY_LOCK_STRIPES)]
+        self._size: Optional[int] = None
+        self.stats = {"hits": 0, "revalidated": 0, "fetched": 0, "offline_misses": 0}
+
+    def ttl(self, host: str) -> float:
+        """Get the freshness lifetime in seconds for a host, matching configured domains and their subdomains"""
+        for domain, ttl in self.ttls.items():
+            if host == domain or host.endswith(f".{domain}"):
+                return ttl
+        return self.default_ttl
+
+    def normalize(self, url: str, params: Optional[dict] = None,
+                  headers: Optional[dict] = None) -> Tuple[str, str]:
+        """Canonical URL and cache key for a GET request"""
+        parsed = httpx.URL(url)
+        if params:
+            parsed = parsed.copy_merge_params(params)
+        query = sorted((k, v) for k, v in parsed.params.multi_items() if k not in self.ignored_params)
+        canonical = str(parsed.copy_with(host=parsed.host.lower(), query=urlencode(query).encode() or None,
+                                         fragment=None))
+        lowered = {k.lower(): v for k, v in (headers or {}).items()}
+        vary = "\n".join(f"{name}:{lowered.get(name, '')}" for name in self.vary_headers)
+        key = hashlib.sha256(f"GET {canonical}\n{vary}".encode()).hexdigest()
+        return canonical, key
+
+    def count(self, outcome: str):
+        with self._lock:
+            self.stats[outcome] += 1
+
+    def metrics(self) -> Dict[str, int]:
+        """Requests answered from disk, revalidated with a 304, fetched from the network, or missed offline"""
+        with self._lock:
+            return dict(self.stats)
+
+    def key_lock(self, key: str) -> threading.Lock:
+        """Lock serializing fetches of one key, so concurrent callers share a single download"""
+        return self._key_locks[key_stripe(key)]
+
+    def _entry_path(self, key: str) -> Path:
+        return self.entries_dir / key[:2] / f"{key}.json"
+
+    def _body_path(self, digest: str) -> Path:
+        return self.bodies_dir / digest[:2] / digest
+
+    def lookup(self, key: str) -> Optional[Tuple[dict, bytes]]:
+        """Load an entry and its body, marking it as recently used"""
+        path = self._entry_path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+            body = self._body_path(entry["body"]).read_bytes()
+            os.utime(path)
+        except (OSError, ValueError, KeyError):
+            return None
+        return entry, body
+
+    def is_fresh(self, entry: dict, host: str) -> bool:
+        return time.time() - entry["fetched_at"] < self.ttl(host)
+
+    @staticmethod
+    def revalidation_headers(entry: dict) -> dict:
+        """Conditional request headers for an expired entry"""
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, key: str, url: str, response: httpx.Response) -> dict:
+        """Record a 200 response and evict old entries if the cache has grown past its cap"""
+        body = response.content
+        digest = hashlib.sha256(body).hexdigest()
+        body_path = self._body_path(digest)
+        added = 0
+        if not body_path.exists():
+            self._atomic_write(body_path, body)
+            added = len(body)
+
+        entry = {
+            "url": url,
+            "status": response.status_code,
+            "headers": {k: v for k, v in response.headers.items() if k.lower() not in UNCACHED_RESPONSE_HEADERS},
+            "body": digest,
+            "etag": response.headers.get("etag"),
+            "last_modified": response.headers.get("last-modified"),
+            "fetched_at": time.time(),
+        }
+        self._atomic_write(self._entry_path(key), json.dumps(entry).encode("utf-8"))
+
+        with self._lock:
+            if self._size is None:
+                self._size = sum(f.stat().st_size for f in self.bodies_dir.rglob("*") if f.is_file())
+            else:
+                self._size += added
+            if self._size > self.max_size:
+                self._evict()
+        return entry
+
+    def renew(self, key: str, entry: dict):
+        """Restart an entry's TTL after the server confirmed it with 304 Not Modified"""
+        entry["fetched_at"] = time.time()
+        self._atomic_write(self._entry_path(key), json.dumps(entry).encode("utf-8"))
+
+    def response(self, entry: dict, body: bytes, request: httpx.Request) -> httpx.Response:
+        """Rebuild an httpx.Response from a stored entry"""
+        return httpx.Response(entry["status"], headers=entry["headers"], content=body, request=request)
+
+    def _evict(self):
+        """Drop least recently used entries until the bodies fit in 90% of the cap (caller holds the lock)"""
+        entries = []
+        references: Dict[str, int] = {}
+        for path in self.entries_dir.rglob("*.json"):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    digest = json.load(f)["body"]
+                entries.append((path.stat().st_mtime, path, digest))
+            except (OSError, ValueError, KeyError):
+                path.unlink(missing_ok=True)
+                continue
+            references[digest] = references.get(digest, 0) + 1
+
+        target = int(self.max_size * 0.9)
+        evicted = 0
+        for _, path, digest in sorted(entries, key=lambda item: item[0]):
+            if self._size <= target:
+                break
+            path.unlink(missing_ok=True)
+            evicted += 1
+            references[digest] -= 1
+            if references[digest] == 0:
+                body_path = self._body_path(digest)
+                try:
+                    self._size -= body_path.stat().st_size
+                    body_path.unlink()
+                except OSError:
+                    pass
+        print(f"HTTP cache evicted {evicted} entries, {self._size / 1024 / 1024:.1f} MB left")
+
+    @staticmethod
+    def _atomic_write(path: Path, data: bytes):
+        atomic_write(path, lambda tmp_path: tmp_path.write_bytes(data))
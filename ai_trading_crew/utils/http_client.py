@@ -0,0 +1,283 @@
+"""
+Shared HTTP client for all scrapers and API fetchers.
+Keeps one connection pool per process so repeated requests to the same hosts
+reuse keep-alive (and HTTP/2 where available) connections instead of paying a
+new TCP/TLS handshake every time. GET responses go through the on-disk HTTP cache
+(see http_cache.py) when it is enabled.
+"""
+
+import asyncio
+import importlib.util
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from ai_trading_crew.config import settings
+from ai_trading_crew.utils.http_cache import KEY_LOCK_STRIPES, HttpCache, key_stripe
+
+HTTP_CACHE_DIR = Path(__file__).parent.parent.parent / "resources" / "http_cache"
+
+
+# Connection management is owned by the pool; these headers are also illegal on HTTP/2
+HOP_BY_HOP_HEADERS = {"connection", "keep-alive", "proxy-connection", "transfer-encoding", "upgrade"}
+
+
+class HttpClient:
+    """
+    Process-wide HTTP client with per-host connection pooling and concurrency limits.
+
+    Blocking callers (collectors running in executor threads) use `get`, coroutines use
+    `aget`. Both share the same configuration and per-host limits.
+    """
+
+    def __init__(self, config: Optional[dict] = None, cache_config: Optional[dict] = None):
+        config = config or settings.HTTP_CLIENT_DEFAULTS
+        cache_config = cache_config or settings.HTTP_CACHE_DEFAULTS
+        self.timeout = config["timeout"]
+        self.http2 = config["http2"] and importlib.util.find_spec("h2") is not None
+        self.default_host_limit = config["default_host_limit"]
+        self.host_limits = config["host_limits"]
+        self.limits = httpx.Limits(
+            max_connections=config["max_connections"],
+            max_keepalive_connections=config["max_keepalive_connections"],
+            keepalive_expiry=config["keepalive_expiry"],
+        )
+
+        self._lock = threading.Lock()
+        self._client: Optional[httpx.Client] = None
+        self._host_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._local = threading.local()
+
+        # httpx.AsyncClient and asyncio.Semaphore are bound to the loop that created them
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._async_host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._async_key_locks: List[asyncio.Lock] = []
+
+        self.cache: Optional[HttpCache] = HttpCache(HTTP_CACHE_DIR, cache_config) if cache_config["enabled"] else None
+
+    def set_offline(self, offline: bool = True):
+        """Answer every GET from the HTTP cache only, replaying what earlier runs recorded"""
+        if self.cache is None:
+            self.cache = HttpCache(HTTP_CACHE_DIR, settings.HTTP_CACHE_DEFAULTS)
+        self.cache.offline = offline
+
+    @property
+    def offline(self) -> bool:
+        return self.cache is not None and self.cache.offline
+
+    @contextmanager
+    def track_outcomes(self):
+        """
+        Collect how each GET made by this thread inside the block was answered:
+        "cache", "revalidated", "network" or "offline-miss"
+        """
+        previous = getattr(self._local, "outcomes", None)
+        self._local.outcomes = outcomes = []
+        try:
+            yield outcomes
+        finally:
+            self._local.outcomes = previous
+
+    def _note(self, outcome: str, metric: Optional[str] = None):
+        if metric and self.cache is not None:
+            self.cache.count(metric)
+        outcomes = getattr(self._local, "outcomes", None)
+        if outcomes is not None:
+            outcomes.append(outcome)
+
+    def cache_metrics(self) -> Dict[str, int]:
+        """Get how many GETs the HTTP cache answered, revalidated or sent to the network"""
+        return self.cache.metrics() if self.cache is not None else {}
+
+    def host_key(self, host: str) -> str:
+        """
+        The configured domain a host belongs to (the domain itself or a subdomain of it), or
+        the host itself. Hosts with the same key share one concurrency limit.
+        """
+        for domain in self.host_limits:
+            if host == domain or host.endswith(f".{domain}"):
+                return domain
+        return host
+
+    def host_limit(self, host: str) -> int:
+        """Get the concurrency limit for a host, matching configured domains and their subdomains"""
+        return self.host_limits.get(self.host_key(host), self.default_host_limit)
+
+    def _client_kwargs(self) -> dict:
+        return {
+            "http2": self.http2,
+            "limits": self.limits,
+            "timeout": self.timeout,
+            "follow_redirects": True,
+        }
+
+    @staticmethod
+    def _clean_headers(headers: Optional[dict]) -> Optional[dict]:
+        if not headers:
+            return headers
+        return {k: v for k, v in headers.items() if k.lower() not in HOP_BY_HOP_HEADERS}
+
+    def _get_client(self) -> httpx.Client:
+        with self._lock:
+            if self._client is None:
+                self._client = httpx.Client(**self._client_kwargs())
+            return self._client
+
+    def _get_host_semaphore(self, host: str) -> threading.BoundedSemaphore:
+        key = self.host_key(host)
+        with self._lock:
+            if key not in self._host_semaphores:
+                self._host_semaphores[key] = threading.BoundedSemaphore(self.host_limit(host))
+            return self._host_semaphores[key]
+
+    def _retire_async_client(self):
+        """
+        Close the previous event loop's client on that loop while it is still running. A
+        finished loop can't run aclose() any more; its sockets are closed when the dropped
+        client is collected, so the loop's owner should await aclose() before it ends.
+        """
+        client, loop = self._async_client, self._async_loop
+        if client is not None and loop is not None and loop.is_running():
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+
+    def _get_async_state(self, host: str):
+        loop = asyncio.get_running_loop()
+        if self._async_loop is not loop:
+            self._retire_async_client()
+            self._async_loop = loop
+            self._async_client = httpx.AsyncClient(**self._client_kwargs())
+            self._async_host_semaphores = {}
+            self._async_key_locks = [asyncio.Lock() for _ in range(KEY_LOCK_STRIPES)]
+        key = self.host_key(host)
+        if key not in self._async_host_semaphores:
+            self._async_host_semaphores[key] = asyncio.Semaphore(self.host_limit(host))
+        return self._async_client, self._async_host_semaphores[key]
+
+    def _fetch(self, url: str, headers: Optional[dict], params: Optional[dict],
+               timeout: Optional[float]) -> httpx.Response:
+        host = urlsplit(url).hostname or ""
+        client = self._get_client()
+        with self._get_host_semaphore(host):
+            return client.get(
+                url,
+                headers=self._clean_headers(headers),
+                params=params,
+                timeout=timeout if timeout is not None else self.timeout,
+            )
+
+    async def _afetch(self, url: str, headers: Optional[dict], params: Optional[dict],
+                      timeout: Optional[float]) -> httpx.Response:
+        host = urlsplit(url).hostname or ""
+        client, semaphore = self._get_async_state(host)
+        async with semaphore:
+            return await client.get(
+                url,
+                headers=self._clean_headers(headers),
+                params=params,
+                timeout=timeout if timeout is not None else self.timeout,
+            )
+
+    def _cached_response(self, key: str, url: str, params: Optional[dict]):
+        """
+        Look a request up in the cache. Returns (response, entry): a response when the cache
+        answers it outright, otherwise the expired entry (if any) to revalidate.
+        """
+        request = httpx.Request("GET", url, params=params)
+        cached = self.cache.lookup(key)
+        if self.cache.offline:
+            if cached is None:
+                self._note("offline-miss", "offline_misses")
+                return httpx.Response(504, request=request), None
+            self._note("cache", "hits")
+            return self.cache.response(*cached, request), None
+        if cached is not None and self.cache.is_fresh(cached[0], request.url.host):
+            self._note("cache", "hits")
+            return self.cache.response(*cached, request), None
+        return None, cached
+
+    def _conditional_headers(self, url: str, headers: Optional[dict], cached) -> Optional[dict]:
+        # Sources with no TTL are only recorded for offline replay, never revalidated
+        if cached is None or self.cache.ttl(urlsplit(url).hostname or "") <= 0:
+            return headers
+        return {**(headers or {}), **self.cache.revalidation_headers(cached[0])}
+
+    def _record(self, key: str, canonical: str, response: httpx.Response, cached) -> httpx.Response:
+        if response.status_code == 304 and cached is not None:
+            self.cache.renew(key, cached[0])
+            self._note("revalidated", "revalidated")
+            return self.cache.response(*cached, response.request)
+        self._note("network", "fetched")
+        if response.status_code == 200:
+            self.cache.store(key, canonical, response)
+        return response
+
+    def cached_get(self, url: str, headers: Optional[dict] = None, params: Optional[dict] = None) -> Optional[httpx.Response]:
+        """
+        The response the HTTP cache answers a GET with without touching the network (any
+        recorded one offline, a fresh one otherwise), or None. Lets rate-limited callers skip
+        their limiter for requests that won't reach the API.
+        """
+        if self.cache is None:
+            return None
+        _, key = self.cache.normalize(url, params, headers)
+        with self.cache.key_lock(key):
+            cached = self.cache.lookup(key)
+            request = httpx.Request("GET", url, params=params)
+            if cached is None or not (self.cache.offline or self.cache.is_fresh(cached[0], request.url.host)):
+                if self.cache.offline:
+                    self._note("offline-miss", "offline_misses")
+                return None
+            self._note("cache", "hits")
+            return self.cache.response(*cached, request)
+
+    def get(self, url: str, headers: Optional[dict] = None, params: Optional[dict] = None,
+            timeout: Optional[float] = None) -> httpx.Response:
+        """Blocking GET through the HTTP cache and the shared pool, bounded by the host's concurrency limit"""
+        if self.cache is None:
+            self._note("network")
+            return self._fetch(url, headers, params, timeout)
+        canonical, key = self.cache.normalize(url, params, headers)
+        with self.cache.key_lock(key):
+            response, cached = self._cached_response(key, url, params)
+            if response is not None:
+                return response
+            response = self._fetch(url, self._conditional_headers(url, headers, cached), params, timeout)
+            return self._record(key, canonical, response, cached)
+
+    async def aget(self, url: str, headers: Optional[dict] = None, params: Optional[dict] = None,
+                   timeout: Optional[float] = None) -> httpx.Response:
+        """Async GET through the HTTP cache and the shared pool, bounded by the host's concurrency limit"""
+        if self.cache is None:
+            self._note("network")
+            return await self._afetch(url, headers, params, timeout)
+        canonical, key = self.cache.normalize(url, params, headers)
+        self._get_async_state(urlsplit(url).hostname or "")
+        async with self._async_key_locks[key_stripe(key)]:
+            response, cached = self._cached_response(key, url, params)
+            if response is not None:
+                return response
+            response = await self._afetch(url, self._conditional_headers(url, headers, cached), params, timeout)
+            return self._record(key, canonical, response, cached)
+
+    def close(self):
+        """Close the blocking client's pooled connections"""
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+
+    async def aclose(self):
+        """Close the async client's pooled connections; await it before the event loop that used them ends"""
+        if self._async_client is not None and self._async_loop is asyncio.get_running_loop():
+            await self._async_client.aclose()
+            self._async_client = None
+            self._async_loop = None
+
+
+# Create a singleton instance
+http_client = HttpClient()
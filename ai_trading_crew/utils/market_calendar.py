@@ -0,0 +1,109 @@
+"""
+Memoized exchange trading calendar.
+
+Building a pandas_market_calendars schedule takes tens of milliseconds, and the crew used
+to rebuild one for every freshness check, symbol preparation and forecast. The schedule
+of each calendar year is built at most once per process here and kept on disk as CSV, in
+a directory named after the pandas_market_calendars version so that a library upgrade
+(which may add special closures) rebuilds it. Sessions, holidays and the latest session
+are all answered from those per-year schedules.
+"""
+
+import threading
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+import pandas as pd
+import pandas_market_calendars as mcal
+
+from ai_trading_crew.utils.storage import atomic_write
+
+MARKET_CALENDAR_DIR = Path(__file__).parent.parent.parent / "resources" / "market_calendar"
+
+DateLike = Union[str, date, datetime, pd.Timestamp]
+
+
+class TradingCalendar:
+    """Trading sessions of one exchange, memoized per calendar year in memory and on disk"""
+
+    def __init__(self, market: str = "NYSE", cache_dir: Optional[Path] = None):
+        self.market = market
+        self.cache_dir = Path(cache_dir or MARKET_CALENDAR_DIR) / market / mcal.__version__
+        self._lock = threading.Lock()
+        self._calendar = None
+        self._years: Dict[int, pd.DataFrame] = {}
+        self._schedule: Optional[pd.DataFrame] = None
+        self._latest_sessions: Dict[date, date] = {}
+
+    def _build_year(self, year: int) -> pd.DataFrame:
+        if self._calendar is None:
+            self._calendar = mcal.get_calendar(self.market)
+        return self._calendar.schedule(start_date=f"{year}-01-01", end_date=f"{year}-12-31")
+
+    def _load_year(self, year: int) -> pd.DataFrame:
+        path = self.cache_dir / f"{year}.csv"
+        try:
+            schedule = pd.read_csv(path, index_col=0, parse_dates=[0])
+            for column in schedule.columns:
+                schedule[column] = pd.to_datetime(schedule[column], utc=True)
+            return schedule.rename_axis(None)
+        except (OSError, ValueError):
+            pass
+
+        schedule = self._build_year(year)
+        try:
+            atomic_write(path, lambda tmp_path: schedule.to_csv(tmp_path, date_format="%Y-%m-%d %H:%M:%S%z"))
+        except OSError as e:
+            print(f"Error saving {self.market} calendar for {year}: {e}")
+        return schedule
+
+    def _schedule_for_years(self, first: int, last: int) -> pd.DataFrame:
+        with self._lock:
+            missing = [year for year in range(first, last + 1) if year not in self._years]
+            if missing:
+                for year in missing:
+                    self._years[year] = self._load_year(year)
+                self._schedule = pd.concat([self._years[year] for year in sorted(self._years)])
+            return self._schedule
+
+    def schedule(self, start_date: DateLike, end_date: DateLike) -> pd.DataFrame:
+        """Open and close times (UTC) of every session between the dates, inclusive"""
+        start, end = pd.Timestamp(start_date).normalize(), pd.Timestamp(end_date).normalize()
+        if end < start:
+            return self._schedule_for_years(start.year, start.year).iloc[0:0]
+        return self._schedule_for_years(start.year, end.year).loc[start:end]
+
+    def sessions(self, start_date: DateLike, end_date: DateLike) -> pd.DatetimeIndex:
+        """Session dates (midnight, tz-naive) between the dates, inclusive"""
+        return pd.DatetimeIndex(self.schedule(start_date, end_date).index)
+
+    def holidays(self, start_date: DateLike, end_date: DateLike) -> pd.DatetimeIndex:
+        """Weekdays between the dates on which the exchange is closed"""
+        weekdays = pd.bdate_range(pd.Timestamp(start_date).normalize(), pd.Timestamp(end_date).normalize())
+        return weekdays.difference(self.sessions(start_date, end_date))
+
+    def latest_session(self, on: Optional[date] = None) -> date:
+        """The last session on or before the date (today by default)"""
+        on = on or datetime.now().date()
+        if on not in self._latest_sessions:
+            sessions = self.sessions(pd.Timestamp(on) - pd.Timedelta(days=10), on)
+            # Fallback to the date itself if no session was found
+            self._latest_sessions[on] = sessions[-1].date() if len(sessions) > 0 else on
+        return self._latest_sessions[on]
+
+
+_calendars: Dict[str, TradingCalendar] = {}
+_calendars_lock = threading.Lock()
+
+
+def get_trading_calendar(market: str = "NYSE") -> TradingCalendar:
+    """The process-wide calendar of an exchange"""
+    with _calendars_lock:
+        if market not in _calendars:
+            _calendars[market] = TradingCalendar(market)
+        return _calendars[market]
+
+
+# Create a singleton instance
+trading_calendar = get_trading_calendar("NYSE")
@@ -0,0 +1,123 @@
+"""
+Credit-based rate limiting for metered APIs such as Twelve Data.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Dict
+
+
+class TokenBucket:
+    """
+    Token bucket holding `capacity` API credits per `period` seconds.
+
+    Spent credits flow back into the bucket exactly one period after they were spent,
+    so any rolling window of `period` seconds never exceeds `capacity` credits (a bucket
+    refilled at a constant rate can let almost twice the limit through in one minute).
+
+    Callers reserve credits up front and are told how long to wait, so they queue in
+    FIFO order: threads sleep in `acquire`, coroutines await in `acquire_async`.
+    """
+
+    def __init__(self, capacity: int, period: float = 60.0, safety_margin: float = 1.0):
+        if capacity < 1:
+            raise ValueError("Token bucket capacity must be at least 1 credit.")
+        self.capacity = capacity
+        self.period = period
+        self.safety_margin = safety_margin
+
+        self._lock = threading.Lock()
+        self._spent = deque()  # Scheduled spend time of each credit, oldest first
+
+        # Metrics
+        self._waiting = 0
+        self.max_queue_depth = 0
+        self.credits_used = 0
+        self.requests = 0
+        self.throttled_requests = 0
+        self.total_wait = 0.0
+
+    def _prune(self, now: float):
+        window_start = now - self.period - self.safety_margin
+        while self._spent and self._spent[0] <= window_start:
+            self._spent.popleft()
+
+    def reserve(self, credits: int = 1) -> float:
+        """Reserve credits and return how many seconds the caller must wait before using them"""
+        if credits > self.capacity:
+            raise ValueError(f"Cannot reserve {credits} credits from a bucket of {self.capacity} credits per window.")
+
+        with self._lock:
+            now = time.monotonic()
+            self._prune(now)
+
+            start = now
+            # The credit spent `capacity - credits` positions before the newest one has to
+            # leave the window before this request fits in it
+            blocking_index = len(self._spent) - (self.capacity - credits) - 1
+            if blocking_index >= 0:
+                start = max(start, self._spent[blocking_index] + self.period + self.safety_margin)
+
+            self._spent.extend([start] * credits)
+            self.credits_used += credits
+            self.requests += 1
+            return start - now
+
+    def penalize(self):
+        """Mark the current window as exhausted, e.g. after the API reported a rate limit anyway"""
+        with self._lock:
+            now = time.monotonic()
+            self._prune(now)
+            newest = self._spent[-1] if self._spent else now
+            self._spent.extend([max(now, newest)] * self.capacity)
+
+    def _start_waiting(self, wait: float):
+        with self._lock:
+            self._waiting += 1
+            self.max_queue_depth = max(self.max_queue_depth, self._waiting)
+            self.throttled_requests += 1
+            self.total_wait += wait
+
+    def _stop_waiting(self):
+        with self._lock:
+            self._waiting -= 1
+
+    def acquire(self, credits: int = 1):
+        """Block the calling thread until the credits can be spent"""
+        wait = self.reserve(credits)
+        if wait > 0:
+            self._start_waiting(wait)
+            try:
+                time.sleep(wait)
+            finally:
+                self._stop_waiting()
+
+    async def acquire_async(self, credits: int = 1):
+        """Wait on the event loop until the credits can be spent"""
+        wait = self.reserve(credits)
+        if wait > 0:
+            self._start_waiting(wait)
+            try:
+                await asyncio.sleep(wait)
+            finally:
+                self._stop_waiting()
+
+    def metrics(self) -> Dict[str, float]:
+        """Snapshot of queue depth and credit usage"""
+        with self._lock:
+            now = time.monotonic()
+            self._prune(now)
+            window_start = now - self.period
+            credits_in_window = sum(1 for t in self._spent if t > window_start)
+            return {
+                "queue_depth": self._waiting,
+                "max_queue_depth": self.max_queue_depth,
+                "credits_used": self.credits_used,
+                "credits_in_window": credits_in_window,
+                "credits_available": max(self.capacity - credits_in_window, 0),
+                "requests": self.requests,
+                "throttled_requests": self.throttled_requests,
+                "total_wait_seconds": round(self.total_wait, 2),
+            }
@@ -0,0 +1,238 @@
+"""
+Storage backends for cached OHLCV time series.
+
+Both stores keep one frame per symbol and interval with a datetime index and
+float64 Open/High/Low/Close/Volume columns, and memoize loaded frames until the
+underlying file changes, so repeated freshness checks and loads within a run
+don't parse the same file again.
+"""
+
+import importlib.util
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+import pandas as pd
+
+
+OHLCV_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+
+def normalize_ohlcv(df: pd.DataFrame) -> Optional[pd.DataFrame]:
+    """
+    Coerce a cached frame to float64 OHLCV columns on a sorted datetime index.
+    Returns None if the frame doesn't hold OHLCV data.
+    """
+    # The TimeGPT handler writes lowercase columns to the legacy CSV files
+    df = df.rename(columns={column.lower(): column for column in OHLCV_COLUMNS})
+    if not {'Open', 'High', 'Low', 'Close'}.issubset(df.columns):
+        return None
+    if 'Volume' not in df.columns:
+        df['Volume'] = 0
+
+    df = df[OHLCV_COLUMNS].astype('float64')
+    if not isinstance(df.index, pd.DatetimeIndex):
+        df.index = pd.to_datetime(df.index)
+    df.index.name = 'datetime'
+    return df if df.index.is_monotonic_increasing else df.sort_index()
+
+
+def safe_symbol(symbol: str) -> str:
+    """Make a symbol usable as a file name"""
+    return symbol.lower().replace('/', '_').replace('\\', '_')
+
+
+def atomic_write(path: Path, writer: Callable[[Path], None]):
+    """
+    Write a file through writer(temporary path) in the same directory, then move it into
+    place, so readers see either the old file or the complete new one. The temporary file
+    is removed if writing fails.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    os.close(fd)
+    try:
+        writer(Path(tmp_path))
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+class TimeSeriesStore:
+    """Base class for OHLCV stores keyed by symbol and interval"""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._memo: Dict[Path, Tuple[int, pd.DataFrame]] = {}
+
+    def path(self, symbol: str, interval: str) -> Path:
+        raise NotImplementedError
+
+    def _read(self, path: Path) -> pd.DataFrame:
+        raise NotImplementedError
+
+    def _write(self, df: pd.DataFrame, path: Path):
+        raise NotImplementedError
+
+    def load(self, symbol: str, interval: str = "1day") -> Optional[pd.DataFrame]:
+        """
+        Load the cached frame, or None if there is no usable cache. The frame is the
+        caller's own copy; changing it doesn't touch the memoized one.
+        """
+        df = self._load_shared(symbol, interval)
+        return df.copy() if df is not None else None
+
+    def _load_shared(self, symbol: str, interval: str) -> Optional[pd.DataFrame]:
+        """The memoized frame itself, for read-only use inside the store"""
+        path = self.path(symbol, interval)
+        try:
+            mtime = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+        with self._lock:
+            memo = self._memo.get(path)
+        if memo is not None and memo[0] == mtime:
+            return memo[1]
+
+        try:
+            df = self._read(path)
+        except Exception as e:
+            print(f"Error loading cached data for {symbol}: {e}")
+            return None
+
+        df = normalize_ohlcv(df) if not df.empty else None
+        if df is not None:
+            with self._lock:
+                self._memo[path] = (mtime, df)
+        return df
+
+    def latest_timestamp(self, symbol: str, interval: str = "1day") -> Optional[pd.Timestamp]:
+        """Timestamp of the newest cached bar"""
+        df = self._load_shared(symbol, interval)
+        return df.index[-1] if df is not None else None
+
+    def save(self, symbol: str, interval: str, df: pd.DataFrame):
+        """Save a frame, replacing the file atomically so readers never see a partial write"""
+        path = self.path(symbol, interval)
+        df = normalize_ohlcv(df)
+        if df is None:
+            raise ValueError(f"Refusing to cache data without OHLCV columns for {symbol}")
+
+        atomic_write(path, lambda tmp_path: self._write(df, tmp_path))
+
+        with self._lock:
+            self._memo[path] = (path.stat().st_mtime_ns, df)
+
+    def symbols(self, interval: str = "1day") -> Dict[str, Path]:
+        """Map of stored file stems to paths for an interval"""
+        raise NotImplementedError
+
+
+class CsvStore(TimeSeriesStore):
+    """
+    The original flat layout: resources/data/<symbol>.csv for daily data.
+    Other intervals get an interval suffix so they don't overwrite the daily file.
+    """
+
+    def path(self, symbol: str, interval: str) -> Path:
+        if interval == "1day":
+            return self.root / f"{safe_symbol(symbol)}.csv"
+        return self.root / f"{safe_symbol(symbol)}_{interval}.csv"
+
+    def _read(self, path: Path) -> pd.DataFrame:
+        return pd.read_csv(path, index_col=0, parse_dates=True)
+
+    def _write(self, df: pd.DataFrame, path: Path):
+        df.to_csv(path)
+
+    def symbols(self, interval: str = "1day") -> Dict[str, Path]:
+        # Only daily files can be told apart from other CSVs in the flat layout
+        if interval != "1day":
+            return {}
+        return {path.stem: path for path in self.root.glob("*.csv")}
+
+
+class ParquetStore(TimeSeriesStore):
+    """Parquet files partitioned by interval: <root>/interval=<interval>/<symbol>.parquet"""
+
+    def path(self, symbol: str, interval: str) -> Path:
+        return self.root / f"interval={interval}" / f"{safe_symbol(symbol)}.parquet"
+
+    def _read(self, path: Path) -> pd.DataFrame:
+        return pd.read_parquet(path)
+
+    def _write(self, df: pd.DataFrame, path: Path):
+        df.to_parquet(path, engine="pyarrow", compression="snappy")
+
+    def symbols(self, interval: str = "1day") -> Dict[str, Path]:
+        return {path.stem: path for path in (self.root / f"interval={interval}").glob("*.parquet")}
+
+
+def parquet_available() -> bool:
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def migrate_csv_to_parquet(csv_store: CsvStore, parquet_store: ParquetStore, interval: str = "1day") -> int:
+    """
+    One-shot migration of cached CSV time series into the Parquet store.
+    Files that don't hold one symbol's OHLCV data (company names, the TimeGPT handler's
+    combined.csv with several symbols' rows) are skipped, and symbols already in the
+    Parquet store are left alone.
+
+    Returns:
+        int: Number of migrated symbols
+    """
+    migrated = 0
+    existing = parquet_store.symbols(interval)
+    for stem, path in csv_store.symbols(interval).items():
+        if stem in existing or stem == "combined":
+            continue
+        try:
+            raw = pd.read_csv(path, index_col=0, parse_dates=True)
+            if raw.index.has_duplicates or ('unique_id' in raw.columns and raw['unique_id'].nunique() > 1):
+                print(f"Skipping {path.name} during migration: it holds several series")
+                continue
+            df = normalize_ohlcv(raw)
+        except Exception as e:
+            print(f"Skipping {path.name} during migration: {e}")
+            continue
+        if df is None or df.empty:
+            continue
+        parquet_store.save(stem, interval, df)
+        migrated += 1
+    return migrated
+
+
+def create_store(backend: str, data_dir: Path) -> TimeSeriesStore:
+    """
+    Create the configured time series store.
+    Falls back to CSV when pyarrow is not installed. A new Parquet store is seeded
+    from the existing CSV cache.
+    """
+    data_dir = Path(data_dir)
+    if backend == "parquet":
+        if not parquet_available():
+            print("pyarrow is not installed, falling back to the CSV time series store")
+            return CsvStore(data_dir)
+
+        parquet_root = data_dir / "parquet"
+        is_new = not parquet_root.exists()
+        store = ParquetStore(parquet_root)
+        if is_new:
+            migrated = migrate_csv_to_parquet(CsvStore(data_dir), store)
+            if migrated:
+                print(f"Migrated {migrated} cached CSV time series to Parquet")
+        return store
+
+    if backend == "csv":
+        return CsvStore(data_dir)
+
+    raise ValueError(f"Unknown time series store backend '{backend}', expected 'parquet' or 'csv'")
@@ -1,13 +1,33 @@
 import os
+import re
 import sys
 import time
-import requests
+import threading
 import pandas as pd
 import json
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
-import pandas_market_calendars as mcal
+from datetime import datetime
+from typing import Optional, Dict, Any, List
 from pathlib import Path
+from ai_trading_crew.config import settings
+from ai_trading_crew.utils.http_cache import NotCachedError
+from ai_trading_crew.utils.http_client import http_client
+from ai_trading_crew.utils.market_calendar import trading_calendar
+from ai_trading_crew.utils.rate_limiter import TokenBucket
+from ai_trading_crew.utils.storage import OHLCV_COLUMNS, create_store
+
+# Maximum number of symbols Twelve Data accepts in one batch request
+MAX_BATCH_SYMBOLS = 120
+
+# Twelve Data timestamps US equity bars in the exchange's local time
+EXCHANGE_TIMEZONE = "America/New_York"
+
+
+def intraday_bar_length(interval: str) -> Optional[pd.Timedelta]:
+    """The bar length of an intraday interval (1min, 5min, 1h...), None for daily and longer"""
+    match = re.fullmatch(r"(\d+)(min|h)", interval)
+    if not match:
+        return None
+    return pd.Timedelta(int(match.group(1)), unit=match.group(2))
 
 
 class TwelveDataManager:
@@ -22,6 +42,9 @@ class TwelveDataManager:
             print("TWELVE_API_KEY environment variable is not set")
             sys.exit(1)
             
+        # Schedule requests proactively so the plan's per-minute credit limit is never hit
+        self.rate_limiter = TokenBucket(settings.TWELVE_DATA_CREDITS_PER_MINUTE)
+        
         self._cache_ttl = 300  # Cache TTL in seconds (5 minutes)
         self._last_fetch_times = {}
         self._cached_data = {}
@@ -31,6 +54,7 @@ class TwelveDataManager:
         # Company name caching
         self._cached_company_names = {}
         self._last_company_fetch_times = {}
+        self._company_names_lock = threading.Lock()
         
         # Setup data directory
         self.data_dir = Path(__file__).parent.parent.parent / "resources" / "data"
@@ -39,8 +63,8 @@ class TwelveDataManager:
         # Company names JSON file path
         self.company_names_file = self.data_dir / "company_names.json"
         
-        # Initialize market calendar
-        self.nyse = mcal.get_calendar('NYSE')
+        # Cached OHLCV time series, keyed by symbol and interval
+        self.store = create_store(settings.TIME_SERIES_STORE, self.data_dir)
         
         # Load company names from JSON file
         self._load_company_names_from_file()
@@ -59,88 +83,97 @@ class TwelveDataManager:
     
     def _save_company_names_to_file(self):
         """Save company names to JSON file"""
-        try:
-            with open(self.company_names_file, 'w') as f:
-                json.dump(self._cached_company_names, f, indent=2)
-            print("Saved company names to cache")
-        except Exception as e:
-            print(f"Error saving company names to file: {e}")
+        # Collectors run in worker threads, so serialize writes to the shared file
+        with self._company_names_lock:
+            try:
+                with open(self.company_names_file, 'w') as f:
+                    json.dump(self._cached_company_names, f, indent=2)
+                print("Saved company names to cache")
+            except Exception as e:
+                print(f"Error saving company names to file: {e}")
     
     def get_latest_market_date(self) -> str:
         """Get the latest market trading date (handles weekends and holidays)"""
-        today = datetime.now().date()
-        
-        # Get the last 5 trading days to be safe
-        schedule = self.nyse.schedule(start_date=today - timedelta(days=10), end_date=today)
-        
-        if len(schedule) > 0:
-            latest_date = schedule.index[-1].date()
-            return latest_date.strftime('%Y-%m-%d')
-        else:
-            # Fallback to today if something goes wrong
-            return today.strftime('%Y-%m-%d')
+        return trading_calendar.latest_session(datetime.now().date()).strftime('%Y-%m-%d')
     
-    def _get_csv_path(self, symbol: str) -> Path:
-        """Get the CSV file path for a symbol"""
-        # Replace slashes and other problematic characters for file names
-        safe_symbol = symbol.lower().replace('/', '_').replace('\\', '_')
-        return self.data_dir / f"{safe_symbol}.csv"
+    def get_latest_bar_time(self, bar_length: pd.Timedelta, now: Optional[pd.Timestamp] = None) -> pd.Timestamp:
+        """
+        Start of the latest completed intraday bar (exchange local time): bars are counted
+        from the session open, and after the close the session's last bar is the latest.
+        """
+        now = pd.Timestamp(now) if now is not None else pd.Timestamp.now(tz=EXCHANGE_TIMEZONE)
+        if now.tzinfo is None:
+            now = now.tz_localize(EXCHANGE_TIMEZONE)
+        today = now.tz_convert(EXCHANGE_TIMEZONE).normalize().tz_localize(None)
+        schedule = trading_calendar.schedule(today - pd.Timedelta(days=10), today)
+        schedule = schedule[schedule['market_open'] <= now]
+        if schedule.empty:
+            return pd.Timestamp.min
+        session_open, session_close = schedule['market_open'].iloc[-1], schedule['market_close'].iloc[-1]
+        if now >= session_close:
+            # A shorter last bar (e.g. 15:30 for 1h bars) still completes at the close
+            bars = -(-(session_close - session_open) // bar_length)
+        else:
+            bars = (now - session_open) // bar_length
+        latest = session_open + max(bars - 1, 0) * bar_length
+        return latest.tz_convert(EXCHANGE_TIMEZONE).tz_localize(None)
     
-    def _has_recent_data(self, symbol: str) -> bool:
+    def _has_recent_data(self, symbol: str, interval: str = "1day") -> bool:
         """Check if we have recent data for the symbol"""
-        csv_path = self._get_csv_path(symbol)
-        
-        if not csv_path.exists():
+        latest_timestamp = self.store.latest_timestamp(symbol, interval)
+        if latest_timestamp is None:
             return False
-            
-        try:
-            df = pd.read_csv(csv_path, index_col=0, parse_dates=True)
-            if df.empty:
-                return False
-                
-            latest_data_date = df.index[-1].strftime('%Y-%m-%d')
-            latest_market_date = self.get_latest_market_date()
-            
-            return latest_data_date >= latest_market_date
-            
-        except Exception as e:
-            print(f"Error reading cached data for {symbol}: {e}")
-            return False
-    
-    def _load_cached_data(self, symbol: str) -> Optional[pd.DataFrame]:
-        """Load cached data from CSV"""
-        csv_path = self._get_csv_path(symbol)
         
-        if not csv_path.exists():
-            return None
-            
-        try:
-            df = pd.read_csv(csv_path, index_col=0, parse_dates=True)
-            return df if not df.empty else None
-        except Exception as e:
-            print(f"Error loading cached data for {symbol}: {e}")
-            return None
-    
-    def _save_data_to_cache(self, symbol: str, data: pd.DataFrame):
-        """Save data to CSV cache"""
-        csv_path = self._get_csv_path(symbol)
+        # Intraday bars go stale within the session, so compare bar times rather than dates
+        bar_length = intraday_bar_length(interval)
+        if bar_length is not None:
+            return latest_timestamp >= self.get_latest_bar_time(bar_length)
         
+        latest_data_date = latest_timestamp.strftime('%Y-%m-%d')
+        latest_market_date = self.get_latest_market_date()
+        
+        return latest_data_date >= latest_market_date
+    
+    def _memory_ttl(self, interval: str) -> float:
+        """How long fetched bars are served from memory; intraday freshness is decided by _has_recent_data alone"""
+        return 0 if intraday_bar_length(interval) is not None else self._cache_ttl
+    
+    def _load_cached_data(self, symbol: str, interval: str = "1day") -> Optional[pd.DataFrame]:
+        """Load cached data from the time series store"""
+        return self.store.load(symbol, interval)
+    
+    @staticmethod
+    def _merge_delta(cached: pd.DataFrame, delta: pd.DataFrame) -> pd.DataFrame:
+        """Append newly fetched bars to cached data, letting fresh bars replace cached ones"""
+        df = pd.concat([cached, delta[OHLCV_COLUMNS]])
+        return df[~df.index.duplicated(keep='last')].sort_index().rename_axis('datetime')
+    
+    def _save_data_to_cache(self, symbol: str, data: pd.DataFrame, interval: str = "1day"):
+        """Save data to the time series store"""
         try:
-            data.to_csv(csv_path)
+            self.store.save(symbol, interval, data)
             print(f"Saved data for {symbol} to cache")
         except Exception as e:
             print(f"Error saving data for {symbol}: {e}")
     
-    def _make_api_request(self, url: str, max_retries: int = 3) -> Dict[Any, Any]:
-        """Make API request with retry logic and rate limiting"""
+    def _make_api_request(self, url: str, max_retries: int = 3, credits: int = 1) -> Dict[Any, Any]:
+        """
+        Make API request with retry logic, waiting for rate limiter credits before each attempt.
+        Responses the HTTP cache answers (always the case offline) spend no credits.
+        """
         for attempt in range(max_retries):
             try:
-                response = requests.get(url)
+                response = http_client.cached_get(url)
+                if response is None:
+                    if http_client.offline:
+                        canonical, _ = http_client.cache.normalize(url)
+                        raise NotCachedError(f"No Twelve Data response recorded for offline replay: {canonical}")
+                    self.rate_limiter.acquire(credits)
+                    response = http_client.get(url)
                 
                 if response.status_code == 429:
-                    wait_time = 63 if attempt == 0 else 122
-                    print(f"Rate limit hit, waiting {wait_time} seconds...")
-                    time.sleep(wait_time)
+                    print("Rate limit hit despite throttling, waiting for the next credit window...")
+                    self.rate_limiter.penalize()
                     continue
                     
                 if response.status_code != 200:
@@ -158,9 +191,8 @@ class TwelveDataManager:
                         print(f"Symbol not supported: {error_msg}")
                         sys.exit(1)
                     elif 'run out of API credits' in error_msg or 'rate limit' in error_msg.lower():
-                        wait_time = 62 if attempt == 0 else 122
-                        print(f"Rate limit hit, waiting {wait_time} seconds...")
-                        time.sleep(wait_time)
+                        print("Rate limit hit despite throttling, waiting for the next credit window...")
+                        self.rate_limiter.penalize()
                         continue
                     else:
                         print(f"API error: {error_msg}")
@@ -168,6 +200,8 @@ class TwelveDataManager:
                         
                 return data
                 
+            except NotCachedError:
+                raise
             except Exception as e:
                 print(f"Request attempt {attempt + 1} failed: {e}")
                 if attempt == max_retries - 1:
@@ -176,37 +210,13 @@ class TwelveDataManager:
         
         sys.exit(1)  # Should never reach here
     
-    def get_time_series_data(self, symbol: str, interval: str = "1day", period: str = "4mo") -> pd.DataFrame:
-        """
-        Get time series data for a symbol with intelligent caching.
-        Checks cached data first and only fetches if needed.
-        """
-        # Check if we have recent cached data
-        if self._has_recent_data(symbol):
-            
-            return self._load_cached_data(symbol)
-        
-        # Check in-memory cache
-        cache_key = f"{symbol}_{interval}_{period}"
-        current_time = time.time()
-        
-        if (cache_key in self._cached_data and 
-            current_time - self._last_fetch_times.get(cache_key, 0) < self._cache_ttl):
-            
-            return self._cached_data[cache_key]
-        
-        print(f"Fetching fresh data for {symbol} from Twelve Data API")
-        
-        # Fetch from API
-        url = f"https://api.twelvedata.com/time_series?symbol={symbol}&interval={interval}&outputsize=5000&apikey={self.api_key}"
-        data = self._make_api_request(url)
-        
-        if not data.get('values'):
-            print(f"No data available for symbol {symbol}")
-            sys.exit(1)
-        
-        # Convert to DataFrame
-        values = data['values']
+    def get_rate_limit_metrics(self) -> Dict[str, float]:
+        """Get queue depth and credit usage of the Twelve Data rate limiter"""
+        return self.rate_limiter.metrics()
+    
+    @staticmethod
+    def _values_to_dataframe(values: List[Dict[str, Any]]) -> pd.DataFrame:
+        """Convert Twelve Data time series values into an OHLCV DataFrame sorted by date"""
         df = pd.DataFrame(values)
         
         # Convert datetime and set as index
@@ -232,17 +242,162 @@ class TwelveDataManager:
             df['Volume'] = 0
         
         # Sort by date in ascending order
-        df = df.sort_index()
-        
-        # Cache the data
+        return df.sort_index()
+    
+    def _store_time_series(self, symbol: str, interval: str, period: str, df: pd.DataFrame):
+        """Keep freshly fetched data in the in-memory cache and the CSV cache"""
+        cache_key = f"{symbol}_{interval}_{period}"
         self._cached_data[cache_key] = df
-        self._last_fetch_times[cache_key] = current_time
+        self._last_fetch_times[cache_key] = time.time()
+        self._save_data_to_cache(symbol, df, interval)
+    
+    @staticmethod
+    def _split_batch_response(symbols: List[str], data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Twelve Data only keys the response by symbol when more than one symbol was requested"""
+        if len(symbols) == 1:
+            return {symbols[0]: data}
+        return {symbol: data[symbol] for symbol in symbols if isinstance(data.get(symbol), dict)}
+    
+    def _time_series_url(self, symbols: List[str], interval: str, start_date: Optional[str] = None) -> str:
+        """Build a time_series URL for the full history, or only the bars since start_date"""
+        url = f"https://api.twelvedata.com/time_series?symbol={','.join(symbols)}&interval={interval}&outputsize=5000&apikey={self.api_key}"
+        if start_date:
+            url += f"&start_date={start_date}"
+        return url
+    
+    def _batches(self, symbols: List[str]) -> List[List[str]]:
+        """Split symbols into batches that fit both the API batch limit and one credit window"""
+        size = max(1, min(MAX_BATCH_SYMBOLS, self.rate_limiter.capacity))
+        return [symbols[i:i + size] for i in range(0, len(symbols), size)]
+    
+    def get_time_series_data(self, symbol: str, interval: str = "1day", period: str = "4mo") -> pd.DataFrame:
+        """
+        Get time series data for a symbol with intelligent caching.
+        Checks cached data first and only fetches if needed.
+        """
+        # Check if we have recent cached data
+        if self._has_recent_data(symbol, interval):
+            
+            return self._load_cached_data(symbol, interval)
+        
+        # Check in-memory cache
+        cache_key = f"{symbol}_{interval}_{period}"
+        current_time = time.time()
+        
+        if (cache_key in self._cached_data and 
+            current_time - self._last_fetch_times.get(cache_key, 0) < self._memory_ttl(interval)):
+            
+            return self._cached_data[cache_key]
+        
+        # Only request the bars missing from the cache. The last cached bar is requested
+        # again since it may have been saved before the session closed.
+        cached = self._load_cached_data(symbol, interval)
+        if cached is not None:
+            start_date = cached.index[-1].strftime('%Y-%m-%d')
+            print(f"Fetching data since {start_date} for {symbol} from Twelve Data API")
+            data = self._make_api_request(self._time_series_url([symbol], interval, start_date))
+            
+            if data.get('values'):
+                df = self._merge_delta(cached, self._values_to_dataframe(data['values']))
+                self._store_time_series(symbol, interval, period, df)
+                return df
+        
+        print(f"Fetching fresh data for {symbol} from Twelve Data API")
+        
+        # Fetch from API
+        data = self._make_api_request(self._time_series_url([symbol], interval))
+        
+        if not data.get('values'):
+            print(f"No data available for symbol {symbol}")
+            sys.exit(1)
         
-        # Save to CSV cache
-        self._save_data_to_cache(symbol, df)
+        df = self._values_to_dataframe(data['values'])
+        self._store_time_series(symbol, interval, period, df)
         
         return df
     
+    def get_time_series_batch(self, symbols: List[str], interval: str = "1day", period: str = "4mo") -> Dict[str, pd.DataFrame]:
+        """
+        Get time series data for several symbols, fetching all stale ones with batched requests.
+        Returns the same per-symbol DataFrames as get_time_series_data. Symbols the API
+        could not serve are left out so callers can fall back to the single-symbol path.
+        """
+        results = {}
+        current_time = time.time()
+        to_fetch = []
+        
+        for symbol in dict.fromkeys(symbols):
+            cache_key = f"{symbol}_{interval}_{period}"
+            if self._has_recent_data(symbol, interval):
+                results[symbol] = self._load_cached_data(symbol, interval)
+            elif (cache_key in self._cached_data and 
+                  current_time - self._last_fetch_times.get(cache_key, 0) < self._memory_ttl(interval)):
+                results[symbol] = self._cached_data[cache_key]
+            else:
+                to_fetch.append(symbol)
+        
+        # Symbols with a cache only need the bars since their last cached date, and
+        # symbols sharing that date can share a request
+        cached_frames = {}
+        groups: Dict[Optional[str], List[str]] = {}
+        for symbol in to_fetch:
+            cached = self._load_cached_data(symbol, interval)
+            start_date = None
+            if cached is not None:
+                cached_frames[symbol] = cached
+                start_date = cached.index[-1].strftime('%Y-%m-%d')
+            groups.setdefault(start_date, []).append(symbol)
+        
+        for start_date, group in groups.items():
+            for batch in self._batches(group):
+                if start_date:
+                    print(f"Fetching data since {start_date} for {', '.join(batch)} from Twelve Data API")
+                else:
+                    print(f"Fetching fresh data for {', '.join(batch)} from Twelve Data API")
+                data = self._make_api_request(self._time_series_url(batch, interval, start_date), credits=len(batch))
+                
+                for symbol, symbol_data in self._split_batch_response(batch, data).items():
+                    if symbol_data.get('status') == 'error' or not symbol_data.get('values'):
+                        print(f"No data available for symbol {symbol}: {symbol_data.get('message', 'empty response')}")
+                        continue
+                    df = self._values_to_dataframe(symbol_data['values'])
+                    if symbol in cached_frames:
+                        df = self._merge_delta(cached_frames[symbol], df)
+                    self._store_time_series(symbol, interval, period, df)
+                    results[symbol] = df
+        
+        return results
+    
+    @staticmethod
+    def _normalize_quote(symbol: str, quote_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Ensure quote data has the structure callers expect"""
+        return {
+            "symbol": quote_data.get('symbol', symbol),
+            "name": quote_data.get('name', symbol),
+            "exchange": quote_data.get('exchange', ''),
+            "mic_code": quote_data.get('mic_code', ''),
+            "currency": quote_data.get('currency', ''),
+            "datetime": quote_data.get('datetime', ''),
+            "open": quote_data.get('open', ''),
+            "high": quote_data.get('high', ''),
+            "low": quote_data.get('low', ''),
+            "close": quote_data.get('close', ''),
+            "volume": quote_data.get('volume', ''),
+            "previous_close": quote_data.get('previous_close', ''),
+            "change": quote_data.get('change', ''),
+            "percent_change": quote_data.get('percent_change', ''),
+            "average_volume": quote_data.get('average_volume', ''),
+            "fifty_two_week": quote_data.get('fifty_two_week', {
+                "low": '',
+                "high": '',
+                "low_change": '',
+                "low_change_percent": '',
+                "high_change": '',
+                "high_change_percent": '',
+                "range": ''
+            })
+        }
+    
     def get_quote_data(self, symbol: str) -> Dict[str, Any]:
         """
         Get quote data for a symbol with caching.
@@ -307,33 +462,7 @@ class TwelveDataManager:
                 }
             }
         else:
-            # Ensure quote_data has the right structure
-            quote_data = {
-                "symbol": quote_data.get('symbol', symbol),
-                "name": quote_data.get('name', symbol),
-                "exchange": quote_data.get('exchange', ''),
-                "mic_code": quote_data.get('mic_code', ''),
-                "currency": quote_data.get('currency', ''),
-                "datetime": quote_data.get('datetime', ''),
-                "open": quote_data.get('open', ''),
-                "high": quote_data.get('high', ''),
-                "low": quote_data.get('low', ''),
-                "close": quote_data.get('close', ''),
-                "volume": quote_data.get('volume', ''),
-                "previous_close": quote_data.get('previous_close', ''),
-                "change": quote_data.get('change', ''),
-                "percent_change": quote_data.get('percent_change', ''),
-                "average_volume": quote_data.get('average_volume', ''),
-                "fifty_two_week": quote_data.get('fifty_two_week', {
-                    "low": '',
-                    "high": '',
-                    "low_change": '',
-                    "low_change_percent": '',
-                    "high_change": '',
-                    "high_change_percent": '',
-                    "range": ''
-                })
-            }
+            quote_data = self._normalize_quote(symbol, quote_data)
         
         # Cache the data
         self._cached_quotes[symbol] = quote_data
@@ -341,6 +470,60 @@ class TwelveDataManager:
         
         return quote_data
 
+    def get_quotes_batch(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get quote data for several symbols with batched requests.
+        Returns the same per-symbol quote dicts as get_quote_data and fills the company name
+        cache from them. Symbols the API could not serve are left out.
+        """
+        results = {}
+        current_time = time.time()
+        to_fetch = []
+        
+        for symbol in dict.fromkeys(symbols):
+            if (symbol in self._cached_quotes and 
+                current_time - self._last_quote_fetch_times.get(symbol, 0) < self._cache_ttl):
+                results[symbol] = self._cached_quotes[symbol]
+            else:
+                to_fetch.append(symbol)
+        
+        new_company_names = False
+        for batch in self._batches(to_fetch):
+            url = f"https://api.twelvedata.com/quote?symbol={','.join(batch)}&apikey={self.api_key}"
+            data = self._make_api_request(url, credits=len(batch))
+            
+            for symbol, quote_data in self._split_batch_response(batch, data).items():
+                if quote_data.get('status') == 'error':
+                    print(f"No quote data available for symbol {symbol}: {quote_data.get('message', 'empty response')}")
+                    continue
+                quote_data = self._normalize_quote(symbol, quote_data)
+                self._cached_quotes[symbol] = quote_data
+                self._last_quote_fetch_times[symbol] = current_time
+                results[symbol] = quote_data
+                
+                if symbol not in self._cached_company_names:
+                    self._cached_company_names[symbol] = quote_data.get("name", symbol)
+                    self._last_company_fetch_times[symbol] = current_time
+                    new_company_names = True
+        
+        if new_company_names:
+            self._save_company_names_to_file()
+        
+        return results
+    
+    def prefetch(self, symbols: List[str], quote_symbols: Optional[List[str]] = None):
+        """
+        Warm the caches for a whole universe up front with a handful of batched requests,
+        so later per-symbol calls are served from cache.
+        
+        Args:
+            symbols: Symbols to prefetch daily time series for
+            quote_symbols: Symbols to prefetch quotes (and company names) for, defaults to symbols
+        """
+        time_series = self.get_time_series_batch(symbols)
+        quotes = self.get_quotes_batch(quote_symbols if quote_symbols is not None else symbols)
+        print(f"Prefetched time series for {len(time_series)} symbols and quotes for {len(quotes)} symbols")
+    
     def get_company_name(self, symbol: str) -> str:
         """
         Get company name for a symbol with intelligent caching.